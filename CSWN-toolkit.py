@@ -1,37 +1,75 @@
 #!/usr/bin/python3
 import sys
 import webbrowser
+import argparse
+import cProfile
+import functools
+import gc
+import tracemalloc
+import multiprocessing
 import json
+import html
 import os
+import re
+import sqlite3
+import difflib
+import atexit
+import tempfile
+import shutil
+import hashlib
+import zipfile
+import bisect
+import heapq
+import threading
+import time
 import requests
+import logging
+import math
+import queue
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from urllib.parse import urljoin, urlparse, urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
     QGridLayout, QGroupBox, QMessageBox, QTextEdit, QFileDialog, QLineEdit, QMenu, QMenuBar, 
     QInputDialog, QComboBox, QDialog, QSpinBox, QSizePolicy, QScrollArea, QFrame, QSplitter,
-    QTabWidget, QProgressBar, QToolBar, QStatusBar
+    QTabWidget, QProgressBar, QToolBar, QStatusBar, QStackedWidget, QListWidget, QListWidgetItem, QSystemTrayIcon,
+    QStyle, QTableWidget, QTableWidgetItem, QHeaderView, QGraphicsView, QGraphicsScene
 )
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize, QSettings, QPropertyAnimation, QEasingCurve, QRect, QUrl
-from PyQt6.QtGui import QFont, QAction, QIcon, QPixmap, QPalette, QColor, QPainter, QLinearGradient, QBrush
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings
-
+from PyQt6.QtCore import Qt, QObject, QTimer, QThread, pyqtSignal, QSize, QSettings, QPropertyAnimation, QEasingCurve, QRect, QRectF, QUrl, QBuffer, QByteArray
+from PyQt6.QtGui import QFont, QAction, QIcon, QPixmap, QImage, QImageReader, QPalette, QColor, QPainter, QLinearGradient, QBrush
 from io import BytesIO
 
 try:
-    from bs4 import BeautifulSoup
     import xml.etree.ElementTree as ET
-    from PIL import Image, ImageQt
+    from PIL import Image
     from PyQt6.QtWebEngineWidgets import QWebEngineView
-    from PyQt6.QtWebEngineCore import QWebEngineSettings
+    from PyQt6.QtWebEngineCore import (QWebEngineSettings, QWebEngineProfile, QWebEngineUrlRequestInfo,
+                                       QWebEngineUrlRequestInterceptor)
     WEBENGINE_AVAILABLE = True
 except ImportError as e:
     print(f"WebEngine not available: {e}")
     WEBENGINE_AVAILABLE = False
     try:
-        from bs4 import BeautifulSoup
         import xml.etree.ElementTree as ET
-        from PIL import Image, ImageQt
+        from PIL import Image
     except Exception as e:
         print(f"Import error: {e.__class__.__name__}: {e}")
         sys.exit(1)
@@ -39,8 +77,16 @@ except ImportError as e:
 
 CONFIG_FILE = os.path.expanduser("~/.weather_toolkit_config.json")
 ERROR_LOG = os.path.expanduser("~/.weather_toolkit_error.log")
+ARCHIVE_DB = os.path.expanduser("~/.weather_toolkit_archive.db")
+COLORADO_ALERTS_URL = "https://api.weather.gov/alerts/active.atom?area=CO"
+US_ALERTS_URL = "https://api.weather.gov/alerts/active.atom"
+# CSWN_BASE_URL=http://127.0.0.1:8765 sends every fetch to the stand-in server
+# in benchmarks/fixture_server.py instead of the live hosts
+BASE_URL = os.environ.get("CSWN_BASE_URL", "").rstrip("/")
+ALERT_HISTORY_WINDOWS = [("Current feed", 0), ("Past 6 hours", 6), ("Past 24 hours", 24),
+                         ("Past 3 days", 72), ("Past 14 days", 336)]
 
-# python -m pip install PyQt6 requests beautifulsoup4 pillow
+# python -m pip install PyQt6 requests pillow
 
 APP_TITLE = "Colorado Severe Weather Network Toolkit"
 APP_AUTHOR = "W5ALC"
@@ -55,6 +101,11 @@ DEFAULT_CONFIG = {
     "default_section": "",
     "compact_mode": False,
     "show_tooltips": True,
+    "watch_patterns": ["tornado", "large hail", "PDS", "El Paso"],
+    # Per app, since both apps share this config file
+    "qt_metrics_port": 0,
+    "qt_metrics_file": "",
+    "bandwidth_profile": "normal",
 }
 
 # Enhanced themes with better color schemes and gradients
@@ -166,7 +217,7 @@ resources = {
     },
     "🚨 Active Alerts and Reports": {
         "NWS Colorado Warnings Map": "https://www.weather.gov/alerts/co",
-        "Colorado Active NWS Alerts": "https://alerts.weather.gov/cap/co.php?x=0",
+        "Colorado Active NWS Alerts": "https://api.weather.gov/alerts/active.atom?area=CO",
         "NWS Storm Reports": "https://mesonet.agron.iastate.edu/lsr/#CO",
         "NWS Snow & Ice Reports": "https://www.weather.gov/crh/snowreports?sid=pub",
         "mPING Reports": "https://mping.ou.edu/display/",
@@ -216,37 +267,1155 @@ resources = {
         "NWS Fire Weather": "https://www.weather.gov/bou/fire",
         "National Interagency Fire Center": "https://www.nifc.gov/",
         "USGS Colorado Stream Gauges": "https://waterdata.usgs.gov/co/nwis/rt",
-        "NWS River Forecasts": "https://water.weather.gov/ahps2/index.php?wfo=pub",
+        "NWS River Forecasts": "https://water.noaa.gov/wfo/pub",
         "Colorado Avalanche Info Center": "https://avalanche.state.co.us/",
     }
 }
 
-def log_error(msg):
+def resolve_url(url):
+    if not BASE_URL:
+        return url
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{BASE_URL}/{parts.netloc}{parts.path or '/'}{query}"
+
+# Low bandwidth profile for metered links: smaller GOES variants, forced
+# compression, slower polling and no WebEngine media
+BANDWIDTH_PROFILES = ("normal", "low")
+LOW_BANDWIDTH_POLL_FACTOR = 3
+LOW_BANDWIDTH_GOES = [
+    (re.compile(r"(/ABI/CONUS/[^/]+/)(?:latest|\d+x\d+)\.jpg$"), r"\g<1>1250x750.jpg"),
+    (re.compile(r"(/ABI/FD/[^/]+/)(?:latest|\d+x\d+)\.jpg$"), r"\g<1>1808x1808.jpg"),
+    (re.compile(r"(/ABI/SECTOR/[^/]+/[^/]+/)(?:latest|\d+x\d+)\.jpg$"), r"\g<1>600x600.jpg"),
+]
+LOW_BANDWIDTH_LOOP_SIZES = {"1250x750": "625x375", "1200x1200": "600x600"}
+low_bandwidth = False
+session_bytes = 0
+session_bytes_lock = threading.Lock()
+
+def set_bandwidth_profile(name):
+    global low_bandwidth
+    low_bandwidth = name == "low"
+
+def bandwidth_variant(url):
+    # The CDN publishes each GOES product at several fixed sizes
+    if low_bandwidth:
+        for pattern, replacement in LOW_BANDWIDTH_GOES:
+            url = pattern.sub(replacement, url)
+    return url
+
+def poll_interval(ms):
+    return ms * LOW_BANDWIDTH_POLL_FACTOR if low_bandwidth else ms
+
+def request_headers(headers=None):
+    # requests already offers gzip/deflate; pin the header to everything
+    # urllib3 can decode (br/zstd too when installed) so no caller drops it
+    if not low_bandwidth:
+        return headers
+    return {**(headers or {}), "Accept-Encoding": ACCEPT_ENCODING}
+
+def count_session_bytes(resp):
+    # Bytes as they came off the wire, before any gzip decoding
+    global session_bytes
+    received = (resp.raw.tell() if resp.raw is not None else 0) or len(resp.content)
+    with session_bytes_lock:
+        session_bytes += received
+
+def format_bytes(count):
+    for unit in ("B", "KiB", "MiB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+# Connections record how long DNS, TCP and TLS took so a fetch can split
+# connect time out of time-to-first-byte. A reused connection reports 0.
+net_local = threading.local()
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        net_local.connect_time = time.perf_counter() - start
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        net_local.connect_time = time.perf_counter() - start
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+def http_session():
+    # One keep-alive session per thread; requests sessions are not thread safe
+    session = getattr(net_local, "session", None)
+    if session is None:
+        session = net_local.session = requests.Session()
+        session.mount("http://", TimedAdapter())
+        session.mount("https://", TimedAdapter())
+    return session
+
+TIMING_STAGES = ("queue", "connect", "ttfb", "download", "parse", "render", "total")
+TIMING_BUFFER_SIZE = 500
+fetch_timings = deque(maxlen=TIMING_BUFFER_SIZE)
+timing_lock = threading.Lock()
+
+class FetchSpan:
+    """Stage timings for one fetch, from being queued to being rendered."""
+    def __init__(self, url, product, memory=False):
+        self.created = self.mark = time.perf_counter()
+        self.data = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                     "host": urlsplit(url).netloc, "product": product, "url": url,
+                     "status": None, "bytes": 0, "error": None}
+        # Peak RSS is process-wide, so it is only worth tracking for one-off
+        # loads such as a single image rather than every background fetch
+        self.memory = memory
+        if memory:
+            peak_rss(reset=True)
+
+    def set(self, stage, seconds):
+        with timing_lock:
+            self.data[f"{stage}_ms"] = round(seconds * 1000, 2)
+
+    def lap(self, stage):
+        # Time since the previous stage ended
+        now = time.perf_counter()
+        self.set(stage, now - self.mark)
+        self.mark = now
+
+    def network(self, resp, start, first_byte):
+        now = time.perf_counter()
+        connect = getattr(net_local, "connect_time", 0.0)
+        self.set("connect", connect)
+        self.set("ttfb", first_byte - start - connect)
+        self.set("download", now - first_byte)
+        self.data["status"] = resp.status_code
+        self.data["bytes"] = (resp.raw.tell() if resp.raw is not None else 0) or len(resp.content)
+        self.mark = now
+
+    def finish(self, error=None):
+        if error is not None:
+            self.data["error"] = f"{error.__class__.__name__}: {error}"
+        self.set("total", time.perf_counter() - self.created)
+        if self.memory:
+            self.data["peak_rss_mb"] = round((peak_rss() or 0) / 2 ** 20, 1)
+        with timing_lock:
+            fetch_timings.append(self.data)
+            record_fetch(self.data)
+
+def fetch(url, timeout=10, span=None, headers=None):
+    net_local.connect_time = 0.0
+    start = time.perf_counter()
+    if offline_pack is not None:
+        # Read-only snapshot: answer from the pack and never touch the network
+        resp = offline_pack.response(url)
+        if span is not None:
+            span.network(resp, start, start)
+        return resp
+    resp = http_session().get(resolve_url(url), timeout=timeout, stream=True, headers=request_headers(headers))
+    first_byte = time.perf_counter()
+    resp.content
+    count_session_bytes(resp)
+    if span is not None:
+        span.network(resp, start, first_byte)
+    resp.raise_for_status()
+    return resp
+
+def timing_snapshot():
+    with timing_lock:
+        return [dict(span) for span in fetch_timings]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def summarize_timings(spans):
+    groups = {}
+    for span in spans:
+        groups.setdefault((span["host"], span["product"]), []).append(span)
+    rows = []
+    for (host, product), group in sorted(groups.items()):
+        row = {"host": host, "product": product, "count": len(group),
+               "errors": sum(1 for span in group if span["error"]),
+               "bytes": sum(span["bytes"] for span in group)}
+        for stage in TIMING_STAGES:
+            values = [span[f"{stage}_ms"] for span in group if f"{stage}_ms" in span]
+            if values:
+                row[stage] = {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+        peaks = [span["peak_rss_mb"] for span in group if "peak_rss_mb" in span]
+        if peaks:
+            row["peak_rss_mb"] = max(peaks)
+        rows.append(row)
+    return rows
+
+def export_timings(path):
+    spans = timing_snapshot()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "app": APP_TITLE,
+            "version": APP_VERSION,
+            "exported": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "base_url": BASE_URL,
+            "summary": summarize_timings(spans),
+            "spans": spans,
+        }, f, indent=2)
+
+# Cumulative counters for the optional Prometheus endpoint/textfile. The
+# timing ring buffer forgets old fetches; these never reset.
+METRICS_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRICS_FILE_INTERVAL = 15
+fetch_metrics = {}
+cache_metrics = {}
+feed_status = {}
+process_started = time.time()
+
+def record_fetch(data):
+    # Called with timing_lock held
+    stats = fetch_metrics.setdefault(data["host"], {"ok": 0, "error": 0, "sum": 0.0,
+                                                    "buckets": [0] * len(METRICS_BUCKETS)})
+    seconds = data.get("total_ms", 0) / 1000
+    stats["error" if data["error"] else "ok"] += 1
+    stats["sum"] += seconds
+    for i, bound in enumerate(METRICS_BUCKETS):
+        if seconds <= bound:
+            stats["buckets"][i] += 1
+    if not data["error"]:
+        feed_status.setdefault(feed_name(data["url"], data["product"]), {})["last_success"] = time.time()
+
+def feed_name(url, product):
+    # Metrics label feeds by name, never by URL, so timestamped frames and
+    # per-product pages cannot grow the series without bound
+    if url == COLORADO_ALERTS_URL:
+        return "Colorado alerts"
+    if url == US_ALERTS_URL:
+        return "US alerts"
+    return product
+
+def record_cache(name, hit):
+    with timing_lock:
+        counts = cache_metrics.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+def record_alerts(url, alerts):
+    severities = {}
+    for alert in alerts:
+        severity = alert["severity"] or "Unknown"
+        severities[severity] = severities.get(severity, 0) + 1
+    with timing_lock:
+        feed_status.setdefault(feed_name(url, "Alerts"), {})["severity"] = severities
+
+def process_rss():
     try:
-        with open(ERROR_LOG, "a") as f:
-            f.write(f"{msg}\n")
-    except Exception:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
         pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                    "PagefileUsage", "PeakPagefileUsage")]
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    import resource
+    # Peak rather than current RSS, but the best macOS offers without psutil
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
 
-def load_config():
+def peak_rss(reset=False):
+    # Linux keeps a resettable high-water mark (VmHWM), which gives the peak
+    # since a span started. Elsewhere this is the current or lifetime figure.
     try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, "r") as f:
-                cfg = json.load(f)
-                for k, v in DEFAULT_CONFIG.items():
-                    if k not in cfg:
-                        cfg[k] = v
-                return cfg
-    except Exception as e:
-        log_error(f"Error loading config: {e}")
-    return DEFAULT_CONFIG.copy()
+        with open("/proc/self/status") as f:
+            peak = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmHWM:"))
+        if reset:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+        return peak
+    except (OSError, ValueError, StopIteration):
+        return process_rss()
+
+def process_threads():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return threading.active_count()
+
+def metric_labels(**labels):
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+def render_metrics():
+    now = time.time()
+    with timing_lock:
+        fetches = {host: dict(stats, buckets=list(stats["buckets"])) for host, stats in fetch_metrics.items()}
+        caches = {name: list(counts) for name, counts in cache_metrics.items()}
+        feeds = {feed: dict(status) for feed, status in feed_status.items()}
+    lines = []
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family("cswn_build_info", "gauge", "Toolkit version.")
+    lines.append(f"cswn_build_info{metric_labels(app=APP_TITLE, version=APP_VERSION)} 1")
+    family("cswn_uptime_seconds", "gauge", "Seconds since the toolkit started.")
+    lines.append(f"cswn_uptime_seconds {now - process_started:.0f}")
+
+    family("cswn_fetch_total", "counter", "Fetches by host and outcome.")
+    for host, stats in sorted(fetches.items()):
+        for result in ("ok", "error"):
+            lines.append(f"cswn_fetch_total{metric_labels(host=host, result=result)} {stats[result]}")
+    family("cswn_fetch_duration_seconds", "histogram", "Fetch time from queueing to parsed, by host.")
+    for host, stats in sorted(fetches.items()):
+        for bound, count in zip(METRICS_BUCKETS, stats["buckets"]):
+            lines.append(f"cswn_fetch_duration_seconds_bucket{metric_labels(host=host, le=bound)} {count}")
+        total = stats["ok"] + stats["error"]
+        lines.append(f"cswn_fetch_duration_seconds_bucket{metric_labels(host=host, le='+Inf')} {total}")
+        lines.append(f"cswn_fetch_duration_seconds_sum{metric_labels(host=host)} {stats['sum']:.3f}")
+        lines.append(f"cswn_fetch_duration_seconds_count{metric_labels(host=host)} {total}")
+
+    family("cswn_cache_requests_total", "counter", "Cache lookups by cache and result.")
+    for name, (hits, misses) in sorted(caches.items()):
+        lines.append(f"cswn_cache_requests_total{metric_labels(cache=name, result='hit')} {hits}")
+        lines.append(f"cswn_cache_requests_total{metric_labels(cache=name, result='miss')} {misses}")
+    family("cswn_cache_hit_ratio", "gauge", "Share of cache lookups that hit.")
+    for name, (hits, misses) in sorted(caches.items()):
+        if hits + misses:
+            lines.append(f"cswn_cache_hit_ratio{metric_labels(cache=name)} {hits / (hits + misses):.4f}")
+
+    family("cswn_alerts_active", "gauge", "Alerts in the last successful fetch of each feed, by severity.")
+    for feed, status in sorted(feeds.items()):
+        for severity, count in sorted(status.get("severity", {}).items()):
+            lines.append(f"cswn_alerts_active{metric_labels(feed=feed, severity=severity)} {count}")
+    family("cswn_feed_last_success_age_seconds", "gauge", "Seconds since each feed last fetched without error.")
+    for feed, status in sorted(feeds.items()):
+        if "last_success" in status:
+            lines.append(f"cswn_feed_last_success_age_seconds{metric_labels(feed=feed)} "
+                         f"{now - status['last_success']:.0f}")
+
+    rss = process_rss()
+    if rss is not None:
+        family("cswn_process_resident_memory_bytes", "gauge", "Resident set size of the toolkit process.")
+        lines.append(f"cswn_process_resident_memory_bytes {rss}")
+    family("cswn_process_threads", "gauge", "Threads in the toolkit process.")
+    lines.append(f"cswn_process_threads {process_threads()}")
+    return "\n".join(lines) + "\n"
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def write_metrics_file(path):
+    # Same temp file + os.replace as the config, so a textfile collector
+    # never reads half a file
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".cswn-metrics-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render_metrics())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def start_metrics(port=0, path=""):
+    # Both are off unless qt_metrics_port / qt_metrics_file are set in the config
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        except OSError as e:
+            log_error(f"Metrics endpoint failed to start on port {port}: {e}", exc=e)
+    if path:
+        path = os.path.expanduser(path)
+        def write_loop():
+            while True:
+                try:
+                    write_metrics_file(path)
+                except OSError as e:
+                    log_error(f"Metrics file write failed: {e}", exc=e)
+                time.sleep(METRICS_FILE_INTERVAL)
+        threading.Thread(target=write_loop, name="metrics-file", daemon=True).start()
+
+PROFILE_REPORT_DIR = os.path.expanduser("~/.weather_toolkit_profiles")
+TRACEMALLOC_TOP = 25
+
+class Profiler:
+    """Opt-in cProfile per cycle and tracemalloc reports per popup type."""
+    def __init__(self):
+        self.directory = os.environ.get("CSWN_PROFILE", "")
+        self.tracemalloc_cycles = int(os.environ.get("CSWN_TRACEMALLOC") or 0)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.closed = {}
+        self.baselines = {}
+
+    def configure(self, argv):
+        # Returns argv without our flags so Qt never sees them
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--profile", default=self.directory)
+        parser.add_argument("--tracemalloc", type=int, default=self.tracemalloc_cycles)
+        args, rest = parser.parse_known_args(argv[1:])
+        self.directory = os.path.expanduser(args.profile) if args.profile else ""
+        self.tracemalloc_cycles = args.tracemalloc
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        if self.tracemalloc_cycles and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        return argv[:1] + rest
+
+    def report_path(self, name, suffix):
+        directory = self.directory or PROFILE_REPORT_DIR
+        os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            self.sequence += 1
+            sequence = self.sequence
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        return os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{sequence:04d}-{safe_name}{suffix}")
+
+    @contextmanager
+    def cycle(self, name):
+        # Nested cycles (load_section during startup) are covered by the outer
+        # profile; a cycle on another thread while one is running is skipped
+        # on Pythons where only one profiler can be active at a time
+        if not self.directory or getattr(self.local, "active", False):
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            yield
+            return
+        self.local.active = True
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.local.active = False
+            try:
+                profile.dump_stats(self.report_path(name, ".pstats"))
+            except OSError as e:
+                log_error(f"Profile write failed: {e}", exc=e)
+
+    def wrap(self, name):
+        def decorate(func):
+            @functools.wraps(func)
+            def run(*args, **kwargs):
+                with self.cycle(name):
+                    return func(*args, **kwargs)
+            return run
+        return decorate
+
+    def popup_opened(self, kind):
+        if self.tracemalloc_cycles and kind not in self.baselines:
+            gc.collect()
+            self.baselines[kind] = tracemalloc.take_snapshot()
+
+    def popup_closed(self, kind):
+        if not self.tracemalloc_cycles or kind not in self.baselines:
+            return
+        count = self.closed[kind] = self.closed.get(kind, 0) + 1
+        if count % self.tracemalloc_cycles:
+            return
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        stats = snapshot.compare_to(self.baselines[kind], "lineno")
+        lines = [f"Top {TRACEMALLOC_TOP} allocation changes after {count} {kind} popup cycles",
+                 f"Traced now: {tracemalloc.get_traced_memory()[0] / 1024:.0f} KiB", ""]
+        lines += [str(stat) for stat in stats[:TRACEMALLOC_TOP]]
+        try:
+            with open(self.report_path(f"tracemalloc-{kind}-{count}", ".txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            log_error(f"tracemalloc report failed: {e}", exc=e)
+
+profiler = Profiler()
+
+PRE_BLOCK = re.compile(rb"<pre\b[^>]*>(.*?)</pre\s*>", re.IGNORECASE | re.DOTALL)
+INLINE_TAG = re.compile(r"<[^>]*>")
+
+def extract_pre_text(content):
+    # Product pages wrap the raw text in a single <pre>. Scanning the bytes for
+    # it is far cheaper than building a soup of the whole page.
+    match = PRE_BLOCK.search(content)
+    if not match:
+        return None
+    text = match.group(1).decode("utf-8", errors="replace")
+    if "<" in text:
+        text = INLINE_TAG.sub("", text)
+    return html.unescape(text)
+
+WMO_HEADER = re.compile(r"^([A-Z]{4}\d{2} [A-Z]{4} \d{6}(?: [A-Z]{3})?)[ \t]*$", re.MULTILINE)
+AWIPS_ID = re.compile(r"^([A-Z]{3}[A-Z0-9]{2,3})[ \t]*$", re.MULTILINE)
+ISSUANCE_LINE = re.compile(r"^(\d{3,4} [AP]M [A-Z]{3,4} [A-Z]{3} [A-Z]{3} +\d{1,2} \d{4})[ \t]*$",
+                           re.MULTILINE | re.IGNORECASE)
+UGC_LINE = re.compile(r"\s*[A-Z]{2}[CZ]\d{3}")
+SECTION_BOUNDARY = re.compile(r"^(?:\.(?P<name>[A-Z][^\n]*?)\s*\.\.\.|(?P<mark>&&|\$\$)[ \t]*$)", re.MULTILINE)
+
+class TextProduct:
+    # Sections are kept as (name, start, end) offsets into the product text,
+    # so showing one section is a slice rather than a re-render of the whole
+    def __init__(self, text):
+        self.text = text
+        head = text[:1000]
+        wmo = WMO_HEADER.search(head)
+        self.wmo_header = wmo.group(1) if wmo else ""
+        awips = AWIPS_ID.search(head, wmo.end() if wmo else 0)
+        self.awips_id = awips.group(1) if awips else ""
+        issued = ISSUANCE_LINE.search(head)
+        self.issued = issued.group(1) if issued else ""
+        self.sections = []
+        self.parse_sections()
+
+    def parse_sections(self):
+        text = self.text
+        names = {}
+        start, name = 0, "Header"
+        for match in SECTION_BOUNDARY.finditer(text):
+            self.add_section(names, name, start, match.start())
+            if match.group("name"):
+                start, name = match.start(), match.group("name").strip()
+            else:
+                start, name = match.end(), "Footer" if match.group("mark") == "$$" else "Notes"
+        self.add_section(names, name, start, len(text))
+
+    def add_section(self, names, name, start, end):
+        if not self.text[start:end].strip():
+            return
+        if name == "Footer" and UGC_LINE.match(self.text, start):
+            name = "Zone Segment"
+        # HWOs repeat the same headers for each zone group
+        names[name] = names.get(name, 0) + 1
+        if names[name] > 1:
+            name = f"{name} ({names[name]})"
+        self.sections.append((name, start, end))
+
+    def section_text(self, index):
+        name, start, end = self.sections[index]
+        return self.text[start:end].strip("\n")
+
+def text_product_key(text):
+    head = text[:1000]
+    wmo = WMO_HEADER.search(head)
+    if not wmo:
+        return None
+    awips = AWIPS_ID.search(head, wmo.end())
+    return (awips.group(1) if awips else "", wmo.group(1))
+
+product_cache = OrderedDict()
+PRODUCT_CACHE_SIZE = 32
+
+def get_text_product(text):
+    # Keyed by AWIPS ID + WMO header, which carries the issuance time, so
+    # re-opening an unchanged product skips the parse entirely
+    key = text_product_key(text)
+    if key is None:
+        return TextProduct(text)
+    product = product_cache.get(key)
+    record_cache("text_product", product is not None)
+    if product is not None:
+        product_cache.move_to_end(key)
+        return product
+    product = TextProduct(text)
+    product_cache[key] = product
+    if len(product_cache) > PRODUCT_CACHE_SIZE:
+        product_cache.popitem(last=False)
+    return product
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key in ("url", "elapsed", "exc_type", "suppressed"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        return json.dumps(entry)
+
+class ErrorFloodFilter(logging.Filter):
+    # Lets at most `burst` records per source (URL host, else message) through
+    # every `window` seconds, so a dead host during a refresh storm cannot
+    # flood the log. The next record let through carries the dropped count.
+    def __init__(self, burst=5, window=60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.lock = threading.Lock()
+        self.sources = {}
+
+    def filter(self, record):
+        url = getattr(record, "url", None)
+        key = urlparse(url).netloc if url else str(record.msg)[:60]
+        now = time.monotonic()
+        with self.lock:
+            start, count, dropped = self.sources.get(key, (now, 0, 0))
+            if now - start >= self.window:
+                if dropped:
+                    record.suppressed = dropped
+                start, count, dropped = now, 0, 0
+            if count >= self.burst:
+                self.sources[key] = (start, count, dropped + 1)
+                return False
+            self.sources[key] = (start, count + 1, dropped)
+            if len(self.sources) > 256:
+                self.sources = {k: v for k, v in self.sources.items() if now - v[0] < self.window}
+        return True
+
+def start_error_log():
+    # Callers only enqueue; one background listener does the file I/O
+    file_handler = RotatingFileHandler(ERROR_LOG, maxBytes=1024 * 1024, backupCount=3,
+                                       encoding="utf-8", delay=True)
+    file_handler.setFormatter(JsonLineFormatter())
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ErrorFloodFilter())
+    logger = logging.getLogger("weather_toolkit")
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return logger
+
+error_logger = start_error_log()
+
+def log_error(msg, url=None, elapsed=None, exc=None):
+    error_logger.error(msg, extra={
+        "url": url,
+        "elapsed": round(elapsed, 3) if elapsed is not None else None,
+        "exc_type": type(exc).__name__ if exc is not None else None,
+    })
+
+class ConfigStore:
+    # Config is kept in memory and shared with the other front end through
+    # one JSON file. Saves are debounced; a flush merges only the keys this
+    # process changed into whatever is on disk, under a lock file, and
+    # swaps the file in with a rename so a crash never leaves half a config.
+    def __init__(self, path, defaults, delay=1.0):
+        self.path = path
+        self.defaults = defaults
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.timer = None
+        self.pending = None
+        self.baseline = {}
+
+    def read(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            log_error(f"Error loading config: {e}")
+        return {}
+
+    def load(self):
+        cfg = dict(self.defaults)
+        cfg.update(self.read())
+        self.baseline = dict(cfg)
+        return cfg
+
+    def save(self, cfg):
+        with self.lock:
+            self.pending = dict(cfg)
+            if self.timer:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        # save() only takes self.lock, so the GUI never waits on disk I/O
+        with self.write_lock:
+            with self.lock:
+                if self.timer:
+                    self.timer.cancel()
+                    self.timer = None
+                cfg, self.pending = self.pending, None
+            if cfg is None:
+                return
+            changed = {k: v for k, v in cfg.items() if k not in self.baseline or self.baseline[k] != v}
+            if not changed:
+                return
+            try:
+                with self.file_lock():
+                    merged = self.read()
+                    merged.update(changed)
+                    fd, tmp = tempfile.mkstemp(prefix=".weather_toolkit_config.", suffix=".tmp",
+                                               dir=os.path.dirname(self.path) or ".")
+                    try:
+                        with os.fdopen(fd, "w") as f:
+                            json.dump(merged, f, indent=2)
+                            f.flush()
+                            os.fsync(f.fileno())
+                        os.replace(tmp, self.path)
+                    except Exception:
+                        os.unlink(tmp)
+                        raise
+                self.baseline.update(changed)
+            except Exception as e:
+                log_error(f"Error saving config: {e}")
+
+    @contextmanager
+    def file_lock(self):
+        with open(self.path + ".lock", "a+") as lf:
+            if fcntl:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+            else:
+                lf.seek(0)
+                msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+                else:
+                    lf.seek(0)
+                    msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+
+config_store = ConfigStore(CONFIG_FILE, DEFAULT_CONFIG)
+atexit.register(config_store.flush)
+
+def load_config():
+    return config_store.load()
 
 def save_config(cfg):
+    config_store.save(cfg)
+
+PRODUCT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY,
+    awips_id TEXT NOT NULL,
+    wmo_header TEXT NOT NULL,
+    issued TEXT NOT NULL,
+    issued_utc REAL NOT NULL,
+    url TEXT,
+    fetched_utc REAL NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE (awips_id, wmo_header)
+);
+CREATE INDEX IF NOT EXISTS products_by_issuance ON products (awips_id, issued_utc);
+"""
+
+PRODUCT_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(text, content='products', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS products_ai AFTER INSERT ON products BEGIN
+    INSERT INTO products_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS products_ad AFTER DELETE ON products BEGIN
+    INSERT INTO products_fts(products_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+TZ_OFFSETS = {"UTC": 0, "GMT": 0, "EST": -5, "EDT": -4, "CST": -6, "CDT": -5,
+              "MST": -7, "MDT": -6, "PST": -8, "PDT": -7}
+
+def issuance_epoch(issued):
+    # "530 AM MDT Sun Oct 19 2025" -> seconds since the epoch, or None
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(cfg, f, indent=2)
-    except Exception as e:
-        log_error(f"Error saving config: {e}")
+        clock, ampm, zone, _, month, day, year = issued.split()
+        hour, minute = divmod(int(clock), 100)
+        hour = hour % 12 + (12 if ampm.upper() == "PM" else 0)
+        local = datetime.strptime(f"{year} {month} {day} {hour} {minute}", "%Y %b %d %H %M")
+        return local.replace(tzinfo=timezone.utc).timestamp() - TZ_OFFSETS[zone.upper()] * 3600
+    except (ValueError, KeyError):
+        return None
+
+def diff_issuances(old, new):
+    return "\n".join(difflib.unified_diff(old.splitlines(), new.splitlines(),
+                                          "previous issuance", "this issuance", lineterm="", n=1))
+
+class ProductArchive:
+    # Every fetched HWO/AFD lands in a local SQLite file (WAL mode), one row
+    # per product and issuance, with an FTS5 index over the text
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = None
+        self.fts = False
+
+    def connect(self):
+        if self.conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(PRODUCT_SCHEMA)
+            try:
+                conn.executescript(PRODUCT_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                log_error(f"FTS5 unavailable, archive search falls back to LIKE: {e}")
+            self.conn = conn
+        return self.conn
+
+    def store(self, product, url):
+        # Returns True when this issuance was not archived before
+        if not (product.awips_id and product.wmo_header):
+            return False
+        now = time.time()
+        issued_utc = issuance_epoch(product.issued) or now
+        try:
+            with self.lock, self.connect() as conn:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO products (awips_id, wmo_header, issued, issued_utc, url, fetched_utc, text) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (product.awips_id, product.wmo_header, product.issued, issued_utc, url, now, product.text))
+                return cur.rowcount == 1
+        except sqlite3.Error as e:
+            log_error(f"Archive store error: {e}", url=url, exc=e)
+            return False
+
+    def previous(self, awips_id, wmo_header):
+        # Text of the issuance just before the given one, if archived
+        try:
+            with self.lock:
+                row = self.connect().execute(
+                    "SELECT p.text FROM products p, products cur "
+                    "WHERE cur.awips_id = ? AND cur.wmo_header = ? AND p.awips_id = cur.awips_id "
+                    "AND p.issued_utc < cur.issued_utc ORDER BY p.issued_utc DESC LIMIT 1",
+                    (awips_id, wmo_header)).fetchone()
+        except sqlite3.Error as e:
+            log_error(f"Archive lookup error: {e}", exc=e)
+            return None
+        return row[0] if row else None
+
+    def products(self):
+        try:
+            with self.lock:
+                return [r[0] for r in self.connect().execute("SELECT DISTINCT awips_id FROM products ORDER BY awips_id")]
+        except sqlite3.Error as e:
+            log_error(f"Archive lookup error: {e}", exc=e)
+            return []
+
+    def search(self, query, awips_id=None, days=7, limit=200):
+        # Rows of (id, awips_id, wmo_header, issued, snippet), newest first
+        since = time.time() - days * 86400
+        params = [since]
+        where = "p.issued_utc >= ?"
+        if awips_id:
+            where += " AND p.awips_id = ?"
+            params.append(awips_id)
+        with self.lock:
+            conn = self.connect()
+            if not query.strip():
+                sql = (f"SELECT p.id, p.awips_id, p.wmo_header, p.issued, '' FROM products p WHERE {where} "
+                       "ORDER BY p.issued_utc DESC LIMIT ?")
+            elif self.fts:
+                # Quote each term so user input can't trip FTS5 query syntax
+                match = " ".join('"%s"' % t.replace('"', '""') for t in query.split())
+                sql = ("SELECT p.id, p.awips_id, p.wmo_header, p.issued, "
+                       "snippet(products_fts, 0, '[', ']', '…', 12) "
+                       f"FROM products_fts JOIN products p ON p.id = products_fts.rowid "
+                       f"WHERE products_fts MATCH ? AND {where} ORDER BY p.issued_utc DESC LIMIT ?")
+                params.insert(0, match)
+            else:
+                sql = (f"SELECT p.id, p.awips_id, p.wmo_header, p.issued, '' FROM products p "
+                       f"WHERE p.text LIKE ? AND {where} ORDER BY p.issued_utc DESC LIMIT ?")
+                params.insert(0, f"%{query.strip()}%")
+            params.append(limit)
+            return conn.execute(sql, params).fetchall()
+
+    def get(self, row_id):
+        try:
+            with self.lock:
+                row = self.connect().execute(
+                    "SELECT awips_id, wmo_header, text FROM products WHERE id = ?", (row_id,)).fetchone()
+        except sqlite3.Error as e:
+            log_error(f"Archive lookup error: {e}", exc=e)
+            return None
+        return row
+
+product_archive = ProductArchive(ARCHIVE_DB)
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CAP_NAMESPACES = ("{urn:oasis:names:tc:emergency:cap:1.2}", "{urn:oasis:names:tc:emergency:cap:1.1}")
+
+def cap_field(entry, name):
+    for ns in CAP_NAMESPACES:
+        el = entry.find(ns + name)
+        if el is not None:
+            return (el.text or "").strip()
+    return ""
+
+def iso_epoch(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+def parse_alert_entry(entry):
+    # Flatten one Atom/CAP <entry> into a plain dict used by the viewers and
+    # the history store
+    title = entry.find(ATOM_NS + "title")
+    summary = entry.find(ATOM_NS + "summary")
+    link = entry.find(ATOM_NS + "link")
+    alert_id = entry.find(ATOM_NS + "id")
+    updated = entry.find(ATOM_NS + "updated")
+    area = cap_field(entry, "areaDesc")
+    zones = []
+    for ns in CAP_NAMESPACES:
+        geocode = entry.find(ns + "geocode")
+        if geocode is None:
+            continue
+        value_name = ""
+        for child in geocode:
+            tag = child.tag.rsplit("}", 1)[-1]
+            if tag == "valueName":
+                value_name = (child.text or "").strip()
+            elif tag == "value" and value_name == "UGC":
+                zones.extend((child.text or "").split())
+        break
+    href = link.attrib.get("href", "") if link is not None else ""
+    return {
+        "id": (alert_id.text or "").strip() if alert_id is not None else href,
+        "updated": (updated.text or "").strip() if updated is not None else "",
+        "title": (title.text or "") if title is not None else "",
+        "summary": (summary.text or "") if summary is not None else "",
+        "link": href,
+        "event": cap_field(entry, "event"),
+        "severity": cap_field(entry, "severity"),
+        "area": area,
+        "counties": [c.strip() for c in area.split(";") if c.strip()],
+        "zones": zones,
+        "onset": iso_epoch(cap_field(entry, "onset") or cap_field(entry, "effective")),
+        "expires": iso_epoch(cap_field(entry, "expires")),
+    }
+
+COUNTY_IN_ZONE = re.compile(r"([A-Z][A-Za-z.' ]*?) Count(?:y|ies)")
+DIRECTION_PREFIX = re.compile(r"^(?:(?:North|South|East|West|Central)\w*\s+)+")
+STATE_SUFFIX = re.compile(r",\s*[A-Z]{2}$")
+
+def county_names(counties):
+    # "El Paso, CO" and zone names like "Southern El Paso County/Rampart
+    # Range" both index as "El Paso", so county lookups stay exact matches
+    names = set()
+    for item in counties:
+        names.add(STATE_SUFFIX.sub("", item))
+        for part in item.split("/"):
+            names.update(DIRECTION_PREFIX.sub("", m.strip()) for m in COUNTY_IN_ZONE.findall(part))
+    return names
+
+def parse_alert_feed(content):
+    rootx = ET.fromstring(content)
+    return [parse_alert_entry(entry) for entry in rootx.findall(ATOM_NS + "entry")]
+
+ALERT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    alert_id TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    event TEXT,
+    severity TEXT,
+    title TEXT,
+    summary TEXT,
+    link TEXT,
+    area TEXT,
+    onset_utc REAL,
+    expires_utc REAL,
+    seen_utc REAL NOT NULL,
+    UNIQUE (alert_id, updated)
+);
+CREATE TABLE IF NOT EXISTS alert_areas (
+    alert_row INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS alert_areas_by_name ON alert_areas (kind, name, alert_row);
+CREATE INDEX IF NOT EXISTS alert_areas_by_row ON alert_areas (alert_row);
+CREATE INDEX IF NOT EXISTS alerts_by_event ON alerts (event);
+CREATE INDEX IF NOT EXISTS alerts_by_onset ON alerts (onset_utc);
+CREATE INDEX IF NOT EXISTS alerts_by_expires ON alerts (expires_utc);
+"""
+
+class AlertHistory:
+    # Append-only store of every alert version seen, one row per
+    # (alert id, updated). A whole refresh is written in one transaction.
+    def __init__(self, path, retention_days=14):
+        self.path = path
+        self.retention = retention_days * 86400
+        self.lock = threading.Lock()
+        self.conn = None
+        self.last_purge = 0
+
+    def connect(self):
+        if self.conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(ALERT_SCHEMA)
+            self.conn = conn
+        return self.conn
+
+    def store(self, alerts):
+        # Returns the alert versions that were not in the store yet
+        now = time.time()
+        rows = [(a["id"], a["updated"], a["event"], a["severity"], a["title"], a["summary"], a["link"],
+                 a["area"], a["onset"], a["expires"], now) for a in alerts if a["id"]]
+        areas = []
+        for a in alerts:
+            names = [("county", c) for c in county_names(a["counties"])] + [("ugc", z) for z in a["zones"]]
+            areas.extend((kind, name, a["id"], a["updated"], now) for kind, name in names)
+        try:
+            with self.lock, self.connect() as conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO alerts (alert_id, updated, event, severity, title, summary, link, "
+                    "area, onset_utc, expires_utc, seen_utc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                if conn.total_changes == before:
+                    return []
+                # Only rows inserted by this batch carry this seen_utc
+                conn.executemany(
+                    "INSERT INTO alert_areas (alert_row, kind, name) SELECT id, ?, ? FROM alerts "
+                    "WHERE alert_id = ? AND updated = ? AND seen_utc = ?", areas)
+                new = {r[0] for r in conn.execute(
+                    "SELECT alert_id || ' ' || updated FROM alerts WHERE seen_utc = ?", (now,))}
+                if now - self.last_purge > 3600:
+                    self.purge(conn, now)
+        except sqlite3.Error as e:
+            log_error(f"Alert history store error: {e}", exc=e)
+            return []
+        return [a for a in alerts if f"{a['id']} {a['updated']}" in new]
+
+    def purge(self, conn, now):
+        cutoff = now - self.retention
+        conn.execute("DELETE FROM alert_areas WHERE alert_row IN "
+                     "(SELECT id FROM alerts WHERE COALESCE(expires_utc, seen_utc) < ?)", (cutoff,))
+        conn.execute("DELETE FROM alerts WHERE COALESCE(expires_utc, seen_utc) < ?", (cutoff,))
+        self.last_purge = now
+
+    def query(self, since, until=None, county=None, ugc=None, event=None, limit=1000):
+        # Latest version of every alert in effect at some point in
+        # [since, until], optionally limited to a county, UGC zone or event
+        until = until or time.time()
+        where = ["COALESCE(a.onset_utc, a.seen_utc) <= ?", "COALESCE(a.expires_utc, a.seen_utc) >= ?"]
+        params = [until, since]
+        if event:
+            where.append("a.event LIKE ?")
+            params.append(f"%{event}%")
+        for kind, name in (("county", county), ("ugc", ugc)):
+            if name:
+                where.append("a.id IN (SELECT alert_row FROM alert_areas WHERE kind = ? AND name = ?)")
+                params.extend((kind, name))
+        sql = ("SELECT a.alert_id, MAX(a.updated), a.event, a.severity, a.title, a.summary, a.link, a.area, "
+               "a.onset_utc, a.expires_utc FROM alerts a WHERE " + " AND ".join(where) +
+               " GROUP BY a.alert_id ORDER BY a.onset_utc DESC LIMIT ?")
+        params.append(limit)
+        with self.lock:
+            rows = self.connect().execute(sql, params).fetchall()
+        return [{
+            "id": r[0], "updated": r[1], "event": r[2], "severity": r[3], "title": r[4], "summary": r[5],
+            "link": r[6], "area": r[7], "counties": [c.strip() for c in (r[7] or "").split(";") if c.strip()],
+            "zones": [], "onset": r[8], "expires": r[9],
+        } for r in rows]
+
+alert_history = AlertHistory(ARCHIVE_DB)
+
+def format_alerts(alerts):
+    return "".join(f"🚨 {a['title']}\n📝 {a['summary']}\n🗺️ {a['area']}\n🔗 {a['link']}\n\n" for a in alerts)
+
+class KeywordWatcher:
+    # Aho-Corasick automaton over the lowercased watch patterns, so a single
+    # pass over a text finds every pattern no matter how many are watched
+    def __init__(self, patterns):
+        self.patterns = sorted({p.strip() for p in patterns if p.strip()}, key=str.lower)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pattern in self.patterns:
+            state = 0
+            for ch in pattern.lower():
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pattern)
+        # Breadth-first so every fail target is finished before it is used
+        pending = list(self.goto[0].values())
+        for state in pending:
+            for ch, nxt in self.goto[state].items():
+                pending.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def scan(self, text):
+        # Patterns found as whole words in text
+        hits = set()
+        if not self.patterns or not text:
+            return hits
+        lowered = text.lower()
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for pattern in out[state]:
+                begin = i - len(pattern) + 1
+                if (begin == 0 or not lowered[begin - 1].isalnum()) and \
+                        (i + 1 == len(lowered) or not lowered[i + 1].isalnum()):
+                    hits.add(pattern)
+        return hits
+
+keyword_watcher = KeywordWatcher(DEFAULT_CONFIG["watch_patterns"])
+
+def set_watch_patterns(patterns):
+    # Workers only ever read the module-level reference, so swapping in a
+    # freshly built automaton needs no locking
+    global keyword_watcher
+    keyword_watcher = KeywordWatcher(patterns)
 
 class ModernButton(QPushButton):
     def __init__(self, text, parent=None):
@@ -274,6 +1443,10 @@ class ModernButton(QPushButton):
                 background: {theme['button_pressed']};
                 border-color: {theme['accent_hover']};
             }}
+            QPushButton:disabled {{
+                color: {theme['fg_secondary']};
+                border-style: dashed;
+            }}
         """)
 
 class ModernGroupBox(QGroupBox):
@@ -321,7 +1494,7 @@ class SettingsDialog(QDialog):
                 font-weight: 500;
                 margin: 5px 0;
             }}
-            QComboBox, QSpinBox, QLineEdit {{
+            QComboBox, QSpinBox, QLineEdit, QTextEdit {{
                 background: {theme['entry_bg']};
                 color: {theme['entry_fg']};
                 border: 2px solid {theme['entry_border']};
@@ -397,6 +1570,24 @@ class SettingsDialog(QDialog):
         layout.addWidget(tooltip_label)
         layout.addWidget(self.tooltip_check)
         
+        # Keyword watch list
+        watch_label = QLabel("👀 Watch Keywords (one per line):")
+        self.watch_edit = QTextEdit()
+        self.watch_edit.setPlainText("\n".join(config.get("watch_patterns", [])))
+        self.watch_edit.setMaximumHeight(120)
+        layout.addWidget(watch_label)
+        layout.addWidget(self.watch_edit)
+        
+        # Bandwidth profile
+        bandwidth_label = QLabel("📶 Bandwidth Profile:")
+        self.bandwidth_box = QComboBox()
+        self.bandwidth_box.addItems(BANDWIDTH_PROFILES)
+        self.bandwidth_box.setCurrentText(config.get("bandwidth_profile", "normal"))
+        self.bandwidth_box.setToolTip(f"Low: smaller GOES images, compressed transfers, "
+                                      f"{LOW_BANDWIDTH_POLL_FACTOR}x slower polling, no web video")
+        layout.addWidget(bandwidth_label)
+        layout.addWidget(self.bandwidth_box)
+        
         # Buttons
         button_layout = QHBoxLayout()
         btn_save = QPushButton("💾 Save Settings")
@@ -417,6 +1608,8 @@ class SettingsDialog(QDialog):
             "default_section": self.section_edit.text(),
             "compact_mode": self.compact_check.currentText() == "Yes",
             "show_tooltips": self.tooltip_check.currentText() == "Yes",
+            "watch_patterns": [p.strip() for p in self.watch_edit.toPlainText().splitlines() if p.strip()],
+            "bandwidth_profile": self.bandwidth_box.currentText(),
         }
         self.accept()
 
@@ -457,6 +1650,17 @@ class TextPopup(QDialog):
                 font-weight: 600;
                 padding: 5px;
             }}
+            QListWidget {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 8px;
+                padding: 4px;
+            }}
+            QListWidget::item:selected {{
+                background: {theme['accent']};
+                color: {theme['bg']};
+            }}
         """)
         
         layout = QVBoxLayout()
@@ -465,11 +1669,22 @@ class TextPopup(QDialog):
         self.status = QLabel(f"Loading {typ}...")
         layout.addWidget(self.status)
         
-        # Text area
+        # Section sidebar and text area
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.product = None
+        self.previous_text = None
+        self.sections = QListWidget()
+        self.sections.setMaximumWidth(280)
+        self.sections.setVisible(False)
+        self.sections.currentRowChanged.connect(self.show_section)
+        splitter.addWidget(self.sections)
+        
         self.text = QTextEdit()
         self.text.setReadOnly(True)
         self.text.setFont(QFont("Consolas", font_size))
-        layout.addWidget(self.text)
+        splitter.addWidget(self.text)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
         
         # Controls
         ctrl = QHBoxLayout()
@@ -477,148 +1692,2761 @@ class TextPopup(QDialog):
         btn_copy.clicked.connect(self.copy_all)
         btn_save = QPushButton("💾 Save As...")
         btn_save.clicked.connect(self.save_as)
+        self.btn_changes = QPushButton("🔀 Changes Since Last Issuance")
+        self.btn_changes.clicked.connect(self.show_changes)
+        self.btn_changes.setVisible(False)
         btn_close = QPushButton("❌ Close")
         btn_close.clicked.connect(self.close)
         
         ctrl.addWidget(btn_copy)
         ctrl.addWidget(btn_save)
+        ctrl.addWidget(self.btn_changes)
         ctrl.addStretch()
         ctrl.addWidget(btn_close)
         
         layout.addLayout(ctrl)
         self.setLayout(layout)
         
+        self.span = FetchSpan(url, typ)
         QTimer.singleShot(100, lambda: self.load_content(url, typ, parse_pre))
 
     def load_content(self, url, typ, parse_pre):
+        span = self.span
+        span.lap("queue")
+        error = None
+        start = time.perf_counter()
         try:
-            resp = requests.get(url, timeout=10)
+            resp = fetch(url, timeout=10, span=span)
             if parse_pre:
-                soup = BeautifulSoup(resp.content, "html.parser")
-                pre = soup.find("pre")
-                text = pre.text if pre else f"{typ} content not found."
+                text = extract_pre_text(resp.content) or f"{typ} content not found."
             else:
                 text = resp.text
         except Exception as e:
+            error = e
             text = f"Failed to retrieve {typ}:\n{e}"
-            log_error(text)
+            log_error(text, url=url, elapsed=time.perf_counter() - start, exc=e)
+        product = get_text_product(text) if parse_pre else None
+        span.lap("parse")
         
         self.text.setPlainText(text)
         self.status.setText(f"✅ {typ} loaded successfully")
+        if product is not None:
+            if product_archive.store(product, url):
+                hits = keyword_watcher.scan(product.text)
+                notify = getattr(self.parent(), "notify_watch_hits", None)
+                if hits and notify:
+                    notify(f"{product.awips_id or typ} {product.issued}".strip(), sorted(hits))
+            self.show_product(product, typ)
+            self.previous_text = product_archive.previous(product.awips_id, product.wmo_header)
+            self.btn_changes.setVisible(self.previous_text is not None)
+        span.lap("render")
+        span.finish(error)
+
+    def show_product(self, product, typ):
+        self.product = product
+        if len(product.sections) < 2:
+            return
+        self.sections.blockSignals(True)
+        self.sections.clear()
+        self.sections.addItem("📄 Full Text")
+        self.sections.addItems([name for name, _, _ in product.sections])
+        self.sections.setCurrentRow(0)
+        self.sections.blockSignals(False)
+        self.sections.setVisible(True)
+        if product.issued:
+            self.status.setText(f"✅ {typ} {product.awips_id} issued {product.issued}")
+
+    def show_section(self, row):
+        if self.product is None or row < 0:
+            return
+        if row == 0:
+            self.text.setPlainText(self.product.text)
+        else:
+            self.text.setPlainText(self.product.section_text(row - 1))
+        self.text.moveCursor(self.text.textCursor().MoveOperation.Start)
+
+    def show_changes(self):
+        self.sections.setCurrentRow(-1)
+        diff = diff_issuances(self.previous_text, self.product.text)
+        self.text.setPlainText(diff or "No changes since the previous issuance.")
 
     def copy_all(self):
-        QApplication.clipboard().setText(self.text.toPlainText())
+        text = self.product.text if self.product else self.text.toPlainText()
+        QApplication.clipboard().setText(text)
 
     def save_as(self):
         fname, _ = QFileDialog.getSaveFileName(self, "Save Text", "", "Text Files (*.txt)")
         if fname:
             try:
                 with open(fname, "w") as f:
-                    f.write(self.text.toPlainText())
+                    f.write(self.product.text if self.product else self.text.toPlainText())
             except Exception as e:
                 QMessageBox.warning(self, "Save Error", f"Could not save file: {e}")
 
-class ImagePopup(QDialog):
-    def __init__(self, parent, url, theme, font_size):
+class ArchiveDialog(QDialog):
+    def __init__(self, parent, theme, font_size):
         super().__init__(parent)
-        self.setWindowTitle("🛰️ GOES Satellite Snapshot")
-        self.setMinimumSize(1200, 800)
-        
-        self.setStyleSheet(f"""
-            QDialog {{
-                background: {theme['bg']};
-                color: {theme['fg']};
+        self.setWindowTitle("📚 Product Archive")
+        self.setMinimumSize(1100, 750)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QLineEdit, QComboBox, QSpinBox, QListWidget {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 6px;
+                padding: 6px;
             }}
             QLabel {{
-                color: {theme['accent']};
-                font-weight: 600;
-                padding: 10px;
-            }}
-            QPushButton {{
-                background: {theme['button_bg']};
-                color: {theme['button_fg']};
-                border: 2px solid {theme['group_border']};
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-weight: 600;
-                margin: 5px;
-            }}
-            QPushButton:hover {{
-                background: {theme['button_hover']};
-                border-color: {theme['accent']};
+                color: {theme['fg']};
             }}
         """)
         
         layout = QVBoxLayout()
         
-        self.status = QLabel("🔄 Loading satellite image...")
+        # Search controls
+        controls = QHBoxLayout()
+        self.query = QLineEdit()
+        self.query.setPlaceholderText("Search archived HWO/AFD text, e.g. hail")
+        self.query.returnPressed.connect(self.run_search)
+        self.product_box = QComboBox()
+        self.product_box.addItem("All products", "")
+        for awips_id in product_archive.products():
+            self.product_box.addItem(awips_id, awips_id)
+        self.days = QSpinBox()
+        self.days.setRange(1, 365)
+        self.days.setValue(7)
+        self.days.setSuffix(" days")
+        btn_search = QPushButton("🔍 Search")
+        btn_search.clicked.connect(self.run_search)
+        controls.addWidget(self.query, 1)
+        controls.addWidget(self.product_box)
+        controls.addWidget(self.days)
+        controls.addWidget(btn_search)
+        layout.addLayout(controls)
+        
+        self.status = QLabel("")
         layout.addWidget(self.status)
         
-        self.img_label = QLabel()
-        self.img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.img_label.setStyleSheet(f"border: 2px solid {theme['group_border']}; border-radius: 8px;")
-        layout.addWidget(self.img_label, 1)
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        self.results = QListWidget()
+        self.results.currentRowChanged.connect(self.show_result)
+        splitter.addWidget(self.results)
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFont("Consolas", font_size))
+        splitter.addWidget(self.text)
+        splitter.setSizes([250, 500])
+        layout.addWidget(splitter, 1)
         
+        ctrl = QHBoxLayout()
+        btn_diff = QPushButton("🔀 Changes vs Previous")
+        btn_diff.clicked.connect(self.show_diff)
         btn_close = QPushButton("❌ Close")
         btn_close.clicked.connect(self.close)
-        layout.addWidget(btn_close)
+        ctrl.addWidget(btn_diff)
+        ctrl.addStretch()
+        ctrl.addWidget(btn_close)
+        layout.addLayout(ctrl)
         
         self.setLayout(layout)
-        QTimer.singleShot(100, lambda: self.load_image(url))
+        self.rows = []
+        self.run_search()
 
-    def load_image(self, url):
+    def run_search(self):
+        start = time.perf_counter()
         try:
-            resp = requests.get(url, timeout=15)
-            img = Image.open(BytesIO(resp.content))
-            qt_img = ImageQt.ImageQt(img)
-            pix = QPixmap.fromImage(qt_img)
-            self.img_label.setPixmap(pix.scaled(1100, 600, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
-            self.status.setText("✅ Satellite image loaded successfully")
-        except Exception as e:
-            log_error(f"Image load error: {e}")
-            self.status.setText("❌ Failed to load satellite image")
-
-
-
-class SpotterImagePopup(QDialog):
-    def __init__(self, parent, url, theme, font_size):
-        super().__init__(parent)
-        self.setWindowTitle("📋 Skywarn Spotter Checklist")
+            self.rows = product_archive.search(self.query.text(), self.product_box.currentData(), self.days.value())
+        except sqlite3.Error as e:
+            self.status.setText(f"❌ Search failed: {e}")
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        self.results.clear()
+        for _, awips_id, _, issued, snippet in self.rows:
+            label = f"{awips_id}  {issued}"
+            if snippet:
+                label += f"  —  {' '.join(snippet.split())}"
+            self.results.addItem(label)
+        self.status.setText(f"{len(self.rows)} matches in {elapsed:.1f} ms")
 
-        # Don't set a fixed minimum size - let it size to content
-        # self.setMinimumSize(800, 1200)  # Remove this line
+    def show_result(self, row):
+        if 0 <= row < len(self.rows):
+            found = product_archive.get(self.rows[row][0])
+            self.text.setPlainText(found[2] if found else "")
 
-        QTimer.singleShot(50, lambda: self.move(50, 50))
+    def show_diff(self):
+        row = self.results.currentRow()
+        if not 0 <= row < len(self.rows):
+            return
+        _, awips_id, wmo_header, _, _ = self.rows[row]
+        found = product_archive.get(self.rows[row][0])
+        previous = product_archive.previous(awips_id, wmo_header)
+        if found is None or previous is None:
+            self.text.setPlainText("No earlier issuance of this product is archived.")
+            return
+        self.text.setPlainText(diff_issuances(previous, found[2]) or "No changes since the previous issuance.")
 
+class DiagnosticsDialog(QDialog):
+    STAGE_LABELS = {"queue": "Queue", "connect": "Connect", "ttfb": "TTFB", "download": "Download",
+                    "parse": "Parse", "render": "Render", "total": "Total"}
 
-        self.setStyleSheet(f"""
-            QDialog {{
-                background: {theme['bg']};
-                color: {theme['fg']};
+    def __init__(self, parent, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("🩺 Diagnostics")
+        self.setMinimumSize(1200, 500)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QTableWidget {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                gridline-color: {theme['group_border']};
             }}
             QLabel {{
-                color: {theme['accent']};
-                font-weight: 600;
-                padding: 10px;
-            }}
-            QPushButton {{
-                background: {theme['button_bg']};
-                color: {theme['button_fg']};
-                border: 2px solid {theme['group_border']};
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-weight: 600;
-                margin: 5px;
-            }}
-            QPushButton:hover {{
-                background: {theme['button_hover']};
-                border-color: {theme['accent']};
+                color: {theme['fg']};
             }}
         """)
-
+        
         layout = QVBoxLayout()
-
-        self.status = QLabel("🔄 Loading spotter checklist...")
+        self.status = QLabel("")
+        layout.addWidget(self.status)
+        
+        headers = ["Host", "Product", "Fetches", "Errors", "KiB"] + list(self.STAGE_LABELS.values()) + ["Peak MiB"]
+        self.table = QTableWidget(0, len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.table.setFont(QFont("Consolas", font_size))
+        layout.addWidget(self.table, 1)
+        
+        ctrl = QHBoxLayout()
+        btn_refresh = QPushButton("🔄 Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_export = QPushButton("💾 Export JSON...")
+        btn_export.clicked.connect(self.export)
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        ctrl.addWidget(btn_refresh)
+        ctrl.addWidget(btn_export)
+        ctrl.addStretch()
+        ctrl.addWidget(btn_close)
+        layout.addLayout(ctrl)
+        
+        self.setLayout(layout)
+        self.refresh()
+
+    def refresh(self):
+        spans = timing_snapshot()
+        rows = summarize_timings(spans)
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            cells = [row["host"], row["product"], str(row["count"]), str(row["errors"]),
+                     f"{row['bytes'] / 1024:.0f}"]
+            for stage in self.STAGE_LABELS:
+                stats = row.get(stage)
+                cells.append(f"{stats['p50']:.1f} / {stats['p95']:.1f}" if stats else "—")
+            cells.append(f"{row['peak_rss_mb']:.1f}" if "peak_rss_mb" in row else "—")
+            for c, value in enumerate(cells):
+                self.table.setItem(r, c, QTableWidgetItem(value))
+        self.status.setText(f"{len(spans)} recent fetches (last {TIMING_BUFFER_SIZE} kept). "
+                            "Stage times are p50 / p95 in ms; Peak MiB is the largest process RSS seen while an image loaded.")
+
+    def export(self):
+        filename, _ = QFileDialog.getSaveFileName(self, "Export Diagnostics", "cswn-diagnostics.json",
+                                                  "JSON Files (*.json)")
+        if not filename:
+            return
+        try:
+            export_timings(filename)
+            self.status.setText(f"✅ Exported to {filename}")
+        except OSError as e:
+            self.status.setText(f"❌ Export failed: {e}")
+
+GOES_LOOP_SECTORS = {
+    "CONUS": ("https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/GEOCOLOR/", "1250x750"),
+    "Colorado (Southern Rockies)": ("https://cdn.star.nesdis.noaa.gov/GOES19/ABI/SECTOR/sr/GEOCOLOR/", "1200x1200"),
+}
+GOES_LOOP_FRAMES = 12
+GOES_LOOP_DELAY_MS = 250
+GOES_LOOP_REFRESH_MS = 5 * 60 * 1000
+GOES_FETCH_WORKERS = 6
+# The CDN directory index names every frame YYYYJJJHHMM_GOES19-ABI-<sector>-GEOCOLOR-<size>.jpg
+GOES_FRAME_FILE = re.compile(r'href="(?:[^"]*/)?((\d{11})_GOES\d+-ABI-[^"/]+-(\d+x\d+)\.jpg)"')
+
+def list_goes_frames(base_url, size, count):
+    listing = fetch(base_url, timeout=15).content.decode("utf-8", errors="replace")
+    frames = {stamp: base_url + name for name, stamp, frame_size in GOES_FRAME_FILE.findall(listing)
+              if frame_size == size}
+    return sorted(frames.items())[-count:]
+
+def goes_frame_time(stamp):
+    return datetime.strptime(stamp, "%Y%j%H%M").strftime("%b %d %H:%M UTC")
+
+class FrameRing:
+    """The newest decoded frames of one loop, never more than capacity."""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.frames = {}
+
+    def add(self, stamp, frame):
+        self.frames[stamp] = frame
+        for old in sorted(self.frames)[:-self.capacity]:
+            del self.frames[old]
+
+    def resize(self, capacity):
+        self.capacity = capacity
+        for old in sorted(self.frames)[:-capacity]:
+            del self.frames[old]
+
+    def missing(self, listed):
+        # Anything already decoded, or older than a full ring, is skipped
+        newest = sorted(stamp for stamp, _ in listed)[-self.capacity:]
+        return [(stamp, url) for stamp, url in listed if stamp in newest and stamp not in self.frames]
+
+    def ordered(self):
+        return [(stamp, self.frames[stamp]) for stamp in sorted(self.frames)]
+
+IMAGE_POOL_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+image_executor = None
+image_pool_lock = threading.Lock()
+
+def image_pool():
+    # Spawned rather than forked: forking a process that is running GUI and
+    # network threads is not safe. False once the pool has failed to start.
+    global image_executor
+    with image_pool_lock:
+        if image_executor is None:
+            image_executor = ProcessPoolExecutor(IMAGE_POOL_WORKERS,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(image_executor.shutdown, wait=False, cancel_futures=True)
+        return image_executor
+
+def disable_image_pool(error):
+    global image_executor
+    with image_pool_lock:
+        if image_executor is False:
+            return
+        if image_executor is not None:
+            image_executor.shutdown(wait=False, cancel_futures=True)
+        image_executor = False
+    log_error(f"Image pool unavailable, decoding in-process: {error}", exc=error)
+
+IMAGE_HEADER_BYTES = 64 * 1024
+READ_CHUNK = 64 * 1024
+
+def shared_source(content):
+    source = shared_memory.SharedMemory(create=True, size=max(1, len(content)))
+    source.buf[:len(content)] = content
+    return source
+
+def release_shared(shm):
+    shm.close()
+    shm.unlink()
+
+def fetch_shared(url, timeout=10, span=None):
+    # Like fetch, but the body is read straight into a shared memory block
+    # sized from Content-Length rather than collected in chunks and joined.
+    # Returns the block and the body length.
+    if offline_pack is not None:
+        resp = fetch(url, timeout=timeout, span=span)
+        return shared_source(resp.content), len(resp.content)
+    net_local.connect_time = 0.0
+    start = time.perf_counter()
+    resp = http_session().get(resolve_url(url), timeout=timeout, stream=True, headers=request_headers())
+    first_byte = time.perf_counter()
+    length = int(resp.headers.get("Content-Length") or 0)
+    source = None
+    try:
+        if resp.ok and length and resp.headers.get("Content-Encoding", "identity") == "identity":
+            source = shared_memory.SharedMemory(create=True, size=length)
+            received = 0
+            while received < length:
+                count = resp.raw.readinto(source.buf[received:received + READ_CHUNK])
+                if not count:
+                    raise requests.ConnectionError(f"Connection closed after {received} of {length} bytes")
+                received += count
+            resp.raw.release_conn()
+        if span is not None:
+            span.network(resp, start, first_byte)
+        resp.raise_for_status()
+        if source is None:
+            length = len(resp.content)
+            source = shared_source(resp.content)
+        count_session_bytes(resp)
+    except Exception:
+        if source is not None:
+            release_shared(source)
+        raise
+    return source, length
+
+def decode_to_shared(source_name, length, name, max_size):
+    # Runs in a pool process: decode the compressed bytes in one shared
+    # block, shrink, convert to RGBA and write the pixels into another
+    source = shared_memory.SharedMemory(name=source_name)
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        img = Image.open(BytesIO(source.buf[:length]))
+        if max_size:
+            # draft() has the JPEG decoder skip to the nearest reduced scale,
+            # so the one resample below starts from a small image
+            img.draft("RGB", max_size)
+            img.thumbnail(max_size, Image.Resampling.LANCZOS)
+        img = img.convert("RGBA")
+        shm.buf[:img.width * img.height * 4] = img.tobytes()
+        return img.size
+    finally:
+        source.close()
+        shm.close()
+
+class SharedImage:
+    """RGBA pixels decoded by the image pool, held in shared memory until released."""
+    def __init__(self, source, length, max_size=None):
+        # Only the header is read here; it bounds the size of the result
+        try:
+            header = Image.open(BytesIO(source.buf[:min(length, IMAGE_HEADER_BYTES)]))
+        except Exception:
+            header = Image.open(BytesIO(source.buf[:length]))
+        width, height = header.size
+        header.close()
+        if max_size:
+            width, height = min(width, max_size[0]), min(height, max_size[1])
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, width * height * 4))
+        self.size = None
+
+    def release(self):
+        release_shared(self.shm)
+
+def decode_shared(source, length, max_size=None):
+    shared = SharedImage(source, length, max_size)
+    args = (source.name, length, shared.shm.name, max_size)
+    try:
+        pool = image_pool()
+        try:
+            if pool is False:
+                raise BrokenProcessPool("disabled after an earlier failure")
+            shared.size = pool.submit(decode_to_shared, *args).result()
+        except (BrokenProcessPool, OSError) as e:
+            if pool is not False:
+                disable_image_pool(e)
+            shared.size = decode_to_shared(*args)
+    except Exception:
+        shared.release()
+        raise
+    return shared
+
+def decode_image(content, max_size=None):
+    source = shared_source(content)
+    try:
+        return decode_shared(source, len(content), max_size)
+    finally:
+        release_shared(source)
+
+def load_image(url, max_size=None, timeout=15, span=None):
+    # Network bytes land in shared memory and are decoded from there, so the
+    # compressed image is never copied into this process's heap
+    source, length = fetch_shared(bandwidth_variant(url), timeout=timeout, span=span)
+    try:
+        return decode_shared(source, length, max_size)
+    finally:
+        release_shared(source)
+
+def shared_pixmap(shared):
+    # The QImage is a view over the shared block; the pixmap upload is the
+    # only copy made in this process
+    width, height = shared.size
+    image = QImage(shared.shm.buf, width, height, width * 4, QImage.Format.Format_RGBA8888)
+    pix = QPixmap.fromImage(image)
+    del image
+    shared.release()
+    return pix
+
+def scaled_pixmap(content, width, height):
+    return shared_pixmap(decode_image(content, (width, height)))
+
+class ImageLoader(QThread):
+    image_ready = pyqtSignal(object)
+    image_failed = pyqtSignal(str)
+
+    # Loaders outlive a popup closed mid-download; keep them referenced
+    # until the thread ends so Qt never destroys a running thread
+    running = set()
+
+    def __init__(self, url, span, max_size=None, timeout=15, parent=None):
+        super().__init__(parent)
+        self.url = url
+        self.span = span
+        self.max_size = max_size
+        self.timeout = timeout
+        ImageLoader.running.add(self)
+        self.finished.connect(lambda: ImageLoader.running.discard(self))
+
+    def run(self):
+        span = self.span
+        span.lap("queue")
+        try:
+            shared = load_image(self.url, self.max_size, self.timeout, span)
+        except Exception as e:
+            log_error(f"Image load error: {e}", url=self.url, exc=e)
+            span.finish(e)
+            self.image_failed.emit(str(e))
+            return
+        span.lap("parse")
+        self.image_ready.emit(shared)
+
+class ImagePopup(QDialog):
+    def __init__(self, parent, url, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("🛰️ GOES Satellite Snapshot")
+        self.setMinimumSize(1200, 800)
+        
+        self.setStyleSheet(f"""
+            QDialog {{
+                background: {theme['bg']};
+                color: {theme['fg']};
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+                padding: 10px;
+            }}
+            QPushButton {{
+                background: {theme['button_bg']};
+                color: {theme['button_fg']};
+                border: 2px solid {theme['group_border']};
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-weight: 600;
+                margin: 5px;
+            }}
+            QPushButton:hover {{
+                background: {theme['button_hover']};
+                border-color: {theme['accent']};
+            }}
+        """)
+        
+        layout = QVBoxLayout()
+        
+        self.status = QLabel("🔄 Loading satellite image...")
+        layout.addWidget(self.status)
+        
+        self.img_label = QLabel()
+        self.img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.img_label.setStyleSheet(f"border: 2px solid {theme['group_border']}; border-radius: 8px;")
+        layout.addWidget(self.img_label, 1)
+        
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        layout.addWidget(btn_close)
+        
+        self.setLayout(layout)
+        self.loader = ImageLoader(url, FetchSpan(url, "GOES image", memory=True), (1100, 600))
+        self.loader.image_ready.connect(self.show_image)
+        self.loader.image_failed.connect(lambda error: self.status.setText("❌ Failed to load satellite image"))
+        QTimer.singleShot(100, self.loader.start)
+
+    def show_image(self, shared):
+        start = time.perf_counter()
+        self.img_label.setPixmap(shared_pixmap(shared))
+        self.status.setText("✅ Satellite image loaded successfully")
+        self.loader.span.set("render", time.perf_counter() - start)
+        self.loader.span.finish()
+
+
+
+class GoesLoopFetcher(QThread):
+    frame_loaded = pyqtSignal(str, object)
+    loop_fetched = pyqtSignal(int, str)
+
+    # A loop closed mid-fetch hands its fetcher off here rather than
+    # blocking the GUI thread until the downloads finish
+    running = set()
+
+    def __init__(self, pool, sector, ring, display_size, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.base_url, size = GOES_LOOP_SECTORS[sector]
+        self.size = LOW_BANDWIDTH_LOOP_SIZES.get(size, size) if low_bandwidth else size
+        self.ring = ring
+        self.display_size = display_size
+        GoesLoopFetcher.running.add(self)
+        self.finished.connect(lambda: GoesLoopFetcher.running.discard(self))
+
+    def run(self):
+        try:
+            wanted = self.ring.missing(list_goes_frames(self.base_url, self.size, self.ring.capacity))
+        except Exception as e:
+            log_error(f"GOES loop listing error: {e}", url=self.base_url, exc=e)
+            self.loop_fetched.emit(0, str(e))
+            return
+        try:
+            futures = {self.pool.submit(self.load_frame, url): (stamp, url) for stamp, url in wanted}
+        except RuntimeError:
+            # The popup closed and shut the download pool down
+            return
+        failed = 0
+        for future in as_completed(futures):
+            stamp, url = futures[future]
+            try:
+                self.frame_loaded.emit(stamp, future.result())
+            except Exception as e:
+                failed += 1
+                log_error(f"GOES loop frame error: {e}", url=url, exc=e)
+        self.loop_fetched.emit(len(wanted) - failed, f"{failed} frames failed" if failed else "")
+
+    def load_frame(self, url):
+        # Runs on the download threads; decoding happens on the image pool
+        span = FetchSpan(url, "GOES loop frame")
+        span.lap("queue")
+        try:
+            shared = load_image(url, self.display_size, timeout=20, span=span)
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        return shared
+
+class GoesLoopPopup(QDialog):
+    DISPLAY_SIZE = (1100, 650)
+
+    def __init__(self, parent, theme, font_size, sector="CONUS"):
+        super().__init__(parent)
+        self.setWindowTitle("🎞️ GOES Loop")
+        self.setMinimumSize(1200, 800)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QComboBox, QSpinBox {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 6px;
+                padding: 6px;
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+            }}
+        """)
+        
+        layout = QVBoxLayout()
+        
+        controls = QHBoxLayout()
+        self.sector_box = QComboBox()
+        self.sector_box.addItems(list(GOES_LOOP_SECTORS))
+        self.sector_box.setCurrentText(sector)
+        self.sector_box.currentTextChanged.connect(self.change_sector)
+        self.frame_count = QSpinBox()
+        self.frame_count.setRange(4, 48)
+        self.frame_count.setValue(GOES_LOOP_FRAMES)
+        self.frame_count.setSuffix(" frames")
+        self.frame_count.valueChanged.connect(self.change_frame_count)
+        self.delay = QSpinBox()
+        self.delay.setRange(50, 2000)
+        self.delay.setSingleStep(50)
+        self.delay.setValue(GOES_LOOP_DELAY_MS)
+        self.delay.setSuffix(" ms")
+        self.delay.valueChanged.connect(lambda value: self.play_timer.setInterval(value))
+        self.btn_play = QPushButton("⏸ Pause")
+        self.btn_play.clicked.connect(self.toggle_play)
+        btn_prev = QPushButton("⏮")
+        btn_prev.clicked.connect(lambda: self.step(-1))
+        btn_next = QPushButton("⏭")
+        btn_next.clicked.connect(lambda: self.step(1))
+        btn_refresh = QPushButton("🔄 Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        for widget in (self.sector_box, self.frame_count, self.delay, btn_prev, self.btn_play, btn_next):
+            controls.addWidget(widget)
+        controls.addStretch()
+        controls.addWidget(btn_refresh)
+        layout.addLayout(controls)
+        
+        self.status = QLabel("🔄 Finding frames...")
+        layout.addWidget(self.status)
+        self.img_label = QLabel()
+        self.img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.img_label.setStyleSheet(f"border: 2px solid {theme['group_border']}; border-radius: 8px;")
+        layout.addWidget(self.img_label, 1)
+        
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        layout.addWidget(btn_close)
+        self.setLayout(layout)
+        
+        # One ring per sector so switching back does not refetch
+        self.rings = {}
+        self.index = -1
+        self.playing = True
+        self.fetcher = None
+        self.pending = False
+        self.pool = ThreadPoolExecutor(GOES_FETCH_WORKERS)
+        self.play_timer = QTimer(self)
+        self.play_timer.setInterval(self.delay.value())
+        self.play_timer.timeout.connect(lambda: self.step(1))
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(poll_interval(GOES_LOOP_REFRESH_MS))
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+        QTimer.singleShot(100, self.refresh)
+
+    def ring(self):
+        sector = self.sector_box.currentText()
+        if sector not in self.rings:
+            self.rings[sector] = FrameRing(self.frame_count.value())
+        return self.rings[sector]
+
+    def refresh(self):
+        if self.fetcher is not None and self.fetcher.isRunning():
+            # Run again once this fetch ends, so a sector or frame count
+            # picked mid-load is not left waiting for the refresh timer
+            self.pending = True
+            return
+        self.pending = False
+        ring = self.ring()
+        self.status.setText(f"🔄 Checking for new {self.sector_box.currentText()} frames...")
+        self.fetcher = GoesLoopFetcher(self.pool, self.sector_box.currentText(), ring, self.DISPLAY_SIZE)
+        # Convert to a pixmap once here; playback only swaps pixmaps
+        self.fetcher.frame_loaded.connect(lambda stamp, shared: ring.add(stamp, shared_pixmap(shared)))
+        self.fetcher.loop_fetched.connect(self.loop_fetched)
+        self.fetcher.finished.connect(self.fetch_finished)
+        self.fetcher.start()
+
+    def fetch_finished(self):
+        if self.pending:
+            self.refresh()
+
+    def loop_fetched(self, added, error):
+        if self.pending:
+            # Superseded by a sector or frame count change; the rerun reports
+            return
+        frames = self.ring().ordered()
+        message = f"✅ {len(frames)} frames, {added} new"
+        if error:
+            message = f"⚠️ {message} ({error})"
+        self.status.setText(message)
+        if frames and self.playing:
+            self.play_timer.start()
+        if frames and self.index < 0:
+            self.step(1)
+
+    def change_sector(self, sector):
+        self.index = -1
+        self.img_label.clear()
+        self.refresh()
+
+    def change_frame_count(self, count):
+        for ring in self.rings.values():
+            ring.resize(count)
+        self.refresh()
+
+    def step(self, offset):
+        frames = self.ring().ordered()
+        if not frames:
+            return
+        self.index = (self.index + offset) % len(frames)
+        stamp, pix = frames[self.index]
+        self.img_label.setPixmap(pix)
+        self.status.setText(f"🛰️ {self.sector_box.currentText()}  {goes_frame_time(stamp)}  "
+                            f"({self.index + 1}/{len(frames)})")
+
+    def toggle_play(self):
+        self.playing = not self.playing
+        if self.playing:
+            self.play_timer.start()
+            self.btn_play.setText("⏸ Pause")
+        else:
+            self.play_timer.stop()
+            self.btn_play.setText("▶ Play")
+
+    def done(self, result):
+        self.play_timer.stop()
+        self.refresh_timer.stop()
+        self.pending = False
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        super().done(result)
+
+ZOOM_SECTORS = {
+    "CONUS 5000x3000": "https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/GEOCOLOR/5000x3000.jpg",
+    "Full Disk 5424x5424": "https://cdn.star.nesdis.noaa.gov/GOES19/ABI/FD/GEOCOLOR/5424x5424.jpg",
+}
+TILE_SIZE = 256
+TILE_CACHE_MB = 96
+TILE_LOAD_WORKERS = 2
+ZOOM_MAX_SCALE = 4.0
+
+def pyramid_levels(width, height, tile_size=TILE_SIZE):
+    # Level 0 is full resolution; each level halves it until one tile fits
+    levels = 1
+    while max(width, height) > tile_size << (levels - 1):
+        levels += 1
+    return levels
+
+def level_size(width, height, level):
+    step = 1 << level
+    return (width + step - 1) // step, (height + step - 1) // step
+
+def tile_path(directory, level, col, row):
+    return os.path.join(directory, f"{level}_{col}_{row}.jpg")
+
+def build_tile_level(source_name, length, level, directory, tile_size=TILE_SIZE):
+    # Runs in a pool process. draft() lets the coarse levels decode at a
+    # fraction of full size, so they are ready long before level 0.
+    source = shared_memory.SharedMemory(name=source_name)
+    try:
+        img = Image.open(BytesIO(source.buf[:length]))
+        size = level_size(*img.size, level)
+        img.draft("RGB", size)
+        img = img.convert("RGB")
+        if img.size != size:
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        for top in range(0, size[1], tile_size):
+            for left in range(0, size[0], tile_size):
+                tile = img.crop((left, top, min(left + tile_size, size[0]), min(top + tile_size, size[1])))
+                tile.save(tile_path(directory, level, left // tile_size, top // tile_size), quality=90)
+        return level
+    finally:
+        source.close()
+
+class TileCache:
+    """Least recently used tile pixmaps, capped by their total size in bytes."""
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.tiles = OrderedDict()
+
+    def get(self, key):
+        pix = self.tiles.get(key)
+        if pix is not None:
+            self.tiles.move_to_end(key)
+        return pix
+
+    def put(self, key, pix):
+        if key in self.tiles:
+            self.bytes -= self.pixmap_bytes(self.tiles.pop(key))
+        self.tiles[key] = pix
+        self.bytes += self.pixmap_bytes(pix)
+        while self.bytes > self.max_bytes and len(self.tiles) > 1:
+            _, old = self.tiles.popitem(last=False)
+            self.bytes -= self.pixmap_bytes(old)
+
+    @staticmethod
+    def pixmap_bytes(pix):
+        return pix.width() * pix.height() * 4
+
+    def clear(self):
+        self.tiles.clear()
+        self.bytes = 0
+
+class TileBuilder(QThread):
+    size_known = pyqtSignal(int, int, int)
+    level_ready = pyqtSignal(int)
+    build_failed = pyqtSignal(str)
+
+    running = set()
+
+    def __init__(self, url, directory, parent=None):
+        super().__init__(parent)
+        self.url = url
+        self.directory = directory
+        self.cancelled = False
+        TileBuilder.running.add(self)
+        self.finished.connect(self.cleanup)
+
+    def run(self):
+        span = FetchSpan(self.url, "GOES zoom", memory=True)
+        span.lap("queue")
+        try:
+            source, length = fetch_shared(self.url, timeout=60, span=span)
+        except Exception as e:
+            log_error(f"Zoom image load error: {e}", url=self.url, exc=e)
+            span.finish(e)
+            self.build_failed.emit(str(e))
+            return
+        try:
+            with Image.open(BytesIO(source.buf[:min(length, IMAGE_HEADER_BYTES)])) as header:
+                width, height = header.size
+            levels = pyramid_levels(width, height)
+            self.size_known.emit(width, height, levels)
+            for level in self.build_levels(source.name, length, levels):
+                if not self.cancelled:
+                    self.level_ready.emit(level)
+            span.lap("parse")
+            span.finish()
+        except Exception as e:
+            log_error(f"Zoom tile build error: {e}", url=self.url, exc=e)
+            span.finish(e)
+            self.build_failed.emit(str(e))
+        finally:
+            release_shared(source)
+
+    def build_levels(self, source_name, length, levels):
+        # Coarsest first so there is something to show straight away. Uses
+        # the image pool when it is up, otherwise builds in this thread.
+        pending = list(range(levels - 1, -1, -1))
+        pool = image_pool()
+        if pool is not False:
+            try:
+                futures = {pool.submit(build_tile_level, source_name, length, level, self.directory): level
+                           for level in pending}
+                for future in as_completed(futures):
+                    if self.cancelled:
+                        for other in futures:
+                            other.cancel()
+                    elif not future.cancelled():
+                        yield future.result()
+                    pending.remove(futures[future])
+            except (BrokenProcessPool, OSError) as e:
+                disable_image_pool(e)
+        for level in pending:
+            if self.cancelled:
+                return
+            yield build_tile_level(source_name, length, level, self.directory)
+
+    def cleanup(self):
+        TileBuilder.running.discard(self)
+        if self.cancelled:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+class TileLoader(QObject):
+    tile_loaded = pyqtSignal(object, QImage)
+
+class TileView(QGraphicsView):
+    """Draws only the pyramid tiles that intersect the exposed area."""
+    def __init__(self, directory, background, parent=None):
+        super().__init__(parent)
+        self.directory = directory
+        self.background = QColor(background)
+        self.levels = 0
+        self.ready = set()
+        self.pending = set()
+        self.cache = TileCache(TILE_CACHE_MB * 2 ** 20)
+        self.pool = ThreadPoolExecutor(TILE_LOAD_WORKERS)
+        self.loader = TileLoader()
+        self.loader.tile_loaded.connect(self.tile_loaded)
+        self.setScene(QGraphicsScene(self))
+        self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
+        self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+    def set_image_size(self, width, height, levels):
+        self.levels = levels
+        self.scene().setSceneRect(0, 0, width, height)
+        self.fit()
+
+    def level_ready(self, level):
+        self.ready.add(level)
+        self.viewport().update()
+
+    def scale_factor(self):
+        return self.transform().m11()
+
+    def fit(self):
+        self.fitInView(self.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
+
+    def zoom(self, factor):
+        scale = self.scale_factor()
+        fit_scale = min(self.viewport().width() / max(1, self.sceneRect().width()),
+                        self.viewport().height() / max(1, self.sceneRect().height()))
+        factor = max(fit_scale / 2 / scale, min(ZOOM_MAX_SCALE / scale, factor))
+        self.scale(factor, factor)
+
+    def wheelEvent(self, event):
+        self.zoom(1.25 ** (event.angleDelta().y() / 120))
+
+    def wanted_level(self):
+        scale = self.scale_factor()
+        if scale >= 1:
+            return 0
+        return min(self.levels - 1, int(math.log2(1 / scale)))
+
+    def drawBackground(self, painter, rect):
+        painter.fillRect(rect, self.background)
+        if not self.ready:
+            return
+        level = self.wanted_level()
+        span = TILE_SIZE << level
+        image = self.sceneRect()
+        left, top = max(0, int(rect.left()) // span), max(0, int(rect.top()) // span)
+        right = min(int(min(rect.right(), image.right() - 1)) // span, int(image.width() - 1) // span)
+        bottom = min(int(min(rect.bottom(), image.bottom() - 1)) // span, int(image.height() - 1) // span)
+        for row in range(top, bottom + 1):
+            for col in range(left, right + 1):
+                self.draw_tile(painter, level, col, row)
+
+    def draw_tile(self, painter, level, col, row):
+        # Falls back to the nearest coarser tile already in memory while
+        # this one loads, so panning never shows holes
+        target = QRectF(col * (TILE_SIZE << level), row * (TILE_SIZE << level),
+                        TILE_SIZE << level, TILE_SIZE << level)
+        pix = self.tile(level, col, row)
+        if pix is not None:
+            painter.drawPixmap(QRectF(target.x(), target.y(), pix.width() << level, pix.height() << level),
+                               pix, QRectF(pix.rect()))
+            return
+        for coarse in range(level + 1, self.levels):
+            shift = coarse - level
+            pix = self.tile(coarse, col >> shift, row >> shift, load=False)
+            if pix is None:
+                continue
+            scale = 1 << coarse
+            source = QRectF((target.x() - (col >> shift) * (TILE_SIZE << coarse)) / scale,
+                            (target.y() - (row >> shift) * (TILE_SIZE << coarse)) / scale,
+                            target.width() / scale, target.height() / scale).intersected(QRectF(pix.rect()))
+            painter.drawPixmap(QRectF(target.x(), target.y(), source.width() * scale, source.height() * scale),
+                               pix, source)
+            return
+
+    def tile(self, level, col, row, load=True):
+        key = (level, col, row)
+        pix = self.cache.get(key)
+        if load:
+            record_cache("zoom_tile", pix is not None)
+        if pix is None and load and level in self.ready and key not in self.pending:
+            self.pending.add(key)
+            self.pool.submit(self.load_tile, key)
+        return pix
+
+    def load_tile(self, key):
+        # QImage can be decoded off the GUI thread; QPixmap cannot
+        self.loader.tile_loaded.emit(key, QImage(tile_path(self.directory, *key)))
+
+    def tile_loaded(self, key, image):
+        self.pending.discard(key)
+        if not image.isNull():
+            self.cache.put(key, QPixmap.fromImage(image))
+            self.viewport().update()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.clear()
+
+class ZoomViewer(QDialog):
+    def __init__(self, parent, url, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("🔍 GOES Zoom")
+        self.setMinimumSize(1200, 800)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QComboBox {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 6px;
+                padding: 6px;
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+            }}
+        """)
+        
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        self.sector_box = QComboBox()
+        for name, sector_url in ZOOM_SECTORS.items():
+            self.sector_box.addItem(name, sector_url)
+        if self.sector_box.findData(url) < 0:
+            self.sector_box.addItem(url, url)
+        self.sector_box.setCurrentIndex(self.sector_box.findData(url))
+        self.sector_box.currentIndexChanged.connect(lambda index: self.load(self.sector_box.itemData(index)))
+        controls.addWidget(self.sector_box)
+        for text, action in (("➖", lambda: self.view.zoom(0.8)), ("➕", lambda: self.view.zoom(1.25)),
+                             ("⛶ Fit", lambda: self.view.fit()), ("1:1", lambda: self.actual_size())):
+            btn = QPushButton(text)
+            btn.clicked.connect(action)
+            controls.addWidget(btn)
+        controls.addStretch()
+        layout.addLayout(controls)
+        
+        self.status = QLabel("🔄 Downloading full-resolution image...")
+        layout.addWidget(self.status)
+        self.view_holder = QVBoxLayout()
+        layout.addLayout(self.view_holder, 1)
+        
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        layout.addWidget(btn_close)
+        self.setLayout(layout)
+        
+        self.theme = theme
+        self.view = None
+        self.builder = None
+        self.load(url)
+
+    def load(self, url):
+        self.stop()
+        directory = tempfile.mkdtemp(prefix="cswn-tiles-")
+        if self.view is not None:
+            self.view_holder.removeWidget(self.view)
+            self.view.deleteLater()
+        self.view = TileView(directory, self.theme["bg"])
+        self.view_holder.addWidget(self.view)
+        self.status.setText("🔄 Downloading full-resolution image...")
+        self.builder = TileBuilder(url, directory)
+        self.builder.size_known.connect(self.size_known)
+        self.builder.level_ready.connect(self.level_ready)
+        self.builder.build_failed.connect(lambda error: self.status.setText(f"❌ Failed to load image: {error}"))
+        self.builder.start()
+
+    def size_known(self, width, height, levels):
+        self.view.set_image_size(width, height, levels)
+        self.status.setText(f"🔄 Building {levels} zoom levels for {width}x{height}...")
+
+    def level_ready(self, level):
+        self.view.level_ready(level)
+        if len(self.view.ready) == self.view.levels:
+            rect = self.view.sceneRect()
+            self.status.setText(f"✅ {int(rect.width())}x{int(rect.height())}, "
+                                f"{self.view.levels} zoom levels. Scroll to zoom, drag to pan.")
+
+    def actual_size(self):
+        self.view.zoom(1 / self.view.scale_factor())
+
+    def stop(self):
+        # The builder removes its tile directory once it winds down
+        if self.view is not None:
+            self.view.shutdown()
+        if self.builder is not None:
+            self.builder.cancelled = True
+            if not self.builder.isRunning():
+                shutil.rmtree(self.builder.directory, ignore_errors=True)
+
+    def done(self, result):
+        self.stop()
+        super().done(result)
+
+# GOES-East (75.2W) fixed grid, from the GOES-R Product User Guide. Every
+# CDN CONUS image, whatever its pixel size, covers this scan-angle extent.
+GOES_EAST_LON = -75.2
+GOES_R_EQ = 6378137.0
+GOES_R_POL = 6356752.31414
+GOES_H = 42164160.0
+CONUS_X_EXTENT = (-0.101360, 0.038640)
+CONUS_Y_EXTENT = (0.128240, 0.044240)
+# Approximate lat/lon boxes (south, north, west, east), padded a little,
+# for Colorado and the offices whose areas cover it
+SECTOR_REGIONS = {
+    "Colorado": (36.8, 41.2, -109.3, -101.8),
+    "Boulder (BOU)": (38.5, 41.2, -107.0, -101.9),
+    "Pueblo (PUB)": (36.8, 39.7, -107.2, -101.8),
+    "Grand Junction (GJT)": (36.8, 41.2, -111.1, -105.5),
+    "Cheyenne (CYS)": (40.8, 43.7, -108.1, -101.9),
+    "Goodland (GLD)": (38.1, 40.9, -103.3, -99.4),
+}
+SECTOR_SOURCES = {
+    "GeoColor": "https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/GEOCOLOR/latest.jpg",
+    "Sandwich RGB": "https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/Sandwich/2500x1500.jpg",
+}
+SECTOR_REFRESH_MS = 5 * 60 * 1000
+
+def goes_scan_angles(lat, lon):
+    # Geodetic lat/lon to ABI (x, y) scan angles in radians
+    lat, lon = math.radians(lat), math.radians(lon - GOES_EAST_LON)
+    phi = math.atan(GOES_R_POL ** 2 / GOES_R_EQ ** 2 * math.tan(lat))
+    r = GOES_R_POL / math.sqrt(1 - (1 - GOES_R_POL ** 2 / GOES_R_EQ ** 2) * math.cos(phi) ** 2)
+    sx = GOES_H - r * math.cos(phi) * math.cos(lon)
+    sy = -r * math.cos(phi) * math.sin(lon)
+    sz = r * math.sin(phi)
+    return math.asin(-sy / math.sqrt(sx * sx + sy * sy + sz * sz)), math.atan(sz / sx)
+
+def conus_fraction_box(south, north, west, east, samples=16):
+    # Edges of a lat/lon box curve in the satellite view, so project points
+    # along all four and keep the extremes. Returns fractions of the frame.
+    points = []
+    for i in range(samples + 1):
+        lat = south + (north - south) * i / samples
+        lon = west + (east - west) * i / samples
+        points += [(lat, west), (lat, east), (south, lon), (north, lon)]
+    xs, ys = zip(*(goes_scan_angles(lat, lon) for lat, lon in points))
+    (x0, x1), (y0, y1) = CONUS_X_EXTENT, CONUS_Y_EXTENT
+    return ((min(xs) - x0) / (x1 - x0), (y0 - max(ys)) / (y0 - y1),
+            (max(xs) - x0) / (x1 - x0), (y0 - min(ys)) / (y0 - y1))
+
+SECTOR_BOXES = {name: conus_fraction_box(*bounds) for name, bounds in SECTOR_REGIONS.items()}
+
+def sector_pixel_box(region, width, height):
+    left, top, right, bottom = SECTOR_BOXES[region]
+    x0, y0 = max(0, math.floor(left * width)), max(0, math.floor(top * height))
+    x1, y1 = min(width, math.ceil(right * width)), min(height, math.ceil(bottom * height))
+    return x0, y0, x1 - x0, y1 - y0
+
+def decode_regions(content, regions):
+    # One clipped decode per region: the JPEG reader skips the rows above
+    # the box and stops after it, so only the crop is ever held decoded
+    data = QByteArray(content)
+    crops = {}
+    for region in regions:
+        buffer = QBuffer(data)
+        reader = QImageReader(buffer)
+        size = reader.size()
+        reader.setClipRect(QRect(*sector_pixel_box(region, size.width(), size.height())))
+        image = reader.read()
+        if image.isNull():
+            raise ValueError(f"{region}: {reader.errorString()}")
+        crops[region] = image
+    return crops
+
+# Crops of every region for the latest copy of each source, replaced as a
+# whole when the source changes and revalidated with its ETag otherwise
+sector_cache = {}
+sector_lock = threading.Lock()
+
+def refresh_sectors(url, span=None):
+    if offline_pack is not None:
+        crops = {region: QImage.fromData(data) for region, data in offline_pack.sectors().items()}
+        return {"etag": None, "last_modified": offline_pack.manifest["created"], "crops": crops,
+                "updated": time.time()}, False
+    fetch_url = bandwidth_variant(url)
+    with sector_lock:
+        cached = sector_cache.get(url)
+    if cached is not None and cached.get("url") != fetch_url:
+        # Cropped from the other bandwidth profile's variant; its validators do not apply
+        cached = None
+    headers = {}
+    if cached and cached["etag"]:
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached["last_modified"]:
+        headers["If-Modified-Since"] = cached["last_modified"]
+    resp = fetch(fetch_url, timeout=30, span=span, headers=headers)
+    record_cache("sector_crop", cached is not None and resp.status_code == 304)
+    if cached is not None and resp.status_code == 304:
+        return cached, False
+    entry = {"url": fetch_url, "etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+             "crops": decode_regions(resp.content, SECTOR_REGIONS), "updated": time.time()}
+    with sector_lock:
+        sector_cache[url] = entry
+    return entry, True
+
+class SectorFetcher(QThread):
+    sectors_ready = pyqtSignal(object, bool)
+    sectors_failed = pyqtSignal(str)
+
+    running = set()
+
+    def __init__(self, url, parent=None):
+        super().__init__(parent)
+        self.url = url
+        SectorFetcher.running.add(self)
+        self.finished.connect(lambda: SectorFetcher.running.discard(self))
+
+    def run(self):
+        span = FetchSpan(self.url, "GOES sector", memory=True)
+        span.lap("queue")
+        try:
+            entry, changed = refresh_sectors(self.url, span)
+        except Exception as e:
+            log_error(f"Sector crop error: {e}", url=self.url, exc=e)
+            span.finish(e)
+            self.sectors_failed.emit(str(e))
+            return
+        span.lap("parse")
+        span.finish()
+        self.sectors_ready.emit(entry, changed)
+
+class SectorPopup(QDialog):
+    def __init__(self, parent, url, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("🗺️ GOES Colorado Sectors")
+        self.setMinimumSize(1000, 750)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QComboBox {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 6px;
+                padding: 6px;
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+            }}
+        """)
+        
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        self.source_box = QComboBox()
+        for name, source_url in SECTOR_SOURCES.items():
+            self.source_box.addItem(name, source_url)
+        if self.source_box.findData(url) < 0:
+            self.source_box.addItem(url, url)
+        self.source_box.setCurrentIndex(self.source_box.findData(url))
+        self.source_box.currentIndexChanged.connect(lambda index: self.refresh())
+        self.region_box = QComboBox()
+        self.region_box.addItems(list(SECTOR_REGIONS))
+        self.region_box.currentTextChanged.connect(lambda region: self.show_region())
+        btn_refresh = QPushButton("🔄 Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        controls.addWidget(self.source_box)
+        controls.addWidget(self.region_box)
+        controls.addStretch()
+        controls.addWidget(btn_refresh)
+        layout.addLayout(controls)
+        
+        self.status = QLabel("🔄 Loading sectors...")
+        layout.addWidget(self.status)
+        self.img_label = QLabel()
+        self.img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.img_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.img_label.setStyleSheet(f"border: 2px solid {theme['group_border']}; border-radius: 8px;")
+        layout.addWidget(self.img_label, 1)
+        
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        layout.addWidget(btn_close)
+        self.setLayout(layout)
+        
+        self.entry = None
+        self.fetcher = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(poll_interval(SECTOR_REFRESH_MS))
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+        QTimer.singleShot(100, self.refresh)
+
+    def refresh(self):
+        if self.fetcher is not None and self.fetcher.isRunning():
+            return
+        url = self.source_box.currentData()
+        with sector_lock:
+            self.entry = sector_cache.get(url)
+        self.show_region()
+        self.status.setText(f"🔄 Checking {self.source_box.currentText()} for a new frame...")
+        self.fetcher = SectorFetcher(url)
+        self.fetcher.sectors_ready.connect(self.sectors_ready)
+        self.fetcher.sectors_failed.connect(lambda error: self.status.setText(f"❌ Failed to load sectors: {error}"))
+        self.fetcher.start()
+
+    def sectors_ready(self, entry, changed):
+        if self.fetcher.url != self.source_box.currentData():
+            # The source changed while this fetch ran; it is about to finish
+            self.fetcher.wait()
+            self.refresh()
+            return
+        self.entry = entry
+        self.show_region()
+        stamp = entry["last_modified"] or time.strftime("%H:%M", time.localtime(entry["updated"]))
+        self.status.setText(f"✅ {self.source_box.currentText()} {stamp}"
+                            + ("" if changed else " (unchanged)"))
+
+    def show_region(self):
+        if self.entry is None:
+            self.img_label.clear()
+            return
+        image = self.entry["crops"].get(self.region_box.currentText())
+        if image is None:
+            self.img_label.clear()
+            return
+        pix = QPixmap.fromImage(image)
+        self.img_label.setPixmap(pix.scaled(self.img_label.size(), Qt.AspectRatioMode.KeepAspectRatio,
+                                            Qt.TransformationMode.SmoothTransformation))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.show_region()
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        super().done(result)
+
+PACK_FORMAT = 1
+PACK_WORKERS = 8
+PACK_SECTOR_QUALITY = 85
+offline_pack = None
+
+def pack_urls():
+    # Both alert feeds and every HWO/AFD in the resource list
+    urls = [COLORADO_ALERTS_URL, US_ALERTS_URL]
+    for links in resources.values():
+        urls += [url for url in links.values() if re.search(r"product\.php\?.*product=(?:HWO|AFD)", url)]
+    return list(dict.fromkeys(urls))
+
+def pack_item_name(url):
+    return "items/" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+
+def read_pack_manifest(path):
+    with zipfile.ZipFile(path) as pack:
+        manifest = json.loads(pack.read("manifest.json"))
+    if manifest.get("format") != PACK_FORMAT:
+        raise ValueError(f"Unsupported snapshot pack format {manifest.get('format')!r}")
+    return manifest
+
+def pack_fetch(url, old):
+    # Conditional when the previous pack recorded validators; wire bytes are
+    # what the response actually cost, compressed or not
+    headers = {}
+    if old and old.get("etag"):
+        headers["If-None-Match"] = old["etag"]
+    if old and old.get("last_modified"):
+        headers["If-Modified-Since"] = old["last_modified"]
+    resp = fetch(url, timeout=30, headers=headers)
+    wire = resp.raw.tell() if resp.raw is not None else len(resp.content)
+    if old and (resp.status_code == 304 or hashlib.sha256(resp.content).hexdigest() == old.get("sha256")):
+        return resp, None, wire
+    return resp, resp.content, wire
+
+def prepare_pack(path, delta=False, images=True):
+    """Fetch every pack product concurrently and write a new pack to path.
+
+    With delta, products unchanged since the pack already at path are
+    revalidated rather than downloaded and copied over from it.
+    """
+    previous = read_pack_manifest(path) if delta and os.path.exists(path) else None
+    old_entries = previous["entries"] if previous else {}
+    summary = {"changed": 0, "unchanged": 0, "failed": [], "bytes": 0}
+    entries, payloads = {}, {}
+
+    def get(url):
+        try:
+            return url, pack_fetch(url, old_entries.get(url)), None
+        except Exception as e:
+            log_error(f"Snapshot pack fetch error: {e}", url=url, exc=e)
+            return url, None, e
+
+    urls = pack_urls() + ([SECTOR_SOURCES["GeoColor"]] if images else [])
+    with ThreadPoolExecutor(PACK_WORKERS) as pool:
+        results = list(pool.map(get, urls))
+    for url, result, error in results:
+        old = old_entries.get(url)
+        if error is not None:
+            # Keep the older copy rather than dropping the product
+            summary["failed"].append(url)
+            if old:
+                entries[url] = dict(old, stale=True)
+            continue
+        resp, content, wire = result
+        summary["bytes"] += wire
+        if content is None:
+            summary["unchanged"] += 1
+            entries[url] = dict(old, checked=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+            continue
+        summary["changed"] += 1
+        entry = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+                 "content_type": resp.headers.get("Content-Type", ""), "sha256": hashlib.sha256(content).hexdigest(),
+                 "size": len(content), "fetched": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        if url in SECTOR_SOURCES.values():
+            # The frame itself is not kept, only the small derived crops
+            with Image.open(BytesIO(content)) as frame:
+                frame = frame.convert("RGB")
+                entry["sectors"] = {}
+                for region in SECTOR_REGIONS:
+                    x, y, width, height = sector_pixel_box(region, *frame.size)
+                    out = BytesIO()
+                    frame.crop((x, y, x + width, y + height)).save(out, "JPEG", quality=PACK_SECTOR_QUALITY)
+                    name = f"sectors/{re.sub(r'[^A-Za-z0-9]+', '_', region).strip('_')}.jpg"
+                    entry["sectors"][region] = name
+                    payloads[name] = out.getvalue()
+        else:
+            entry["path"] = pack_item_name(url)
+            payloads[entry["path"]] = content
+        entries[url] = entry
+    if not images:
+        entries.update({url: entry for url, entry in old_entries.items() if url in SECTOR_SOURCES.values()})
+
+    manifest = {"format": PACK_FORMAT, "version": (previous["version"] + 1) if previous else 1,
+                "based_on": previous["version"] if previous else None,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "app": APP_TITLE, "app_version": APP_VERSION, "entries": entries}
+    # Written beside the target and renamed over it, so a failed refresh
+    # never leaves a half-written pack
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as pack:
+            pack.writestr("manifest.json", json.dumps(manifest, indent=2))
+            old_pack = zipfile.ZipFile(path) if previous else None
+            try:
+                for entry in entries.values():
+                    for name in [entry.get("path")] + list(entry.get("sectors", {}).values()):
+                        if not name:
+                            continue
+                        if name in payloads:
+                            # JPEG crops are already compressed
+                            compress = zipfile.ZIP_STORED if name.endswith(".jpg") else zipfile.ZIP_DEFLATED
+                            pack.writestr(name, payloads[name], compress_type=compress)
+                        elif old_pack is not None:
+                            pack.writestr(old_pack.getinfo(name), old_pack.read(name))
+            finally:
+                if old_pack is not None:
+                    old_pack.close()
+        os.replace(tmp, path)
+    except Exception:
+        os.remove(tmp)
+        raise
+    summary.update(version=manifest["version"], entries=len(entries))
+    return summary
+
+class SnapshotPack:
+    """A prepared snapshot opened read-only in place of the network."""
+    def __init__(self, path):
+        self.path = path
+        self.manifest = read_pack_manifest(path)
+        self.zip = zipfile.ZipFile(path)
+
+    def response(self, url):
+        entry = self.manifest["entries"].get(url)
+        if entry is None or "path" not in entry:
+            raise requests.ConnectionError(f"Not in the offline snapshot pack: {url}")
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp.url = url
+        resp._content = self.zip.read(entry["path"])
+        for header, key in (("Content-Type", "content_type"), ("ETag", "etag"), ("Last-Modified", "last_modified")):
+            if entry.get(key):
+                resp.headers[header] = entry[key]
+        return resp
+
+    def sectors(self):
+        for entry in self.manifest["entries"].values():
+            if "sectors" in entry:
+                return {region: self.zip.read(name) for region, name in entry["sectors"].items()}
+        return {}
+
+    def close(self):
+        self.zip.close()
+
+def open_offline_pack(path):
+    global offline_pack
+    pack = SnapshotPack(path) if path else None
+    if offline_pack is not None:
+        offline_pack.close()
+    offline_pack = pack
+    return pack
+
+def pack_summary_text(summary):
+    text = (f"Snapshot pack v{summary['version']}: {summary['entries']} products, {summary['changed']} changed, "
+            f"{summary['unchanged']} unchanged, {summary['bytes'] / 1024:.0f} KiB downloaded")
+    if summary["failed"]:
+        text += f", {len(summary['failed'])} failed"
+    return text
+
+def configure_pack(argv):
+    # --prepare-pack runs headless and exits; --open-pack (or CSWN_PACK)
+    # starts the app offline. Returns argv without these flags.
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--prepare-pack")
+    parser.add_argument("--delta", action="store_true")
+    parser.add_argument("--no-images", action="store_true")
+    parser.add_argument("--open-pack", default=os.environ.get("CSWN_PACK", ""))
+    args, rest = parser.parse_known_args(argv[1:])
+    if args.prepare_pack:
+        summary = prepare_pack(args.prepare_pack, delta=args.delta, images=not args.no_images)
+        print(pack_summary_text(summary))
+        for url in summary["failed"]:
+            print(f"  failed: {url}")
+        sys.exit(1 if summary["failed"] else 0)
+    if args.open_pack:
+        open_offline_pack(os.path.expanduser(args.open_pack))
+    return argv[:1] + rest
+
+LINK_HEALTH_FILE = os.path.expanduser("~/.weather_toolkit_links.json")
+LINK_CHECK_TTL = 6 * 3600
+LINK_CHECK_WORKERS = 8
+LINK_CHECK_TIMEOUT = 10
+LINK_SLOW_MS = 2000
+# Only statuses that mean the page is gone; 403/429/5xx may be bot
+# blocking or a bad minute, so those links stay usable
+LINK_DEAD_STATUSES = (404, 410)
+link_health = {}
+link_health_lock = threading.Lock()
+
+def resource_links():
+    # url -> name, one entry per distinct url in the catalog
+    links = {}
+    for items in resources.values():
+        for name, url in items.items():
+            links.setdefault(url, name)
+    return links
+
+def check_link(url):
+    # HEAD first; plenty of servers refuse or mishandle it, so anything but
+    # a success is retried as a GET whose body is never read. The real URL
+    # is checked even under CSWN_BASE_URL: these are the links the browser
+    # opens, and a stand-in server's answers must not reach the shared cache
+    result = {"url": url, "checked": time.time(), "method": "HEAD", "status": None,
+              "redirects": [], "final_url": url, "latency_ms": None, "error": None}
+    session = http_session()
+    try:
+        start = time.perf_counter()
+        resp = session.head(url, timeout=LINK_CHECK_TIMEOUT, allow_redirects=True,
+                            headers=request_headers())
+        if resp.status_code >= 400:
+            start = time.perf_counter()
+            resp = session.get(url, timeout=LINK_CHECK_TIMEOUT, stream=True,
+                               headers=request_headers())
+            resp.close()
+            result["method"] = "GET"
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        result["status"] = resp.status_code
+        result["redirects"] = [[r.status_code, r.headers.get("Location", "")] for r in resp.history]
+        result["final_url"] = resp.url
+    except requests.RequestException as e:
+        result["error"] = f"{e.__class__.__name__}: {e}"[:160]
+    return result
+
+def link_state(result):
+    if result is None:
+        return "unknown"
+    if result["status"] is None:
+        # Refused or unresolvable means the host is gone; a timeout may just be a bad minute
+        return "dead" if result["error"].startswith("ConnectionError") else "error"
+    if result["status"] in LINK_DEAD_STATUSES:
+        return "dead"
+    if result["status"] >= 400:
+        return "error"
+    return "slow" if result["latency_ms"] > LINK_SLOW_MS else "ok"
+
+def link_hint(result):
+    # Short text for tooltips and labels
+    state = link_state(result)
+    if state == "unknown":
+        return "not checked yet"
+    checked = datetime.fromtimestamp(result["checked"]).strftime("%b %d %H:%M")
+    if result["status"] is None:
+        return f"{state}: {result['error']} (checked {checked})"
+    hops = f", {len(result['redirects'])} redirect(s)" if result["redirects"] else ""
+    return f"{state}: HTTP {result['status']} in {result['latency_ms']:.0f} ms{hops} (checked {checked})"
+
+def load_link_health():
+    try:
+        with open(LINK_HEALTH_FILE, "r", encoding="utf-8") as f:
+            results = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        log_error(f"Error loading link health: {e}", exc=e)
+        return
+    with link_health_lock:
+        link_health.update(results)
+
+def save_link_health():
+    with link_health_lock:
+        results = dict(link_health)
+    directory = os.path.dirname(LINK_HEALTH_FILE) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".weather_toolkit_links.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp_path, LINK_HEALTH_FILE)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def stale_links(urls, ttl=LINK_CHECK_TTL):
+    now = time.time()
+    with link_health_lock:
+        return [url for url in urls if url not in link_health or now - link_health[url]["checked"] > ttl]
+
+def check_links(urls, force=False):
+    # Checks every url whose cached result is older than the TTL, in
+    # parallel; each worker thread keeps its own keep-alive session
+    if offline_pack is not None:
+        raise RuntimeError("Link checks need the network; go online first")
+    urls = list(urls) if force else stale_links(urls)
+    if urls:
+        with ThreadPoolExecutor(LINK_CHECK_WORKERS, thread_name_prefix="link-check") as pool:
+            results = list(pool.map(check_link, urls))
+        if len(results) > 1 and all(result["status"] is None for result in results):
+            # Nothing answered: our connection is down, not every site at once
+            raise requests.ConnectionError(f"None of {len(results)} links answered; is the network down?")
+        with link_health_lock:
+            for result in results:
+                link_health[result["url"]] = result
+        save_link_health()
+    with link_health_lock:
+        return dict(link_health)
+
+def configure_link_check(argv):
+    # --check-links is for cron/Task Scheduler: check everything now,
+    # refresh the shared cache, print a report and exit 1 if any are dead
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--check-links", action="store_true")
+    args, rest = parser.parse_known_args(argv[1:])
+    if args.check_links:
+        links = resource_links()
+        results = check_links(links, force=True)
+        dead = 0
+        for url, name in links.items():
+            result = results[url]
+            dead += link_state(result) == "dead"
+            print(f"{link_state(result):7s} {result['status'] or '---'!s:>4} "
+                  f"{result['latency_ms'] or 0:7.0f} ms  {name}: {url}")
+            for status, location in result["redirects"]:
+                print(f"{'':22s}{status} -> {location}")
+            if result["error"]:
+                print(f"{'':22s}{result['error']}")
+        print(f"{len(links)} links checked, {dead} dead")
+        sys.exit(1 if dead else 0)
+    load_link_health()
+    return argv[:1] + rest
+
+SPC_MD_RSS_URL = "https://www.spc.noaa.gov/products/spcmdrss.xml"
+LSR_GEOJSON_URL = "https://mesonet.agron.iastate.edu/geojson/lsr.php"
+LSR_PAGE_URL = "https://mesonet.agron.iastate.edu/lsr/#CO"
+LSR_WFOS = ("BOU", "PUB", "GJT", "GLD", "CYS")
+LSR_HOURS = 24
+EVENT_STREAM_LIMIT = 500
+EVENT_REFRESH_MS = 2 * 60 * 1000
+MD_AREAS = re.compile(r"Areas affected\.\.\.\s*(.+?)\s*(?:Concerning\.\.\.\s*(.+?)\s*)?(?:Valid|\n\s*\n)",
+                      re.IGNORECASE | re.DOTALL)
+
+def utc_epoch(value):
+    # Like iso_epoch, but a timestamp without an offset is UTC, not local
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def event_key(event):
+    # Sort key for the merged stream: time first, then a stable tie-break
+    return (event["time"], event["source"], event["id"])
+
+def alert_events(content):
+    events = []
+    for alert in parse_alert_feed(content):
+        stamp = iso_epoch(alert["updated"]) or alert["onset"]
+        if stamp is None:
+            continue
+        events.append({"time": stamp, "source": "Alert", "id": alert["id"],
+                       "title": alert["event"] or alert["title"], "detail": alert["area"],
+                       "link": alert["link"]})
+    return events
+
+def md_events(content):
+    # The RSS feed is national; keep the discussions whose polygon reaches Colorado
+    events = []
+    for item in ET.fromstring(content).iter("item"):
+        text = html.unescape(re.sub(r"<[^>]+>", " ", item.findtext("description") or ""))
+        match = MD_AREAS.search(text)
+        areas = " ".join(match.group(1).split()) if match else ""
+        polygon = md_polygon(text)
+        if polygon:
+            if "Colorado" not in region_index.hits(polygon):
+                continue
+        elif "colorado" not in (areas or text).lower():
+            continue
+        try:
+            stamp = parsedate_to_datetime(item.findtext("pubDate") or "").timestamp()
+        except (TypeError, ValueError):
+            continue
+        concerning = " ".join(match.group(2).split()) if match and match.group(2) else ""
+        link = (item.findtext("link") or "").strip()
+        events.append({"time": stamp, "source": "SPC MD", "id": (item.findtext("guid") or link).strip(),
+                       "title": (item.findtext("title") or "").strip(),
+                       "detail": f"{areas} - {concerning}" if concerning else areas, "link": link})
+    return events
+
+def lsr_url(hours=LSR_HOURS):
+    # The window ends on the next hour, so polls within an hour repeat the
+    # same URL and can be answered conditionally
+    end = (int(time.time()) // 3600 + 1) * 3600
+    fmt = "%Y%m%d%H%M"
+    return (f"{LSR_GEOJSON_URL}?wfos={','.join(LSR_WFOS)}"
+            f"&sts={time.strftime(fmt, time.gmtime(end - hours * 3600))}&ets={time.strftime(fmt, time.gmtime(end))}")
+
+def lsr_events(content):
+    events = []
+    for feature in json.loads(content).get("features", []):
+        props = feature.get("properties") or {}
+        if props.get("state", "CO") != "CO":
+            continue
+        stamp = utc_epoch(str(props.get("valid", "")))
+        if stamp is None:
+            continue
+        lon, lat = (feature.get("geometry") or {}).get("coordinates", (None, None))[:2]
+        magnitude = f" {props['magnitude']} {props.get('unit') or ''}".rstrip() if props.get("magnitude") else ""
+        where = ", ".join(part for part in (props.get("city"), props.get("county") and f"{props['county']} Co.") if part)
+        remark = f" {props['remark']}" if props.get("remark") else ""
+        events.append({"time": stamp, "source": "Report",
+                       "id": f"{props.get('valid')}|{props.get('typetext')}|{lat}|{lon}",
+                       "title": f"{props.get('typetext', 'Report')}{magnitude}",
+                       "detail": f"{where} ({props.get('source', '')}){remark}", "link": LSR_PAGE_URL})
+    return events
+
+EVENT_SOURCES = {
+    "Alert": (lambda: COLORADO_ALERTS_URL, alert_events),
+    "SPC MD": (lambda: SPC_MD_RSS_URL, md_events),
+    "Report": (lsr_url, lsr_events),
+}
+
+class EventStream:
+    """Alerts, SPC MDs and storm reports merged into one time-ordered stream.
+
+    Each refresh fetches the sources conditionally and in parallel, keeps
+    only items that are new or changed (by source and id), sorts those per
+    source and k-way merges them into the existing order. At most capacity
+    events are kept; the oldest go first."""
+    def __init__(self, capacity=EVENT_STREAM_LIMIT):
+        self.capacity = capacity
+        self.keys = []
+        self.events = {}
+        self.validators = {}
+        self.lock = threading.Lock()
+
+    def fetch_source(self, name):
+        # Returns the source's events, or [] when it has not changed
+        make_url, parse = EVENT_SOURCES[name]
+        url = make_url()
+        headers = {}
+        url_seen, etag, last_modified = self.validators.get(name, (None, None, None))
+        if url_seen == url:
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        span = FetchSpan(url, "Event stream")
+        span.lap("queue")
+        try:
+            resp = fetch(url, timeout=15, span=span, headers=headers)
+            record_cache("event_stream", resp.status_code == 304)
+            events = [] if resp.status_code == 304 else parse(resp.content)
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        # Validators only once the body parsed, so a bad response is retried in full
+        self.validators[name] = (url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return events
+
+    def merge(self, batches):
+        # Returns the keys added and dropped so a view can patch itself
+        # rather than redraw; a key can be in both when an item changed
+        incoming = {}
+        for batch in batches:
+            for event in batch:
+                incoming[(event["source"], event["id"])] = event
+        added, dropped = [], []
+        with self.lock:
+            fresh = {}
+            for ident, event in incoming.items():
+                old = self.events.get(ident)
+                if old == event:
+                    continue
+                if old is not None:
+                    del self.keys[bisect.bisect_left(self.keys, event_key(old))]
+                    dropped.append(event_key(old))
+                self.events[ident] = event
+                fresh.setdefault(event["source"], []).append(event_key(event))
+            runs = [sorted(keys) for keys in fresh.values()]
+            self.keys = list(heapq.merge(self.keys, *runs))
+            excess = len(self.keys) - self.capacity
+            if excess > 0:
+                for key in self.keys[:excess]:
+                    del self.events[(key[1], key[2])]
+                    dropped.append(key)
+                del self.keys[:excess]
+            for run in runs:
+                added.extend(key for key in run if (key[1], key[2]) in self.events)
+        return added, dropped
+
+    def refresh(self):
+        # One failing source does not hold up the others; returns
+        # (added, dropped, {source: error})
+        batches, errors = [], {}
+        with ThreadPoolExecutor(len(EVENT_SOURCES), thread_name_prefix="event-stream") as pool:
+            futures = {pool.submit(self.fetch_source, name): name for name in EVENT_SOURCES}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    batches.append(future.result())
+                except Exception as e:
+                    log_error(f"Event stream error ({name}): {e}", exc=e)
+                    errors[name] = str(e)
+        added, dropped = self.merge(batches)
+        return added, dropped, errors
+
+    def get(self, key):
+        with self.lock:
+            return self.events.get((key[1], key[2]))
+
+    def snapshot(self):
+        with self.lock:
+            return [self.events[(key[1], key[2])] for key in self.keys]
+
+event_stream = EventStream()
+
+def event_line(event):
+    stamp = datetime.fromtimestamp(event["time"]).strftime("%b %d %H:%M")
+    return f"{stamp}  {event['source']:7}  {event['title']}: {event['detail']}"
+
+SPC_MD_INDEX_URL = "https://www.spc.noaa.gov/products/md/"
+MD_CACHE_FILE = os.path.expanduser("~/.weather_toolkit_mds.json")
+MD_FETCH_WORKERS = 4
+MD_REFRESH_MS = 5 * 60 * 1000
+MD_LINK = re.compile(r"""href=["']?([^"'>]*?\bmd(\d{4})\.html)""", re.IGNORECASE)
+MD_LATLON = re.compile(r"LAT\.\.\.LON\s+((?:\d{8}\s+)*\d{8})")
+MD_ISSUED = re.compile(r"^\s*(\d{3,4}) ([AP]M) ([A-Z]{3}) [A-Z]{3} ([A-Z]{3}) +(\d{1,2}) (\d{4})\s*$",
+                       re.MULTILINE | re.IGNORECASE)
+MD_VALID = re.compile(r"Valid\s+(\d{6}Z\s*-\s*\d{6}Z)", re.IGNORECASE)
+MD_ATTN = re.compile(r"ATTN\.\.\.WFO\.\.\.([A-Z.]+)")
+US_ZONE_OFFSETS = {"EST": -5, "EDT": -4, "CST": -6, "CDT": -5, "MST": -7, "MDT": -6, "PST": -8, "PDT": -7}
+
+# Colorado's border is four survey lines, so its corners are the whole polygon
+COLORADO_BOUNDARY = [(41.0, -109.05), (41.0, -102.05), (37.0, -102.04), (37.0, -109.05)]
+
+def polygon_bbox(polygon):
+    lats = [lat for lat, _ in polygon]
+    lons = [lon for _, lon in polygon]
+    return (min(lats), min(lons), max(lats), max(lons))
+
+def point_in_polygon(lat, lon, polygon):
+    # Even-odd ray cast along the latitude line
+    inside = False
+    j = len(polygon) - 1
+    for i, (lat_i, lon_i) in enumerate(polygon):
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat) and lon < lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i):
+            inside = not inside
+        j = i
+    return inside
+
+def segments_cross(a, b, c, d):
+    def turn(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    return (turn(a, b, c) > 0) != (turn(a, b, d) > 0) and (turn(c, d, a) > 0) != (turn(c, d, b) > 0)
+
+def polygons_intersect(first, second):
+    # Overlap means a corner of one inside the other or two crossing edges
+    if any(point_in_polygon(lat, lon, second) for lat, lon in first):
+        return True
+    if any(point_in_polygon(lat, lon, first) for lat, lon in second):
+        return True
+    edges = list(zip(second, second[1:] + second[:1]))
+    return any(segments_cross(a, b, c, d) for a, b in zip(first, first[1:] + first[:1]) for c, d in edges)
+
+class RegionIndex:
+    """Named polygons with their bounding boxes computed up front, so most
+    queries are settled by a box comparison and never reach the edge tests."""
+    def __init__(self, regions):
+        self.regions = [(name, polygon, polygon_bbox(polygon)) for name, polygon in regions.items()]
+
+    def hits(self, polygon):
+        if len(polygon) < 3:
+            return []
+        south, west, north, east = polygon_bbox(polygon)
+        names = []
+        for name, region, (r_south, r_west, r_north, r_east) in self.regions:
+            if south > r_north or north < r_south or west > r_east or east < r_west:
+                continue
+            if polygons_intersect(polygon, region):
+                names.append(name)
+        return names
+
+region_index = RegionIndex({"Colorado": COLORADO_BOUNDARY})
+
+def md_polygon(text):
+    # LAT...LON pairs are 8 digits, LLLLOOOO in hundredths of a degree west;
+    # longitudes of 100 and more drop their leading 1
+    match = MD_LATLON.search(text)
+    if not match:
+        return []
+    points = []
+    for group in match.group(1).split():
+        lat, lon = int(group[:4]) / 100, int(group[4:]) / 100
+        if lon < 50:
+            lon += 100
+        points.append((lat, -lon))
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+def md_issued(text):
+    match = MD_ISSUED.search(text)
+    if not match:
+        return None
+    clock, meridiem, zone, month, day, year = match.groups()
+    try:
+        local = datetime.strptime(f"{clock.zfill(4)} {meridiem} {month} {day} {year}", "%I%M %p %b %d %Y")
+    except ValueError:
+        return None
+    offset = US_ZONE_OFFSETS.get(zone.upper(), 0)
+    return local.replace(tzinfo=timezone.utc).timestamp() - offset * 3600
+
+def parse_md(url, number, text):
+    areas = MD_AREAS.search(text)
+    valid = MD_VALID.search(text)
+    attn = MD_ATTN.search(text)
+    polygon = md_polygon(text)
+    return {
+        "url": url,
+        "number": number,
+        "issued": md_issued(text) or time.time(),
+        "areas": " ".join(areas.group(1).split()) if areas else "",
+        "concerning": " ".join(areas.group(2).split()) if areas and areas.group(2) else "",
+        "valid": valid.group(1) if valid else "",
+        "offices": [office for office in attn.group(1).split("...") if office] if attn else [],
+        "polygon": polygon,
+        "regions": region_index.hits(polygon),
+        "text": text,
+    }
+
+def md_in_colorado(md):
+    # An MD without a polygon falls back to what its area line says
+    if md["polygon"]:
+        return "Colorado" in md["regions"]
+    return "colorado" in md["areas"].lower()
+
+def md_summary(md):
+    stamp = datetime.fromtimestamp(md["issued"]).strftime("%b %d %H:%M")
+    return f"MD {md['number']}  {stamp}  {md['areas'] or md['concerning']}"
+
+class MdCache:
+    """SPC mesoscale discussions, parsed once and kept on disk.
+
+    A refresh re-reads the index (conditionally) and fetches only the
+    discussions it has not seen, in parallel. Discussions outside Colorado
+    are remembered without their text so they are not fetched again;
+    anything that has left the index is dropped."""
+    def __init__(self, path=MD_CACHE_FILE):
+        self.path = path
+        self.mds = {}
+        self.validators = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log_error(f"Error loading MD cache: {e}", exc=e)
+            return
+        with self.lock:
+            self.mds = {md["url"]: md for md in data.get("mds", [])}
+            self.validators = data.get("validators", {})
+
+    def save(self):
+        with self.lock:
+            data = {"validators": self.validators, "mds": list(self.mds.values())}
+        directory = os.path.dirname(self.path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".weather_toolkit_mds.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            log_error(f"Error saving MD cache: {e}", exc=e)
+
+    def fetch_index(self):
+        # Returns the index's MD links in page order, or None when it has not changed
+        headers = {}
+        if self.validators.get("etag"):
+            headers["If-None-Match"] = self.validators["etag"]
+        if self.validators.get("last_modified"):
+            headers["If-Modified-Since"] = self.validators["last_modified"]
+        span = FetchSpan(SPC_MD_INDEX_URL, "SPC MD index")
+        span.lap("queue")
+        try:
+            resp = fetch(SPC_MD_INDEX_URL, timeout=15, span=span, headers=headers)
+            record_cache("spc_md_index", resp.status_code == 304)
+            links = None
+            if resp.status_code != 304:
+                links = {}
+                for href, number in MD_LINK.findall(resp.text):
+                    links.setdefault(urljoin(SPC_MD_INDEX_URL, href), number)
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        self.validators = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+        return links
+
+    def fetch_md(self, url, number):
+        span = FetchSpan(url, "SPC MD")
+        span.lap("queue")
+        try:
+            resp = fetch(url, timeout=15, span=span)
+            text = extract_pre_text(resp.content)
+            if text is None:
+                raise ValueError(f"MD {number} has no product text")
+            md = parse_md(url, number, text)
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        if not md_in_colorado(md):
+            md["text"] = ""
+        return md
+
+    def refresh(self):
+        # Returns (new Colorado MDs, {url: error}); raises if the index fails
+        self.load()
+        links = self.fetch_index()
+        if links is None:
+            return [], {}
+        with self.lock:
+            wanted = [(url, number) for url, number in links.items() if url not in self.mds]
+        fetched, errors = [], {}
+        if wanted:
+            with ThreadPoolExecutor(min(MD_FETCH_WORKERS, len(wanted)), thread_name_prefix="spc-md") as pool:
+                futures = {pool.submit(self.fetch_md, url, number): url for url, number in wanted}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        fetched.append(future.result())
+                    except Exception as e:
+                        log_error(f"SPC MD fetch error: {e}", url=url, exc=e)
+                        errors[url] = str(e)
+        with self.lock:
+            for md in fetched:
+                self.mds[md["url"]] = md
+            for url in [url for url in self.mds if url not in links]:
+                del self.mds[url]
+        if errors:
+            # A failed MD is retried in full next time
+            self.validators = {}
+        self.save()
+        return [md for md in fetched if md_in_colorado(md)], errors
+
+    def colorado(self):
+        # Newest first
+        self.load()
+        with self.lock:
+            mds = [md for md in self.mds.values() if md_in_colorado(md)]
+        return sorted(mds, key=lambda md: md["issued"], reverse=True)
+
+md_cache = MdCache()
+
+SPC_OUTLOOK_URL = "https://www.spc.noaa.gov/products/outlook/"
+OUTLOOK_GEOJSON_URL = "https://www.spc.noaa.gov/products/outlook/day{day}otlk_{kind}.lyr.geojson"
+# (day, layer, column); Days 2 and 3 carry one combined severe probability
+OUTLOOK_LAYERS = (
+    (1, "cat", "Day 1"), (1, "torn", "D1 Tornado"), (1, "wind", "D1 Wind"), (1, "hail", "D1 Hail"),
+    (2, "cat", "Day 2"), (2, "prob", "D2 Severe"),
+    (3, "cat", "Day 3"), (3, "prob", "D3 Severe"),
+)
+# Hatched significant-severe areas come as separate layers; each is shown
+# as a SIG flag on the probability layer it qualifies
+OUTLOOK_SIG_LAYERS = {(1, "torn"): "sigtorn", (1, "wind"): "sigwind", (1, "hail"): "sighail",
+                      (2, "prob"): "sigprob", (3, "prob"): "sigprob"}
+OUTLOOK_REFRESH_MS = 10 * 60 * 1000
+OUTLOOK_ISSUE = re.compile(rb'"ISSUE"\s*:\s*"?(\d{12})')
+CATEGORICAL_RANKS = {"TSTM": 1, "MRGL": 2, "SLGT": 3, "ENH": 4, "MDT": 5, "HIGH": 6}
+
+# Approximate centroids of Colorado's 64 counties, (lat, lon)
+COLORADO_COUNTIES = {
+    "Adams": (39.87, -104.33), "Alamosa": (37.57, -105.79), "Arapahoe": (39.65, -104.33),
+    "Archuleta": (37.20, -107.05), "Baca": (37.32, -102.56), "Bent": (37.96, -103.07),
+    "Boulder": (40.09, -105.36), "Broomfield": (39.95, -105.05), "Chaffee": (38.75, -106.19),
+    "Cheyenne": (38.83, -102.60), "Clear Creek": (39.69, -105.64), "Conejos": (37.21, -106.19),
+    "Costilla": (37.28, -105.43), "Crowley": (38.32, -103.78), "Custer": (38.10, -105.37),
+    "Delta": (38.86, -107.86), "Denver": (39.76, -104.88), "Dolores": (37.75, -108.52),
+    "Douglas": (39.33, -104.93), "Eagle": (39.63, -106.69), "El Paso": (38.83, -104.53),
+    "Elbert": (39.29, -104.14), "Fremont": (38.47, -105.44), "Garfield": (39.60, -107.90),
+    "Gilpin": (39.86, -105.53), "Grand": (40.10, -106.12), "Gunnison": (38.67, -107.03),
+    "Hinsdale": (37.81, -107.38), "Huerfano": (37.69, -104.96), "Jackson": (40.66, -106.34),
+    "Jefferson": (39.59, -105.25), "Kiowa": (38.43, -102.76), "Kit Carson": (39.31, -102.60),
+    "La Plata": (37.29, -107.84), "Lake": (39.20, -106.35), "Larimer": (40.66, -105.46),
+    "Las Animas": (37.32, -104.04), "Lincoln": (38.99, -103.51), "Logan": (40.73, -103.11),
+    "Mesa": (39.02, -108.46), "Mineral": (37.67, -106.92), "Moffat": (40.62, -108.21),
+    "Montezuma": (37.34, -108.60), "Montrose": (38.40, -108.26), "Morgan": (40.26, -103.81),
+    "Otero": (37.90, -103.72), "Ouray": (38.16, -107.77), "Park": (39.12, -105.72),
+    "Phillips": (40.59, -102.35), "Pitkin": (39.22, -106.92), "Prowers": (37.96, -102.39),
+    "Pueblo": (38.17, -104.51), "Rio Blanco": (39.97, -108.20), "Rio Grande": (37.58, -106.38),
+    "Routt": (40.48, -106.99), "Saguache": (38.08, -106.28), "San Juan": (37.78, -107.67),
+    "San Miguel": (38.00, -108.40), "Sedgwick": (40.88, -102.35), "Summit": (39.62, -106.12),
+    "Teller": (38.87, -105.18), "Washington": (39.97, -103.21), "Weld": (40.55, -104.39),
+    "Yuma": (40.00, -102.42),
+}
+# Centroids sorted by latitude, so a polygon only tests the counties in its band
+COUNTY_POINTS = sorted((lat, lon, name) for name, (lat, lon) in COLORADO_COUNTIES.items())
+COUNTY_LATS = [lat for lat, _, _ in COUNTY_POINTS]
+
+def outlook_rank(label):
+    # Categorical labels rank by severity, probabilities by their percent
+    if label in CATEGORICAL_RANKS:
+        return CATEGORICAL_RANKS[label]
+    try:
+        return float(label) * 100
+    except ValueError:
+        return None
+
+def outlook_label(label):
+    return label if label in CATEGORICAL_RANKS else f"{outlook_rank(label):.0f}%"
+
+def geojson_polygons(geometry):
+    # Rings as (lat, lon) lists: [(outer, [holes...]), ...]
+    if not geometry:
+        return []
+    coords = geometry.get("coordinates") or []
+    if geometry.get("type") == "Polygon":
+        coords = [coords]
+    elif geometry.get("type") != "MultiPolygon":
+        return []
+    polygons = []
+    for rings in coords:
+        rings = [[(lat, lon) for lon, lat in ring[:-1]] for ring in rings if len(ring) > 3]
+        if rings:
+            polygons.append((rings[0], rings[1:]))
+    return polygons
+
+def counties_in(outer, holes):
+    south, west, north, east = polygon_bbox(outer)
+    hits = []
+    for lat, lon, name in COUNTY_POINTS[bisect.bisect_left(COUNTY_LATS, south):bisect.bisect_right(COUNTY_LATS, north)]:
+        if west <= lon <= east and point_in_polygon(lat, lon, outer) \
+                and not any(point_in_polygon(lat, lon, hole) for hole in holes):
+            hits.append(name)
+    return hits
+
+def index_outlook(data):
+    # {county: (rank, label, fill)} for the highest risk over each centroid,
+    # plus the counties inside a significant-severe (hatched) area
+    risks, significant = {}, set()
+    for feature in data.get("features", []):
+        props = feature.get("properties") or {}
+        label = str(props.get("LABEL", ""))
+        rank = None if label == "SIGN" else outlook_rank(label)
+        if label != "SIGN" and rank is None:
+            continue
+        for outer, holes in geojson_polygons(feature.get("geometry")):
+            for name in counties_in(outer, holes):
+                if label == "SIGN":
+                    significant.add(name)
+                elif name not in risks or rank > risks[name][0]:
+                    risks[name] = (rank, outlook_label(label), props.get("fill") or "")
+    return risks, significant
+
+def outlook_issue(data):
+    for feature in data.get("features", []):
+        props = feature.get("properties") or {}
+        if props.get("ISSUE"):
+            return str(props["ISSUE"]), str(props.get("VALID", "")), str(props.get("EXPIRE", ""))
+    return None
+
+def outlook_time(stamp):
+    # SPC stamps are UTC YYYYmmddHHMM
+    try:
+        parsed = datetime.strptime(stamp, "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return stamp
+    return parsed.astimezone().strftime("%b %d %H:%M")
+
+class CountyOutlooks:
+    """SPC Day 1-3 outlook layers resolved to Colorado counties.
+
+    Every layer is fetched conditionally on refresh, but the point-in-
+    polygon pass over the county centroids only runs when a layer's
+    issuance time changes; otherwise the previous index is kept."""
+    def __init__(self):
+        self.layers = {}
+        self.validators = {}
+        self.lock = threading.Lock()
+
+    def fetch_layer(self, day, kind):
+        # Returns True when the layer was re-indexed
+        url = OUTLOOK_GEOJSON_URL.format(day=day, kind=kind)
+        headers = {}
+        etag, last_modified = self.validators.get(url, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        span = FetchSpan(url, "SPC outlook")
+        span.lap("queue")
+        try:
+            resp = fetch(url, timeout=15, span=span, headers=headers)
+            changed = False
+            if resp.status_code != 304:
+                # The issuance is read off the raw bytes first, so a re-sent
+                # but unchanged layer is neither parsed nor re-indexed
+                peek = OUTLOOK_ISSUE.search(resp.content)
+                with self.lock:
+                    current = self.layers.get((day, kind))
+                unchanged = current is not None and peek is not None and current["issue"] == peek.group(1).decode()
+                record_cache("outlook_index", unchanged)
+                if not unchanged:
+                    data = json.loads(resp.content)
+                    issue, valid, expire = outlook_issue(data) or ("", "", "")
+                    risks, significant = index_outlook(data)
+                    with self.lock:
+                        self.layers[(day, kind)] = {"issue": issue, "valid": valid, "expire": expire,
+                                                    "risks": risks, "significant": significant}
+                    changed = True
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        self.validators[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return changed
+
+    def refresh(self):
+        # Returns (layers re-indexed, {column: error}); a changed hatched
+        # layer is reported as the probability layer it belongs to
+        jobs = [(day, kind, column, (day, kind)) for day, kind, column in OUTLOOK_LAYERS]
+        jobs += [(day, OUTLOOK_SIG_LAYERS[(day, kind)], f"{column} hatched", (day, kind))
+                 for day, kind, column in OUTLOOK_LAYERS if (day, kind) in OUTLOOK_SIG_LAYERS]
+        changed, errors = [], {}
+        with ThreadPoolExecutor(len(jobs), thread_name_prefix="spc-outlook") as pool:
+            futures = {pool.submit(self.fetch_layer, day, kind): (column, target)
+                       for day, kind, column, target in jobs}
+            for future in as_completed(futures):
+                column, target = futures[future]
+                try:
+                    if future.result() and target not in changed:
+                        changed.append(target)
+                except Exception as e:
+                    log_error(f"SPC outlook error ({column}): {e}", exc=e)
+                    errors[column] = str(e)
+        return changed, errors
+
+    def cell(self, day, kind, county):
+        # (text, fill) for one county in one layer; text is "" when unindexed
+        with self.lock:
+            layer = self.layers.get((day, kind))
+            hatched = self.layers.get((day, OUTLOOK_SIG_LAYERS.get((day, kind))))
+        if layer is None:
+            return "", ""
+        rank, label, fill = layer["risks"].get(county, (0, "-", ""))
+        if county in layer["significant"] or (hatched is not None and county in hatched["significant"]):
+            label += " SIG"
+        return label, fill
+
+    def issued(self, day, kind):
+        with self.lock:
+            layer = self.layers.get((day, kind))
+        return outlook_time(layer["issue"]) if layer and layer["issue"] else ""
+
+county_outlooks = CountyOutlooks()
+
+class PackPreparer(QThread):
+    pack_ready = pyqtSignal(object)
+    pack_failed = pyqtSignal(str)
+
+    def __init__(self, path, delta, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.delta = delta
+
+    def run(self):
+        try:
+            self.pack_ready.emit(prepare_pack(self.path, delta=self.delta))
+        except Exception as e:
+            log_error(f"Snapshot pack error: {e}", exc=e)
+            self.pack_failed.emit(str(e))
+
+LINK_STATE_ICONS = {"ok": "🟢", "slow": "🟡", "error": "🟠", "dead": "⚫", "unknown": "🔗"}
+
+class LinkChecker(QThread):
+    links_checked = pyqtSignal(int)
+    check_failed = pyqtSignal(str)
+
+    def __init__(self, force=False, parent=None):
+        super().__init__(parent)
+        self.force = force
+
+    def run(self):
+        links = resource_links()
+        try:
+            count = len(links) if self.force else len(stale_links(links))
+            check_links(links, self.force)
+        except Exception as e:
+            log_error(f"Link check error: {e}", exc=e)
+            self.check_failed.emit(str(e))
+            return
+        self.links_checked.emit(count)
+
+class EventFetcher(QThread):
+    events_merged = pyqtSignal(object, object, object)
+
+    # A timeline closed mid-refresh must not destroy the running thread
+    running = set()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        EventFetcher.running.add(self)
+        self.finished.connect(lambda: EventFetcher.running.discard(self))
+
+    def run(self):
+        self.events_merged.emit(*event_stream.refresh())
+
+class EventTimelinePopup(QDialog):
+    SOURCE_ICONS = {"Alert": "🚨", "SPC MD": "📝", "Report": "🌩️"}
+
+    def __init__(self, parent, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("🕒 Event Timeline")
+        self.setMinimumSize(1100, 700)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QTableWidget {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 8px;
+                font-size: {font_size}px;
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+            }}
+        """)
+        layout = QVBoxLayout()
+        self.status = QLabel("🔄 Loading alerts, SPC discussions and storm reports...")
+        layout.addWidget(self.status)
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Time", "Source", "Event", "Details"])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        for column in range(3):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        header.setStretchLastSection(True)
+        self.table.cellDoubleClicked.connect(self.open_row)
+        layout.addWidget(self.table, 1)
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        layout.addWidget(btn_close)
+        self.setLayout(layout)
+
+        # Ascending mirror of the table's keys; the table shows them newest first
+        self.keys = []
+        for event in event_stream.snapshot():
+            self.insert_event(event, highlight=False)
+        self.fetcher = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(poll_interval(EVENT_REFRESH_MS))
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+        QTimer.singleShot(100, self.refresh)
+
+    def insert_event(self, event, highlight=True):
+        key = event_key(event)
+        i = bisect.bisect(self.keys, key)
+        self.keys.insert(i, key)
+        row = len(self.keys) - 1 - i
+        self.table.insertRow(row)
+        stamp = datetime.fromtimestamp(event["time"]).strftime("%b %d %H:%M")
+        icon = self.SOURCE_ICONS.get(event["source"], "")
+        for column, text in enumerate((stamp, f"{icon} {event['source']}", event["title"], event["detail"])):
+            item = QTableWidgetItem(text)
+            item.setToolTip(event["detail"] if column == 3 else event["link"])
+            if highlight:
+                font = item.font()
+                font.setBold(True)
+                item.setFont(font)
+            self.table.setItem(row, column, item)
+        self.table.item(row, 0).setData(Qt.ItemDataRole.UserRole, event["link"])
+
+    def remove_key(self, key):
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+            self.table.removeRow(len(self.keys) - i)
+
+    def refresh(self):
+        if self.fetcher is not None and self.fetcher.isRunning():
+            return
+        self.fetcher = EventFetcher()
+        self.fetcher.events_merged.connect(self.events_merged)
+        self.fetcher.start()
+
+    def events_merged(self, added, dropped, errors):
+        # Only the rows that changed are touched
+        for key in dropped:
+            self.remove_key(key)
+        for key in added:
+            event = event_stream.get(key)
+            if event is not None and event_key(event) == key:
+                self.insert_event(event)
+        text = f"✅ {len(self.keys)} events, {len(added)} new at {time.strftime('%H:%M')}"
+        if errors:
+            text += "  ❌ " + "; ".join(f"{name}: {error}" for name, error in errors.items())
+        self.status.setText(text)
+
+    def open_row(self, row, column):
+        link = self.table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+        if link:
+            webbrowser.open(link)
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        super().done(result)
+
+class MdFetcher(QThread):
+    mds_loaded = pyqtSignal(object, object)
+    fetch_failed = pyqtSignal(str)
+
+    running = set()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        MdFetcher.running.add(self)
+        self.finished.connect(lambda: MdFetcher.running.discard(self))
+
+    def run(self):
+        try:
+            new, errors = md_cache.refresh()
+        except Exception as e:
+            log_error(f"SPC MD index error: {e}", url=SPC_MD_INDEX_URL, exc=e)
+            self.fetch_failed.emit(str(e))
+            return
+        self.mds_loaded.emit(new, errors)
+
+class MdViewerPopup(QDialog):
+    def __init__(self, parent, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("📝 SPC Mesoscale Discussions - Colorado")
+        self.setMinimumSize(1100, 700)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QTextEdit, QListWidget {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 8px;
+                padding: 6px;
+            }}
+            QListWidget::item:selected {{
+                background: {theme['accent']};
+                color: {theme['bg']};
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+            }}
+        """)
+        layout = QVBoxLayout()
+        self.status = QLabel("🔄 Checking the SPC index for new discussions...")
+        layout.addWidget(self.status)
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        self.list = QListWidget()
+        self.list.setMaximumWidth(380)
+        self.list.currentRowChanged.connect(self.show_md)
+        splitter.addWidget(self.list)
+        self.text = QTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFont("Consolas", font_size))
+        splitter.addWidget(self.text)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter, 1)
+
+        ctrl = QHBoxLayout()
+        btn_refresh = QPushButton("🔄 Refresh")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_open = QPushButton("🌐 Open on SPC")
+        btn_open.clicked.connect(self.open_current)
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        ctrl.addWidget(btn_refresh)
+        ctrl.addWidget(btn_open)
+        ctrl.addStretch()
+        ctrl.addWidget(btn_close)
+        layout.addLayout(ctrl)
+        self.setLayout(layout)
+
+        # The cached discussions show at once; the refresh only adds new ones
+        self.mds = []
+        self.show_mds(md_cache.colorado(), set())
+        self.fetcher = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(poll_interval(MD_REFRESH_MS))
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+        QTimer.singleShot(100, self.refresh)
+
+    def show_mds(self, mds, new_urls):
+        current = self.mds[self.list.currentRow()]["url"] if self.list.currentRow() >= 0 else None
+        self.mds = mds
+        self.list.blockSignals(True)
+        self.list.clear()
+        for md in mds:
+            item = QListWidgetItem(md_summary(md))
+            item.setToolTip(f"{md['concerning']}\nValid {md['valid']}")
+            if md["url"] in new_urls:
+                font = item.font()
+                font.setBold(True)
+                item.setFont(font)
+            self.list.addItem(item)
+        self.list.blockSignals(False)
+        urls = [md["url"] for md in mds]
+        if mds:
+            self.list.setCurrentRow(urls.index(current) if current in urls else 0)
+        else:
+            self.text.setPlainText("No mesoscale discussions for Colorado right now.")
+
+    def show_md(self, row):
+        if 0 <= row < len(self.mds):
+            self.text.setPlainText(self.mds[row]["text"])
+            self.text.moveCursor(self.text.textCursor().MoveOperation.Start)
+
+    def refresh(self):
+        if self.fetcher is not None and self.fetcher.isRunning():
+            return
+        self.fetcher = MdFetcher()
+        self.fetcher.mds_loaded.connect(self.mds_loaded)
+        self.fetcher.fetch_failed.connect(self.index_failed)
+        self.fetcher.start()
+
+    def index_failed(self, error):
+        self.status.setText(f"❌ SPC index failed: {error}")
+
+    def mds_loaded(self, new, errors):
+        # The list is only rebuilt when discussions came or went
+        mds = md_cache.colorado()
+        if [md["url"] for md in mds] != [md["url"] for md in self.mds]:
+            self.show_mds(mds, {md["url"] for md in new})
+        text = f"✅ {len(self.mds)} for Colorado, {len(new)} new at {time.strftime('%H:%M')}"
+        if errors:
+            text += f"  ❌ {len(errors)} discussion(s) failed to load"
+        self.status.setText(text)
+
+    def open_current(self):
+        row = self.list.currentRow()
+        webbrowser.open(self.mds[row]["url"] if 0 <= row < len(self.mds) else SPC_MD_INDEX_URL)
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        super().done(result)
+
+class OutlookFetcher(QThread):
+    outlooks_indexed = pyqtSignal(object, object)
+
+    running = set()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        OutlookFetcher.running.add(self)
+        self.finished.connect(lambda: OutlookFetcher.running.discard(self))
+
+    def run(self):
+        self.outlooks_indexed.emit(*county_outlooks.refresh())
+
+class CountyOutlookPopup(QDialog):
+    def __init__(self, parent, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("📊 SPC Outlook Risk by County - Colorado")
+        self.setMinimumSize(1100, 750)
+        self.setStyleSheet(parent.get_dialog_style() + f"""
+            QTableWidget {{
+                background: {theme['entry_bg']};
+                color: {theme['entry_fg']};
+                border: 2px solid {theme['entry_border']};
+                border-radius: 8px;
+                font-size: {font_size}px;
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+            }}
+        """)
+        layout = QVBoxLayout()
+        self.status = QLabel("🔄 Loading SPC Day 1-3 outlooks...")
+        layout.addWidget(self.status)
+        self.table = QTableWidget(len(COLORADO_COUNTIES), len(OUTLOOK_LAYERS) + 1)
+        self.table.setHorizontalHeaderLabels(["County"] + [column for _, _, column in OUTLOOK_LAYERS])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.counties = sorted(COLORADO_COUNTIES)
+        for row, county in enumerate(self.counties):
+            self.table.setItem(row, 0, QTableWidgetItem(county))
+        layout.addWidget(self.table, 1)
+        ctrl = QHBoxLayout()
+        btn_open = QPushButton("🌐 Open SPC Outlooks")
+        btn_open.clicked.connect(lambda: webbrowser.open(SPC_OUTLOOK_URL))
+        btn_close = QPushButton("❌ Close")
+        btn_close.clicked.connect(self.close)
+        ctrl.addWidget(btn_open)
+        ctrl.addStretch()
+        ctrl.addWidget(btn_close)
+        layout.addLayout(ctrl)
+        self.setLayout(layout)
+
+        for column in range(len(OUTLOOK_LAYERS)):
+            self.fill_column(column)
+        self.fetcher = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(poll_interval(OUTLOOK_REFRESH_MS))
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+        QTimer.singleShot(100, self.refresh)
+
+    def fill_column(self, column):
+        day, kind, title = OUTLOOK_LAYERS[column]
+        issued = county_outlooks.issued(day, kind)
+        self.table.horizontalHeaderItem(column + 1).setToolTip(f"Issued {issued}" if issued else "Not loaded")
+        for row, county in enumerate(self.counties):
+            text, fill = county_outlooks.cell(day, kind, county)
+            item = QTableWidgetItem(text)
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            if fill:
+                color = QColor(fill)
+                color.setAlpha(170)
+                item.setBackground(color)
+            self.table.setItem(row, column + 1, item)
+
+    def refresh(self):
+        if self.fetcher is not None and self.fetcher.isRunning():
+            return
+        self.fetcher = OutlookFetcher()
+        self.fetcher.outlooks_indexed.connect(self.outlooks_indexed)
+        self.fetcher.start()
+
+    def outlooks_indexed(self, changed, errors):
+        # Only the layers that were re-indexed are redrawn
+        for column, (day, kind, _) in enumerate(OUTLOOK_LAYERS):
+            if (day, kind) in changed:
+                self.fill_column(column)
+        issued = county_outlooks.issued(1, "cat")
+        text = f"✅ Day 1 issued {issued}" if issued else "✅ Outlooks loaded"
+        text += f", {len(changed)} layer(s) updated at {time.strftime('%H:%M')}"
+        if errors:
+            text += "  ❌ " + "; ".join(f"{column}: {error}" for column, error in errors.items())
+        self.status.setText(text)
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        super().done(result)
+
+class SpotterImagePopup(QDialog):
+    def __init__(self, parent, url, theme, font_size):
+        super().__init__(parent)
+        self.setWindowTitle("📋 Skywarn Spotter Checklist")
+
+        # Don't set a fixed minimum size - let it size to content
+        # self.setMinimumSize(800, 1200)  # Remove this line
+
+        QTimer.singleShot(50, lambda: self.move(50, 50))
+
+
+        self.setStyleSheet(f"""
+            QDialog {{
+                background: {theme['bg']};
+                color: {theme['fg']};
+            }}
+            QLabel {{
+                color: {theme['accent']};
+                font-weight: 600;
+                padding: 10px;
+            }}
+            QPushButton {{
+                background: {theme['button_bg']};
+                color: {theme['button_fg']};
+                border: 2px solid {theme['group_border']};
+                border-radius: 8px;
+                padding: 10px 20px;
+                font-weight: 600;
+                margin: 5px;
+            }}
+            QPushButton:hover {{
+                background: {theme['button_hover']};
+                border-color: {theme['accent']};
+            }}
+        """)
+
+        layout = QVBoxLayout()
+
+        self.status = QLabel("🔄 Loading spotter checklist...")
         layout.addWidget(self.status)
 
         # Create scroll area for the image
@@ -640,14 +4468,17 @@ class SpotterImagePopup(QDialog):
         layout.addWidget(btn_close)
 
         self.setLayout(layout)
-        QTimer.singleShot(100, lambda: self.load_spotter_image(url))
+        self.loader = ImageLoader(url, FetchSpan(url, "Spotter image", memory=True))
+        self.loader.image_ready.connect(self.show_spotter_image)
+        self.loader.image_failed.connect(
+            lambda error: self.status.setText("❌ Failed to load spotter checklist image"))
+        QTimer.singleShot(100, self.loader.start)
 
-    def load_spotter_image(self, url):
+    def show_spotter_image(self, shared):
+        span = self.loader.span
+        start = time.perf_counter()
         try:
-            resp = requests.get(url, timeout=15)
-            img = Image.open(BytesIO(resp.content))
-            qt_img = ImageQt.ImageQt(img)
-            pix = QPixmap.fromImage(qt_img)
+            pix = shared_pixmap(shared)
 
             # Get the original image size
             original_size = pix.size()
@@ -668,9 +4499,41 @@ class SpotterImagePopup(QDialog):
             QTimer.singleShot(50, lambda: self.move(50, 50))
 
             self.status.setText("✅ Spotter checklist loaded successfully")
+            span.set("render", time.perf_counter() - start)
+            span.finish()
         except Exception as e:
-            log_error(f"Image load error: {e}")
+            log_error(f"Image load error: {e}", url=self.loader.url, exc=e)
             self.status.setText("❌ Failed to load spotter checklist image")
+            span.finish(e)
+
+if WEBENGINE_AVAILABLE:
+    class LowBandwidthInterceptor(QWebEngineUrlRequestInterceptor):
+        # Pages still load; video/audio, plugins and prefetches do not, and
+        # GOES stills embedded in a page come from the smaller variant
+        BLOCKED = (QWebEngineUrlRequestInfo.ResourceType.ResourceTypeMedia,
+                   QWebEngineUrlRequestInfo.ResourceType.ResourceTypeObject,
+                   QWebEngineUrlRequestInfo.ResourceType.ResourceTypePluginResource,
+                   QWebEngineUrlRequestInfo.ResourceType.ResourceTypePrefetch)
+
+        def interceptRequest(self, info):
+            if not low_bandwidth:
+                return
+            if info.resourceType() in self.BLOCKED:
+                info.block(True)
+                return
+            url = info.requestUrl().toString()
+            variant = bandwidth_variant(url)
+            if variant != url:
+                info.redirect(QUrl(variant))
+
+web_interceptor = None
+
+def install_web_interceptor():
+    # One for the default profile; kept referenced here since the profile does not own it
+    global web_interceptor
+    if web_interceptor is None:
+        web_interceptor = LowBandwidthInterceptor()
+        QWebEngineProfile.defaultProfile().setUrlRequestInterceptor(web_interceptor)
 
 class WebViewPopup(QDialog):
     def __init__(self, parent, url, title, theme, font_size):
@@ -727,14 +4590,16 @@ class WebViewPopup(QDialog):
         layout.addLayout(controls)
 
         # Web view
+        install_web_interceptor()
         self.web_view = QWebEngineView()
-        self.web_view.setUrl(QUrl(url))
 
         # Configure web engine settings
         settings = self.web_view.settings()
         settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
-        settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, True)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, not low_bandwidth)
+        settings.setAttribute(QWebEngineSettings.WebAttribute.PlaybackRequiresUserGesture, low_bandwidth)
         settings.setAttribute(QWebEngineSettings.WebAttribute.LocalContentCanAccessRemoteUrls, True)
+        self.web_view.setUrl(QUrl(resolve_url(url)))
 
         # Connect signals
         self.web_view.loadStarted.connect(lambda: self.status.setText("🔄 Loading..."))
@@ -767,39 +4632,47 @@ class WebViewPopup(QDialog):
 class AlertFetcher(QThread):
     alerts_loaded = pyqtSignal(str)
     progress_updated = pyqtSignal(int)
+    watch_hits = pyqtSignal(str, list)
 
     def __init__(self, url, parse_atom=True, parent=None):
         super().__init__(parent)
         self.url = url
         self.parse_atom = parse_atom
+        self.span = FetchSpan(url, "Alerts")
+        self.error = None
+        self.hits = 0
 
+    @profiler.wrap("alert_fetch")
     def run(self):
+        # The span is finished on the GUI thread once the alerts are rendered
         text = ""
+        span = self.span
+        span.lap("queue")
+        start = time.perf_counter()
         try:
             self.progress_updated.emit(25)
-            resp = requests.get(self.url, timeout=12)
+            resp = fetch(self.url, timeout=12, span=span)
             self.progress_updated.emit(50)
             
             if self.parse_atom:
-                rootx = ET.fromstring(resp.content)
-                entries = rootx.findall("{http://www.w3.org/2005/Atom}entry")
+                alerts = parse_alert_feed(resp.content)
+                record_alerts(self.url, alerts)
                 self.progress_updated.emit(75)
-                
-                for entry in entries:
-                    title = entry.find("{http://www.w3.org/2005/Atom}title")
-                    summary = entry.find("{http://www.w3.org/2005/Atom}summary")
-                    link = entry.find("{http://www.w3.org/2005/Atom}link")
-                    area = entry.find("{urn:oasis:names:tc:emergency:cap:1.1}areaDesc")
-                    counties = area.text if area is not None and area.text else ""
-                    text += f"🚨 {title.text}\n📝 {summary.text}\n🗺️ {counties}\n🔗 {link.attrib.get('href') if link is not None else ''}\n\n"
+                for alert in alert_history.store(alerts):
+                    hits = keyword_watcher.scan(f"{alert['title']}\n{alert['summary']}\n{alert['area']}")
+                    if hits:
+                        self.hits += 1
+                        self.watch_hits.emit(alert["title"], sorted(hits))
+                text = format_alerts(alerts)
             else:
                 text = resp.text
                 
             self.progress_updated.emit(100)
         except Exception as e:
+            self.error = e
             text = f"❌ Failed to fetch alerts:\n{e}"
-            log_error(f"Alert fetch error: {e}")
-        
+            log_error(f"Alert fetch error: {e}", url=self.url, elapsed=time.perf_counter() - start, exc=e)
+        span.lap("parse")
         self.alerts_loaded.emit(text)
 
 class WeatherToolkit(QMainWindow):
@@ -808,9 +4681,21 @@ class WeatherToolkit(QMainWindow):
         self.config = load_config()
         self.alert_timer = QTimer()
         self.alert_timer.timeout.connect(self.refresh_alerts)
+        self.refresh_fetcher = None
+        set_watch_patterns(self.config.get("watch_patterns", []))
+        set_bandwidth_profile(self.config.get("bandwidth_profile", "normal"))
+        self.tray_icon = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            # The window has no icon yet, and a tray entry without one is not shown
+            icon = QApplication.windowIcon()
+            if icon.isNull():
+                icon = self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxWarning)
+            self.tray_icon = QSystemTrayIcon(icon, self)
+            self.tray_icon.show()
         self.current_theme = themes[self.config["theme"]]
         
-        self.setWindowTitle(f"{APP_TITLE} v{APP_VERSION}")
+        self.update_title()
+        self.pack_preparer = None
         self.setMinimumSize(1200, 800)
         
         # Apply window geometry
@@ -826,13 +4711,20 @@ class WeatherToolkit(QMainWindow):
         
         # Auto-refresh setup
         if self.config.get("auto_refresh_mins", 5) > 0:
-            self.alert_timer.start(self.config["auto_refresh_mins"] * 60000)
+            self.alert_timer.start(poll_interval(self.config["auto_refresh_mins"] * 60000))
         
         # Load default section if specified
         default_section = self.config.get("default_section", "")
         if default_section and default_section in resources:
             self.load_section(default_section)
 
+        # Link health: check whatever is past its TTL shortly after startup, then hourly
+        self.link_checker = None
+        self.link_timer = QTimer(self)
+        self.link_timer.timeout.connect(self.check_resource_links)
+        self.link_timer.start(3600 * 1000)
+        QTimer.singleShot(3000, self.check_resource_links)
+
     def setup_ui(self):
         # Create menu bar
         menubar = self.menuBar()
@@ -845,6 +4737,25 @@ class WeatherToolkit(QMainWindow):
         refresh_action.triggered.connect(self.refresh_alerts)
         file_menu.addAction(refresh_action)
 
+        archive_action = QAction("Product Archive...", self)
+        archive_action.triggered.connect(self.show_archive)
+        file_menu.addAction(archive_action)
+
+        links_action = QAction("Check Links Now", self)
+        links_action.triggered.connect(lambda: self.check_resource_links(force=True))
+        file_menu.addAction(links_action)
+
+        file_menu.addSeparator()
+        prepare_pack_action = QAction("Prepare Snapshot Pack...", self)
+        prepare_pack_action.triggered.connect(self.prepare_snapshot_pack)
+        file_menu.addAction(prepare_pack_action)
+        open_pack_action = QAction("Open Snapshot Pack...", self)
+        open_pack_action.triggered.connect(self.open_snapshot_pack)
+        file_menu.addAction(open_pack_action)
+        online_action = QAction("Go Online", self)
+        online_action.triggered.connect(lambda: self.set_offline_pack(""))
+        file_menu.addAction(online_action)
+
         file_menu.addSeparator()
         exit_action = QAction("Exit", self)
         exit_action.triggered.connect(self.close)
@@ -865,6 +4776,30 @@ class WeatherToolkit(QMainWindow):
         alerts_action.triggered.connect(self.show_alerts)
         quick_menu.addAction(alerts_action)
 
+        loop_action = QAction("🎞️ GOES Loop", self)
+        loop_action.triggered.connect(self.show_goes_loop)
+        quick_menu.addAction(loop_action)
+
+        sector_action = QAction("🗺️ GOES Colorado Sectors", self)
+        sector_action.triggered.connect(lambda: self.show_sector_popup(SECTOR_SOURCES["GeoColor"]))
+        quick_menu.addAction(sector_action)
+
+        zoom_action = QAction("🔍 GOES Zoom", self)
+        zoom_action.triggered.connect(lambda: self.show_zoom_viewer(ZOOM_SECTORS["CONUS 5000x3000"]))
+        quick_menu.addAction(zoom_action)
+
+        timeline_action = QAction("🕒 Event Timeline", self)
+        timeline_action.triggered.connect(self.show_event_timeline)
+        quick_menu.addAction(timeline_action)
+
+        md_action = QAction("📝 Colorado SPC Discussions", self)
+        md_action.triggered.connect(self.show_md_viewer)
+        quick_menu.addAction(md_action)
+
+        outlook_action = QAction("📊 County Outlook Risk", self)
+        outlook_action.triggered.connect(self.show_county_outlooks)
+        quick_menu.addAction(outlook_action)
+
         settings_action = QAction("⚙️ Settings", self)
         settings_action.triggered.connect(self.show_settings)
         quick_menu.addAction(settings_action)
@@ -873,6 +4808,9 @@ class WeatherToolkit(QMainWindow):
         
         # Help menu
         help_menu = menubar.addMenu("Help")
+        diagnostics_action = QAction("Diagnostics...", self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        help_menu.addAction(diagnostics_action)
         about_action = QAction("About", self)
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
@@ -920,23 +4858,24 @@ class WeatherToolkit(QMainWindow):
         alerts_btn = ModernButton("🚨 Colorado Active Alerts")
         alerts_btn.clicked.connect(self.show_alerts)
         left_layout.addWidget(alerts_btn)
+        timeline_btn = ModernButton("🕒 Event Timeline")
+        timeline_btn.clicked.connect(self.show_event_timeline)
+        left_layout.addWidget(timeline_btn)
         
         left_layout.addStretch()
         left_panel.setMaximumWidth(350)
         
-        # Right panel - links
-        self.right_panel = QScrollArea()
-        self.right_panel.setWidgetResizable(True)
-        self.right_content = QWidget()
-        self.right_layout = QVBoxLayout(self.right_content)
-        self.right_panel.setWidget(self.right_content)
+        # Right panel - one cached page per section, built on first visit
+        # or during idle time, so switching sections is just an index change
+        self.right_panel = QStackedWidget()
+        self.section_pages = {}
+        self.current_section = ""
         
         # Welcome message
         welcome = QLabel("👈 Select a weather resource category from the left panel to begin")
         welcome.setAlignment(Qt.AlignmentFlag.AlignCenter)
         welcome.setStyleSheet("font-size: 18px; padding: 50px; color: #888;")
-        self.right_layout.addWidget(welcome)
-        self.right_layout.addStretch()
+        self.right_panel.addWidget(welcome)
         
         content_splitter.addWidget(left_panel)
         content_splitter.addWidget(self.right_panel)
@@ -946,6 +4885,16 @@ class WeatherToolkit(QMainWindow):
         
         # Status bar
         self.statusBar().showMessage(f"Ready - {APP_AUTHOR} ({AUTHOR_EMAIL})")
+        self.bytes_label = QLabel()
+        self.statusBar().addPermanentWidget(self.bytes_label)
+        self.bytes_timer = QTimer(self)
+        self.bytes_timer.timeout.connect(self.update_bytes_label)
+        self.bytes_timer.start(2000)
+        self.update_bytes_label()
+
+    def update_bytes_label(self):
+        profile = " (low bandwidth)" if low_bandwidth else ""
+        self.bytes_label.setText(f"⬇️ {format_bytes(session_bytes)} this session{profile}")
 
     def show_web_popup(self, url, title):
         if not WEBENGINE_AVAILABLE:
@@ -956,27 +4905,38 @@ class WeatherToolkit(QMainWindow):
             return
 
         popup = WebViewPopup(self, url, title, self.current_theme, self.config["font_size"])
-        popup.exec()
+        self.exec_popup("web", popup)
 
+    @profiler.wrap("load_section")
     def load_section(self, section_name):
-        # Clear right panel
-        for i in reversed(range(self.right_layout.count())):
-            child = self.right_layout.itemAt(i).widget()
-            if child:
-                child.setParent(None)
-        
         if section_name not in resources:
             return
         
+        page = self.section_pages.get(section_name)
+        if page is None:
+            page = self.build_section_page(section_name)
+        self.right_panel.setCurrentWidget(page)
+        self.current_section = section_name
+
+    def build_section_page(self, section_name):
+        page = QScrollArea()
+        page.setWidgetResizable(True)
+        content = QWidget()
+        page_layout = QVBoxLayout(content)
+        page.setWidget(content)
+        page.link_rows = []
+        theme = self.current_theme
+        
         # Section header
         header = QLabel(f"{section_name}")
         header.setStyleSheet("font-size: 16px; font-weight: bold; padding: 8px;")
-        self.right_layout.addWidget(header)
+        page_layout.addWidget(header)
         
         # Create link buttons
         links = resources[section_name]
         for link_name, url in links.items():
             link_group = ModernGroupBox(link_name)
+            link_group.apply_style(theme)
             link_layout = QVBoxLayout()
             
             # Button layout
@@ -991,6 +4951,25 @@ class WeatherToolkit(QMainWindow):
                 view_btn = ModernButton("🛰️ View Image")
                 view_btn.clicked.connect(lambda checked, u=url: self.show_image_popup(u))
                 btn_layout.addWidget(view_btn)
+                if "/CONUS/" in url:
+                    sector_btn = ModernButton("🗺️ Colorado")
+                    sector_btn.clicked.connect(lambda checked, u=url: self.show_sector_popup(u))
+                    btn_layout.addWidget(sector_btn)
+                if "GEOCOLOR" in url:
+                    loop_btn = ModernButton("🎞️ View Loop")
+                    loop_btn.clicked.connect(lambda checked: self.show_goes_loop())
+                    btn_layout.addWidget(loop_btn)
+                    zoom_btn = ModernButton("🔍 Zoom")
+                    zoom_btn.clicked.connect(lambda checked: self.show_zoom_viewer(ZOOM_SECTORS["CONUS 5000x3000"]))
+                    btn_layout.addWidget(zoom_btn)
+            elif url == SPC_MD_INDEX_URL:
+                view_btn = ModernButton("📝 Colorado MDs")
+                view_btn.clicked.connect(lambda checked: self.show_md_viewer())
+                btn_layout.addWidget(view_btn)
+            elif url == SPC_OUTLOOK_URL:
+                view_btn = ModernButton("📊 County Risk")
+                view_btn.clicked.connect(lambda checked: self.show_county_outlooks())
+                btn_layout.addWidget(view_btn)
             elif "spotter" in url and url.endswith(".png"):
                 view_btn = ModernButton("🛰️ View Image")
                 view_btn.clicked.connect(lambda checked, u=url: self.show_spotter_image_popup(u))
@@ -1005,6 +4984,8 @@ class WeatherToolkit(QMainWindow):
             # open_btn.clicked.connect(lambda checked, u=url: webbrowser.open(u))
             # btn_layout.addWidget(open_btn)
 
+            for i in range(btn_layout.count()):
+                btn_layout.itemAt(i).widget().apply_style(theme)
             link_layout.addLayout(btn_layout)
             
             # URL display
@@ -1012,54 +4993,182 @@ class WeatherToolkit(QMainWindow):
             url_label.setStyleSheet("font-size: 11px; padding: 5px; font-family: monospace;")
             url_label.setWordWrap(True)
             link_layout.addWidget(url_label)
+            buttons = [btn_layout.itemAt(i).widget() for i in range(btn_layout.count())]
+            page.link_rows.append((url, buttons, url_label))
+            self.apply_link_health(url, buttons, url_label)
             
             link_group.setLayout(link_layout)
-            self.right_layout.addWidget(link_group)
+            page_layout.addWidget(link_group)
         
-        self.right_layout.addStretch()
+        page_layout.addStretch()
         
-        # Apply theme to new widgets
-        self.apply_theme_to_section()
+        self.right_panel.addWidget(page)
+        self.section_pages[section_name] = page
+        return page
 
-    def apply_theme_to_section(self):
-        theme = self.current_theme
-        for i in range(self.right_layout.count()):
-            item = self.right_layout.itemAt(i)
-            if item and item.widget():
-                widget = item.widget()
-                if isinstance(widget, ModernGroupBox):
-                    widget.apply_style(theme)
-                    # Apply theme to buttons inside
-                    for j in range(widget.layout().count()):
-                        sub_item = widget.layout().itemAt(j)
-                        if sub_item and hasattr(sub_item, 'count'):
-                            for k in range(sub_item.count()):
-                                btn_item = sub_item.itemAt(k)
-                                if btn_item and isinstance(btn_item.widget(), ModernButton):
-                                    btn_item.widget().apply_style(theme)
+    def apply_link_health(self, url, buttons, url_label):
+        with link_health_lock:
+            result = link_health.get(url)
+        state = link_state(result)
+        for btn in buttons:
+            # Dead links stay visible but greyed out, with the reason on hover
+            btn.setEnabled(state != "dead")
+            btn.setToolTip(link_hint(result))
+        hint = f"  ({link_hint(result)})" if result else ""
+        url_label.setText(f"{LINK_STATE_ICONS[state]} {url}{hint}")
+
+    def refresh_link_health(self):
+        for page in self.section_pages.values():
+            for row in page.link_rows:
+                self.apply_link_health(*row)
+
+    def check_resource_links(self, force=False):
+        if offline_pack is not None:
+            return
+        if self.link_checker is not None and self.link_checker.isRunning():
+            return
+        if force:
+            self.statusBar().showMessage("🔗 Checking links...")
+        self.link_checker = LinkChecker(force)
+        self.link_checker.links_checked.connect(self.links_checked)
+        self.link_checker.check_failed.connect(
+            lambda error: self.statusBar().showMessage(f"❌ Link check failed: {error}"))
+        self.link_checker.start()
+
+    def links_checked(self, count):
+        self.refresh_link_health()
+        if count:
+            with link_health_lock:
+                dead = [url for url in resource_links() if link_state(link_health.get(url)) == "dead"]
+            self.statusBar().showMessage(f"🔗 Checked {count} links, {len(dead)} dead")
+
+    def prebuild_section_pages(self):
+        # Build one missing page per idle tick so startup stays responsive
+        for section_name in resources:
+            if section_name not in self.section_pages:
+                self.build_section_page(section_name)
+                QTimer.singleShot(0, self.prebuild_section_pages)
+                return
+
+    def invalidate_section_pages(self):
+        # Pages are styled when built, so a theme change drops them all;
+        # the visible one is rebuilt now and the rest lazily in idle time
+        for page in self.section_pages.values():
+            self.right_panel.removeWidget(page)
+            page.deleteLater()
+        self.section_pages.clear()
+        if self.current_section:
+            self.load_section(self.current_section)
+        QTimer.singleShot(0, self.prebuild_section_pages)
+
+    def exec_popup(self, kind, popup):
+        # Popups are parented to the main window, so delete them on close
+        # rather than letting every one ever opened live until exit
+        profiler.popup_opened(kind)
+        try:
+            return popup.exec()
+        finally:
+            popup.deleteLater()
+            profiler.popup_closed(kind)
 
     def show_text_popup(self, url, title, typ, parse_pre=False):
         popup = TextPopup(self, url, title, typ, self.current_theme, self.config["font_size"], parse_pre)
-        popup.exec()
+        self.exec_popup(typ, popup)
+
+    def show_archive(self):
+        dialog = ArchiveDialog(self, self.current_theme, self.config["font_size"])
+        self.exec_popup("archive", dialog)
+
+    def show_diagnostics(self):
+        dialog = DiagnosticsDialog(self, self.current_theme, self.config["font_size"])
+        self.exec_popup("diagnostics", dialog)
 
     def show_image_popup(self, url):
         popup = ImagePopup(self, url, self.current_theme, self.config["font_size"])
-        popup.exec()
+        self.exec_popup("image", popup)
+
+    def show_goes_loop(self):
+        popup = GoesLoopPopup(self, self.current_theme, self.config["font_size"])
+        self.exec_popup("goes_loop", popup)
+
+    def show_sector_popup(self, url):
+        popup = SectorPopup(self, url, self.current_theme, self.config["font_size"])
+        self.exec_popup("sectors", popup)
+
+    def show_zoom_viewer(self, url):
+        popup = ZoomViewer(self, url, self.current_theme, self.config["font_size"])
+        self.exec_popup("zoom", popup)
+
+    def show_event_timeline(self):
+        popup = EventTimelinePopup(self, self.current_theme, self.config["font_size"])
+        self.exec_popup("timeline", popup)
+
+    def show_md_viewer(self):
+        popup = MdViewerPopup(self, self.current_theme, self.config["font_size"])
+        self.exec_popup("spc_md", popup)
+
+    def show_county_outlooks(self):
+        popup = CountyOutlookPopup(self, self.current_theme, self.config["font_size"])
+        self.exec_popup("spc_outlook", popup)
+
+    def update_title(self):
+        title = f"{APP_TITLE} v{APP_VERSION}"
+        if offline_pack is not None:
+            title += f" — OFFLINE snapshot v{offline_pack.manifest['version']} ({offline_pack.manifest['created']})"
+        self.setWindowTitle(title)
+
+    def set_offline_pack(self, path):
+        try:
+            open_offline_pack(path)
+        except (OSError, ValueError, zipfile.BadZipFile, KeyError) as e:
+            QMessageBox.warning(self, "Snapshot Pack", f"Could not open {path}:\n{e}")
+            return
+        self.update_title()
+        self.statusBar().showMessage(f"📦 Reading from {path}" if path else "🌐 Back online")
+
+    def open_snapshot_pack(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Snapshot Pack", "", "Snapshot Packs (*.zip)")
+        if path:
+            self.set_offline_pack(path)
+
+    def prepare_snapshot_pack(self):
+        if offline_pack is not None:
+            QMessageBox.information(self, "Snapshot Pack", "Go online before preparing a new pack.")
+            return
+        if self.pack_preparer is not None and self.pack_preparer.isRunning():
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Prepare Snapshot Pack", "cswn-snapshot.zip",
+                                              "Snapshot Packs (*.zip)",
+                                              options=QFileDialog.Option.DontConfirmOverwrite)
+        if not path:
+            return
+        # An existing pack at the target is refreshed as a delta
+        delta = os.path.exists(path)
+        self.statusBar().showMessage(f"📦 {'Refreshing' if delta else 'Preparing'} snapshot pack...")
+        self.pack_preparer = PackPreparer(path, delta)
+        self.pack_preparer.pack_ready.connect(lambda summary: self.statusBar().showMessage(
+            f"✅ {pack_summary_text(summary)}"))
+        self.pack_preparer.pack_failed.connect(lambda error: self.statusBar().showMessage(
+            f"❌ Snapshot pack failed: {error}"))
+        self.pack_preparer.start()
 
     def show_spotter_image_popup(self, url):
         popup = SpotterImagePopup(self, url, self.current_theme, self.config["font_size"])
-        popup.exec()
+        self.exec_popup("spotter", popup)
 
     def show_alerts(self):
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         
-        self.fetcher = AlertFetcher("https://alerts.weather.gov/cap/co.php?x=0")
+        self.fetcher = AlertFetcher(COLORADO_ALERTS_URL)
         self.fetcher.alerts_loaded.connect(self.display_alerts)
+        self.fetcher.watch_hits.connect(self.notify_watch_hits)
         self.fetcher.progress_updated.connect(self.progress_bar.setValue)
         self.fetcher.start()
 
     def display_alerts(self, alert_text):
+        render_start = time.perf_counter()
+        fetcher = self.sender()
         self.progress_bar.setVisible(False)
         popup = QDialog(self)
         popup.setWindowTitle("🚨 Colorado Active Weather Alerts")
@@ -1067,23 +5176,87 @@ class WeatherToolkit(QMainWindow):
         
         layout = QVBoxLayout()
         
+        # History window and area filter over the local alert store
+        history_bar = QHBoxLayout()
+        window_box = QComboBox()
+        for label, hours in ALERT_HISTORY_WINDOWS:
+            window_box.addItem(label, hours)
+        area_edit = QLineEdit()
+        area_edit.setPlaceholderText("County or UGC zone, e.g. El Paso or COZ085")
+        event_edit = QLineEdit()
+        event_edit.setPlaceholderText("Event, e.g. Warning")
+        history_bar.addWidget(window_box)
+        history_bar.addWidget(area_edit, 1)
+        history_bar.addWidget(event_edit, 1)
+        layout.addLayout(history_bar)
+        
         text_area = QTextEdit()
         text_area.setPlainText(alert_text)
         text_area.setReadOnly(True)
         text_area.setFont(QFont("Consolas", self.config["font_size"]))
         layout.addWidget(text_area)
         
+        @profiler.wrap("alert_filter")
+        def show_history():
+            hours = window_box.currentData()
+            if not hours:
+                text_area.setPlainText(alert_text)
+                return
+            area = area_edit.text().strip()
+            is_zone = bool(UGC_LINE.fullmatch(area.upper()))
+            alerts = alert_history.query(time.time() - hours * 3600,
+                                         county=None if is_zone else area,
+                                         ugc=area.upper() if is_zone else None,
+                                         event=event_edit.text().strip())
+            text_area.setPlainText(format_alerts(alerts) or "No alerts recorded for this window.")
+        
+        window_box.currentIndexChanged.connect(show_history)
+        area_edit.returnPressed.connect(show_history)
+        event_edit.returnPressed.connect(show_history)
+        
         close_btn = QPushButton("❌ Close")
         close_btn.clicked.connect(popup.close)
         layout.addWidget(close_btn)
         
         popup.setLayout(layout)
-        popup.setStyleSheet(self.get_dialog_style())
-        popup.exec()
+        popup.setStyleSheet(self.get_dialog_style() + f"""
+            QLineEdit, QComboBox {{
+                background: {self.current_theme['entry_bg']};
+                color: {self.current_theme['entry_fg']};
+                border: 2px solid {self.current_theme['entry_border']};
+                border-radius: 6px;
+                padding: 6px;
+            }}
+        """)
+        fetcher.span.set("render", time.perf_counter() - render_start)
+        fetcher.span.finish(fetcher.error)
+        self.exec_popup("alerts", popup)
+
+    def notify_watch_hits(self, source, hits):
+        message = f"👀 Watch match in {source}: {', '.join(hits)}"
+        self.statusBar().showMessage(message)
+        if self.tray_icon is not None:
+            self.tray_icon.showMessage("Keyword Watch", message, QSystemTrayIcon.MessageIcon.Warning, 15000)
+        QApplication.alert(self)
 
     def refresh_alerts(self):
+        # Background poll so the alert history keeps filling between popups
+        if self.refresh_fetcher is not None and self.refresh_fetcher.isRunning():
+            return
         self.statusBar().showMessage("🔄 Refreshing alerts...")
-        QTimer.singleShot(2000, lambda: self.statusBar().showMessage("✅ Alerts refreshed"))
+        self.refresh_fetcher = AlertFetcher(COLORADO_ALERTS_URL)
+        self.refresh_fetcher.alerts_loaded.connect(self.alerts_refreshed)
+        self.refresh_fetcher.watch_hits.connect(self.notify_watch_hits)
+        self.refresh_fetcher.start()
+
+    def alerts_refreshed(self, alert_text):
+        fetcher = self.sender()
+        fetcher.span.finish(fetcher.error)
+        if fetcher.error is not None:
+            self.statusBar().showMessage(f"❌ Alert refresh failed: {fetcher.error}")
+        elif not fetcher.hits:
+            # A watch match stays on the status bar until something replaces it
+            self.statusBar().showMessage("✅ Alerts refreshed")
 
     def show_settings(self):
         dialog = SettingsDialog(self, self.config)
@@ -1094,6 +5267,9 @@ class WeatherToolkit(QMainWindow):
             
             # Save config
             save_config(self.config)
+            set_watch_patterns(self.config["watch_patterns"])
+            set_bandwidth_profile(self.config["bandwidth_profile"])
+            self.update_bytes_label()
             
             # Apply changes
             self.current_theme = themes[self.config["theme"]]
@@ -1102,7 +5278,7 @@ class WeatherToolkit(QMainWindow):
             # Restart timer if needed
             self.alert_timer.stop()
             if self.config["auto_refresh_mins"] > 0:
-                self.alert_timer.start(self.config["auto_refresh_mins"] * 60000)
+                self.alert_timer.start(poll_interval(self.config["auto_refresh_mins"] * 60000))
 
     def show_about(self):
         QMessageBox.about(self, "About", 
@@ -1113,6 +5289,7 @@ class WeatherToolkit(QMainWindow):
             <p>A comprehensive toolkit for Colorado severe weather monitoring and amateur radio operators.</p>
             <p>Provides quick access to NWS products, radar, satellite imagery, and Skywarn resources.</p>""")
 
+    @profiler.wrap("apply_theme")
     def apply_theme(self):
         theme = self.current_theme
         font_size = self.config["font_size"]
@@ -1183,8 +5360,8 @@ class WeatherToolkit(QMainWindow):
         for btn in self.section_buttons.values():
             btn.apply_style(theme)
         
-        # Apply theme to current section content
-        self.apply_theme_to_section()
+        # Cached section pages carry the old theme
+        self.invalidate_section_pages()
 
     def get_dialog_style(self):
         theme = self.current_theme
@@ -1220,10 +5397,11 @@ class WeatherToolkit(QMainWindow):
         geom = self.geometry()
         self.config["window_geometry"] = f"{geom.width()}x{geom.height()}+{geom.x()}+{geom.y()}"
         save_config(self.config)
+        config_store.flush()
         event.accept()
 
 def main():
-    app = QApplication(sys.argv)
+    app = QApplication(configure_link_check(configure_pack(profiler.configure(sys.argv))))
     app.setApplicationName(APP_TITLE)
     app.setApplicationVersion(APP_VERSION)
     app.setOrganizationName(APP_AUTHOR)
@@ -1235,10 +5413,14 @@ def main():
         pass
     
     # Create and show main window
-    window = WeatherToolkit()
-    window.show()
+    with profiler.cycle("startup"):
+        window = WeatherToolkit()
+        window.show()
+    start_metrics(window.config.get("qt_metrics_port"), window.config.get("qt_metrics_file"))
     
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Image pool workers re-run this script when frozen by PyInstaller
+    multiprocessing.freeze_support()
     main()
@@ -2,11 +2,44 @@
 
 import webbrowser
 import subprocess
+import argparse
+import cProfile
+import functools
+import gc
+import tracemalloc
 import sys
 import threading
 import json
+import math
+import html
 import os
+import re
+import sqlite3
 import time
+import atexit
+import tempfile
+import hashlib
+import zipfile
+import bisect
+import heapq
+import logging
+import multiprocessing
+import queue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from multiprocessing import shared_memory
+from urllib.parse import urljoin, urlparse, urlsplit
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 from tkinter import (
     Tk, Label, LabelFrame, Button, Scrollbar, Canvas, Frame, Entry, StringVar,
     VERTICAL, RIGHT, LEFT, BOTH, Y, Toplevel, Text, END, filedialog, messagebox, Menu, simpledialog
@@ -15,7 +48,10 @@ import tkinter as tk
 
 try:
     import requests
-    from bs4 import BeautifulSoup
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    from urllib3.util.request import ACCEPT_ENCODING
     import xml.etree.ElementTree as ET
     from PIL import Image, ImageTk
     from io import BytesIO
@@ -26,10 +62,18 @@ except Exception as e:
 ### --- Constants and config --- ###
 CONFIG_FILE = os.path.expanduser("~/.weather_toolkit_config.json")
 ERROR_LOG = os.path.expanduser("~/.weather_toolkit_error.log")
+ARCHIVE_DB = os.path.expanduser("~/.weather_toolkit_archive.db")
+COLORADO_ALERTS_URL = "https://api.weather.gov/alerts/active.atom?area=CO"
+US_ALERTS_URL = "https://api.weather.gov/alerts/active.atom"
 APP_TITLE = "Colorado Severe Weather Network Toolkit"
 APP_AUTHOR = "W5ALC"
 AUTHOR_EMAIL = "Jon.W5ALC@gmail.com"
 APP_VERSION = "2.0"
+# CSWN_BASE_URL=http://127.0.0.1:8765 sends every fetch to the stand-in server
+# in benchmarks/fixture_server.py instead of the live hosts
+BASE_URL = os.environ.get("CSWN_BASE_URL", "").rstrip("/")
+ALERT_HISTORY_WINDOWS = [("Current feed", 0), ("Past 6 hours", 6), ("Past 24 hours", 24),
+                         ("Past 3 days", 72), ("Past 14 days", 336)]
 
 DEFAULT_CONFIG = {
     "theme": "dark",
@@ -37,6 +81,10 @@ DEFAULT_CONFIG = {
     "auto_refresh_mins": 5,
     "window_geometry": "1200x900+50+50",
     "default_section": "",
+    # Per app, since both apps share this config file
+    "tk_metrics_port": 0,
+    "tk_metrics_file": "",
+    "bandwidth_profile": "normal",
 }
 
 themes = {
@@ -151,33 +199,941 @@ resources = {
 #############################
 #  Helper: Config Loading   #
 #############################
+class ConfigStore:
+    # Config is kept in memory and shared with the other front end through
+    # one JSON file. Saves are debounced; a flush merges only the keys this
+    # process changed into whatever is on disk, under a lock file, and
+    # swaps the file in with a rename so a crash never leaves half a config.
+    def __init__(self, path, defaults, delay=1.0):
+        self.path = path
+        self.defaults = defaults
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.timer = None
+        self.pending = None
+        self.baseline = {}
+
+    def read(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error loading config: {e}")
+        return {}
+
+    def load(self):
+        cfg = dict(self.defaults)
+        cfg.update(self.read())
+        self.baseline = dict(cfg)
+        return cfg
+
+    def save(self, cfg):
+        with self.lock:
+            self.pending = dict(cfg)
+            if self.timer:
+                self.timer.cancel()
+            self.timer = threading.Timer(self.delay, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def flush(self):
+        # save() only takes self.lock, so the GUI never waits on disk I/O
+        with self.write_lock:
+            with self.lock:
+                if self.timer:
+                    self.timer.cancel()
+                    self.timer = None
+                cfg, self.pending = self.pending, None
+            if cfg is None:
+                return
+            changed = {k: v for k, v in cfg.items() if k not in self.baseline or self.baseline[k] != v}
+            if not changed:
+                return
+            try:
+                with self.file_lock():
+                    merged = self.read()
+                    merged.update(changed)
+                    fd, tmp = tempfile.mkstemp(prefix=".weather_toolkit_config.", suffix=".tmp",
+                                               dir=os.path.dirname(self.path) or ".")
+                    try:
+                        with os.fdopen(fd, "w") as f:
+                            json.dump(merged, f)
+                            f.flush()
+                            os.fsync(f.fileno())
+                        os.replace(tmp, self.path)
+                    except Exception:
+                        os.unlink(tmp)
+                        raise
+                self.baseline.update(changed)
+            except Exception as e:
+                print(f"Error saving config: {e}")
+
+    @contextmanager
+    def file_lock(self):
+        with open(self.path + ".lock", "a+") as lf:
+            if fcntl:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+            else:
+                lf.seek(0)
+                msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+                else:
+                    lf.seek(0)
+                    msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+
+config_store = ConfigStore(CONFIG_FILE, DEFAULT_CONFIG)
+atexit.register(config_store.flush)
+
 def load_config():
-    try:
-        if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, "r") as f:
-                cfg = json.load(f)
-                for k, v in DEFAULT_CONFIG.items():
-                    if k not in cfg:
-                        cfg[k] = v
-                return cfg
-    except Exception as e:
-        print(f"Error loading config: {e}")
-    return DEFAULT_CONFIG.copy()
+    return config_store.load()
 
 def save_config(cfg):
+    config_store.save(cfg)
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key in ("url", "elapsed", "exc_type", "suppressed"):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        return json.dumps(entry)
+
+class ErrorFloodFilter(logging.Filter):
+    # Lets at most `burst` records per source (URL host, else message) through
+    # every `window` seconds, so a dead host during a refresh storm cannot
+    # flood the log. The next record let through carries the dropped count.
+    def __init__(self, burst=5, window=60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.lock = threading.Lock()
+        self.sources = {}
+
+    def filter(self, record):
+        url = getattr(record, "url", None)
+        key = urlparse(url).netloc if url else str(record.msg)[:60]
+        now = time.monotonic()
+        with self.lock:
+            start, count, dropped = self.sources.get(key, (now, 0, 0))
+            if now - start >= self.window:
+                if dropped:
+                    record.suppressed = dropped
+                start, count, dropped = now, 0, 0
+            if count >= self.burst:
+                self.sources[key] = (start, count, dropped + 1)
+                return False
+            self.sources[key] = (start, count + 1, dropped)
+            if len(self.sources) > 256:
+                self.sources = {k: v for k, v in self.sources.items() if now - v[0] < self.window}
+        return True
+
+def start_error_log():
+    # Callers only enqueue; one background listener does the file I/O
+    file_handler = RotatingFileHandler(ERROR_LOG, maxBytes=1024 * 1024, backupCount=3,
+                                       encoding="utf-8", delay=True)
+    file_handler.setFormatter(JsonLineFormatter())
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(ErrorFloodFilter())
+    logger = logging.getLogger("weather_toolkit")
+    logger.addHandler(queue_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener = QueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return logger
+
+error_logger = start_error_log()
+
+def log_error(msg, url=None, elapsed=None, exc=None):
+    error_logger.error(msg, extra={
+        "url": url,
+        "elapsed": round(elapsed, 3) if elapsed is not None else None,
+        "exc_type": type(exc).__name__ if exc is not None else None,
+    })
+
+#############################
+#  Helper: Network          #
+#############################
+def resolve_url(url):
+    if not BASE_URL:
+        return url
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{BASE_URL}/{parts.netloc}{parts.path or '/'}{query}"
+
+# Low bandwidth profile for metered links: smaller GOES variants, forced
+# compression and slower polling
+BANDWIDTH_PROFILES = ("normal", "low")
+LOW_BANDWIDTH_POLL_FACTOR = 3
+LOW_BANDWIDTH_GOES = [
+    (re.compile(r"(/ABI/CONUS/[^/]+/)(?:latest|\d+x\d+)\.jpg$"), r"\g<1>1250x750.jpg"),
+    (re.compile(r"(/ABI/FD/[^/]+/)(?:latest|\d+x\d+)\.jpg$"), r"\g<1>1808x1808.jpg"),
+    (re.compile(r"(/ABI/SECTOR/[^/]+/[^/]+/)(?:latest|\d+x\d+)\.jpg$"), r"\g<1>600x600.jpg"),
+]
+LOW_BANDWIDTH_LOOP_SIZES = {"1250x750": "625x375", "1200x1200": "600x600"}
+low_bandwidth = False
+session_bytes = 0
+session_bytes_lock = threading.Lock()
+
+def set_bandwidth_profile(name):
+    global low_bandwidth
+    low_bandwidth = name == "low"
+
+def bandwidth_variant(url):
+    # The CDN publishes each GOES product at several fixed sizes
+    if low_bandwidth:
+        for pattern, replacement in LOW_BANDWIDTH_GOES:
+            url = pattern.sub(replacement, url)
+    return url
+
+def poll_interval(ms):
+    return ms * LOW_BANDWIDTH_POLL_FACTOR if low_bandwidth else ms
+
+def request_headers(headers=None):
+    # requests already offers gzip/deflate; pin the header to everything
+    # urllib3 can decode (br/zstd too when installed) so no caller drops it
+    if not low_bandwidth:
+        return headers
+    return {**(headers or {}), "Accept-Encoding": ACCEPT_ENCODING}
+
+def count_session_bytes(resp):
+    # Bytes as they came off the wire, before any gzip decoding
+    global session_bytes
+    received = (resp.raw.tell() if resp.raw is not None else 0) or len(resp.content)
+    with session_bytes_lock:
+        session_bytes += received
+
+def format_bytes(count):
+    for unit in ("B", "KiB", "MiB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+# Connections record how long DNS, TCP and TLS took so a fetch can split
+# connect time out of time-to-first-byte. A reused connection reports 0.
+net_local = threading.local()
+
+class TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        net_local.connect_time = time.perf_counter() - start
+
+class TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        net_local.connect_time = time.perf_counter() - start
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+def http_session():
+    # One keep-alive session per thread; requests sessions are not thread safe
+    session = getattr(net_local, "session", None)
+    if session is None:
+        session = net_local.session = requests.Session()
+        session.mount("http://", TimedAdapter())
+        session.mount("https://", TimedAdapter())
+    return session
+
+TIMING_STAGES = ("queue", "connect", "ttfb", "download", "parse", "render", "total")
+TIMING_BUFFER_SIZE = 500
+fetch_timings = deque(maxlen=TIMING_BUFFER_SIZE)
+timing_lock = threading.Lock()
+
+class FetchSpan:
+    """Stage timings for one fetch, from being queued to being rendered."""
+    def __init__(self, url, product, memory=False):
+        self.created = self.mark = time.perf_counter()
+        self.data = {"time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                     "host": urlsplit(url).netloc, "product": product, "url": url,
+                     "status": None, "bytes": 0, "error": None}
+        # Peak RSS is process-wide, so it is only worth tracking for one-off
+        # loads such as a single image rather than every background fetch
+        self.memory = memory
+        if memory:
+            peak_rss(reset=True)
+
+    def set(self, stage, seconds):
+        with timing_lock:
+            self.data[f"{stage}_ms"] = round(seconds * 1000, 2)
+
+    def lap(self, stage):
+        # Time since the previous stage ended
+        now = time.perf_counter()
+        self.set(stage, now - self.mark)
+        self.mark = now
+
+    def network(self, resp, start, first_byte):
+        now = time.perf_counter()
+        connect = getattr(net_local, "connect_time", 0.0)
+        self.set("connect", connect)
+        self.set("ttfb", first_byte - start - connect)
+        self.set("download", now - first_byte)
+        self.data["status"] = resp.status_code
+        self.data["bytes"] = (resp.raw.tell() if resp.raw is not None else 0) or len(resp.content)
+        self.mark = now
+
+    def finish(self, error=None):
+        if error is not None:
+            self.data["error"] = f"{error.__class__.__name__}: {error}"
+        self.set("total", time.perf_counter() - self.created)
+        if self.memory:
+            self.data["peak_rss_mb"] = round((peak_rss() or 0) / 2 ** 20, 1)
+        with timing_lock:
+            fetch_timings.append(self.data)
+            record_fetch(self.data)
+
+def fetch(url, timeout=10, span=None, headers=None):
+    net_local.connect_time = 0.0
+    start = time.perf_counter()
+    if offline_pack is not None:
+        # Read-only snapshot: answer from the pack and never touch the network
+        resp = offline_pack.response(url)
+        if span is not None:
+            span.network(resp, start, start)
+        return resp
+    resp = http_session().get(resolve_url(url), timeout=timeout, stream=True, headers=request_headers(headers))
+    first_byte = time.perf_counter()
+    resp.content
+    count_session_bytes(resp)
+    if span is not None:
+        span.network(resp, start, first_byte)
+    resp.raise_for_status()
+    return resp
+
+def timing_snapshot():
+    with timing_lock:
+        return [dict(span) for span in fetch_timings]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def summarize_timings(spans):
+    groups = {}
+    for span in spans:
+        groups.setdefault((span["host"], span["product"]), []).append(span)
+    rows = []
+    for (host, product), group in sorted(groups.items()):
+        row = {"host": host, "product": product, "count": len(group),
+               "errors": sum(1 for span in group if span["error"]),
+               "bytes": sum(span["bytes"] for span in group)}
+        for stage in TIMING_STAGES:
+            values = [span[f"{stage}_ms"] for span in group if f"{stage}_ms" in span]
+            if values:
+                row[stage] = {"p50": percentile(values, 50), "p95": percentile(values, 95)}
+        peaks = [span["peak_rss_mb"] for span in group if "peak_rss_mb" in span]
+        if peaks:
+            row["peak_rss_mb"] = max(peaks)
+        rows.append(row)
+    return rows
+
+def export_timings(path):
+    spans = timing_snapshot()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "app": APP_TITLE,
+            "version": APP_VERSION,
+            "exported": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "base_url": BASE_URL,
+            "summary": summarize_timings(spans),
+            "spans": spans,
+        }, f, indent=2)
+
+# Cumulative counters for the optional Prometheus endpoint/textfile. The
+# timing ring buffer forgets old fetches; these never reset.
+METRICS_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRICS_FILE_INTERVAL = 15
+fetch_metrics = {}
+cache_metrics = {}
+feed_status = {}
+process_started = time.time()
+
+def record_fetch(data):
+    # Called with timing_lock held
+    stats = fetch_metrics.setdefault(data["host"], {"ok": 0, "error": 0, "sum": 0.0,
+                                                    "buckets": [0] * len(METRICS_BUCKETS)})
+    seconds = data.get("total_ms", 0) / 1000
+    stats["error" if data["error"] else "ok"] += 1
+    stats["sum"] += seconds
+    for i, bound in enumerate(METRICS_BUCKETS):
+        if seconds <= bound:
+            stats["buckets"][i] += 1
+    if not data["error"]:
+        feed_status.setdefault(feed_name(data["url"], data["product"]), {})["last_success"] = time.time()
+
+def feed_name(url, product):
+    # Metrics label feeds by name, never by URL, so timestamped frames and
+    # per-product pages cannot grow the series without bound
+    if url == COLORADO_ALERTS_URL:
+        return "Colorado alerts"
+    if url == US_ALERTS_URL:
+        return "US alerts"
+    return product
+
+def record_cache(name, hit):
+    with timing_lock:
+        counts = cache_metrics.setdefault(name, [0, 0])
+        counts[0 if hit else 1] += 1
+
+def record_alerts(url, alerts):
+    severities = {}
+    for alert in alerts:
+        severity = alert["severity"] or "Unknown"
+        severities[severity] = severities.get(severity, 0) + 1
+    with timing_lock:
+        feed_status.setdefault(feed_name(url, "Alerts"), {})["severity"] = severities
+
+def process_rss():
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(cfg, f)
-    except Exception as e:
-        print(f"Error saving config: {e}")
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                    "PagefileUsage", "PeakPagefileUsage")]
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    import resource
+    # Peak rather than current RSS, but the best macOS offers without psutil
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
 
-def log_error(msg):
+def peak_rss(reset=False):
+    # Linux keeps a resettable high-water mark (VmHWM), which gives the peak
+    # since a span started. Elsewhere this is the current or lifetime figure.
     try:
-        with open(ERROR_LOG, "a") as f:
-            f.write(f"{time.ctime()}: {msg}\n")
-    except Exception:
+        with open("/proc/self/status") as f:
+            peak = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmHWM:"))
+        if reset:
+            with open("/proc/self/clear_refs", "w") as f:
+                f.write("5")
+        return peak
+    except (OSError, ValueError, StopIteration):
+        return process_rss()
+
+def process_threads():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Threads:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return threading.active_count()
+
+def metric_labels(**labels):
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+def render_metrics():
+    now = time.time()
+    with timing_lock:
+        fetches = {host: dict(stats, buckets=list(stats["buckets"])) for host, stats in fetch_metrics.items()}
+        caches = {name: list(counts) for name, counts in cache_metrics.items()}
+        feeds = {feed: dict(status) for feed, status in feed_status.items()}
+    lines = []
+    def family(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    family("cswn_build_info", "gauge", "Toolkit version.")
+    lines.append(f"cswn_build_info{metric_labels(app=APP_TITLE, version=APP_VERSION)} 1")
+    family("cswn_uptime_seconds", "gauge", "Seconds since the toolkit started.")
+    lines.append(f"cswn_uptime_seconds {now - process_started:.0f}")
+
+    family("cswn_fetch_total", "counter", "Fetches by host and outcome.")
+    for host, stats in sorted(fetches.items()):
+        for result in ("ok", "error"):
+            lines.append(f"cswn_fetch_total{metric_labels(host=host, result=result)} {stats[result]}")
+    family("cswn_fetch_duration_seconds", "histogram", "Fetch time from queueing to parsed, by host.")
+    for host, stats in sorted(fetches.items()):
+        for bound, count in zip(METRICS_BUCKETS, stats["buckets"]):
+            lines.append(f"cswn_fetch_duration_seconds_bucket{metric_labels(host=host, le=bound)} {count}")
+        total = stats["ok"] + stats["error"]
+        lines.append(f"cswn_fetch_duration_seconds_bucket{metric_labels(host=host, le='+Inf')} {total}")
+        lines.append(f"cswn_fetch_duration_seconds_sum{metric_labels(host=host)} {stats['sum']:.3f}")
+        lines.append(f"cswn_fetch_duration_seconds_count{metric_labels(host=host)} {total}")
+
+    family("cswn_cache_requests_total", "counter", "Cache lookups by cache and result.")
+    for name, (hits, misses) in sorted(caches.items()):
+        lines.append(f"cswn_cache_requests_total{metric_labels(cache=name, result='hit')} {hits}")
+        lines.append(f"cswn_cache_requests_total{metric_labels(cache=name, result='miss')} {misses}")
+    family("cswn_cache_hit_ratio", "gauge", "Share of cache lookups that hit.")
+    for name, (hits, misses) in sorted(caches.items()):
+        if hits + misses:
+            lines.append(f"cswn_cache_hit_ratio{metric_labels(cache=name)} {hits / (hits + misses):.4f}")
+
+    family("cswn_alerts_active", "gauge", "Alerts in the last successful fetch of each feed, by severity.")
+    for feed, status in sorted(feeds.items()):
+        for severity, count in sorted(status.get("severity", {}).items()):
+            lines.append(f"cswn_alerts_active{metric_labels(feed=feed, severity=severity)} {count}")
+    family("cswn_feed_last_success_age_seconds", "gauge", "Seconds since each feed last fetched without error.")
+    for feed, status in sorted(feeds.items()):
+        if "last_success" in status:
+            lines.append(f"cswn_feed_last_success_age_seconds{metric_labels(feed=feed)} "
+                         f"{now - status['last_success']:.0f}")
+
+    rss = process_rss()
+    if rss is not None:
+        family("cswn_process_resident_memory_bytes", "gauge", "Resident set size of the toolkit process.")
+        lines.append(f"cswn_process_resident_memory_bytes {rss}")
+    family("cswn_process_threads", "gauge", "Threads in the toolkit process.")
+    lines.append(f"cswn_process_threads {process_threads()}")
+    return "\n".join(lines) + "\n"
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
         pass
 
+def write_metrics_file(path):
+    # Same temp file + os.replace as the config, so a textfile collector
+    # never reads half a file
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".cswn-metrics-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render_metrics())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def start_metrics(port=0, path=""):
+    # Both are off unless tk_metrics_port / tk_metrics_file are set in the config
+    if port:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(port)), MetricsHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        except OSError as e:
+            log_error(f"Metrics endpoint failed to start on port {port}: {e}", exc=e)
+    if path:
+        path = os.path.expanduser(path)
+        def write_loop():
+            while True:
+                try:
+                    write_metrics_file(path)
+                except OSError as e:
+                    log_error(f"Metrics file write failed: {e}", exc=e)
+                time.sleep(METRICS_FILE_INTERVAL)
+        threading.Thread(target=write_loop, name="metrics-file", daemon=True).start()
+
+#############################
+#  Helper: Profiling        #
+#############################
+PROFILE_REPORT_DIR = os.path.expanduser("~/.weather_toolkit_profiles")
+TRACEMALLOC_TOP = 25
+
+class Profiler:
+    """Opt-in cProfile per cycle and tracemalloc reports per popup type."""
+    def __init__(self):
+        self.directory = os.environ.get("CSWN_PROFILE", "")
+        self.tracemalloc_cycles = int(os.environ.get("CSWN_TRACEMALLOC") or 0)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.closed = {}
+        self.baselines = {}
+
+    def configure(self, argv):
+        # Returns argv without our flags so Qt never sees them
+        parser = argparse.ArgumentParser(add_help=False)
+        parser.add_argument("--profile", default=self.directory)
+        parser.add_argument("--tracemalloc", type=int, default=self.tracemalloc_cycles)
+        args, rest = parser.parse_known_args(argv[1:])
+        self.directory = os.path.expanduser(args.profile) if args.profile else ""
+        self.tracemalloc_cycles = args.tracemalloc
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        if self.tracemalloc_cycles and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        return argv[:1] + rest
+
+    def report_path(self, name, suffix):
+        directory = self.directory or PROFILE_REPORT_DIR
+        os.makedirs(directory, exist_ok=True)
+        with self.lock:
+            self.sequence += 1
+            sequence = self.sequence
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name)
+        return os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{sequence:04d}-{safe_name}{suffix}")
+
+    @contextmanager
+    def cycle(self, name):
+        # Nested cycles (load_section during startup) are covered by the outer
+        # profile; a cycle on another thread while one is running is skipped
+        # on Pythons where only one profiler can be active at a time
+        if not self.directory or getattr(self.local, "active", False):
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            yield
+            return
+        self.local.active = True
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.local.active = False
+            try:
+                profile.dump_stats(self.report_path(name, ".pstats"))
+            except OSError as e:
+                log_error(f"Profile write failed: {e}", exc=e)
+
+    def wrap(self, name):
+        def decorate(func):
+            @functools.wraps(func)
+            def run(*args, **kwargs):
+                with self.cycle(name):
+                    return func(*args, **kwargs)
+            return run
+        return decorate
+
+    def popup_opened(self, kind):
+        if self.tracemalloc_cycles and kind not in self.baselines:
+            gc.collect()
+            self.baselines[kind] = tracemalloc.take_snapshot()
+
+    def popup_closed(self, kind):
+        if not self.tracemalloc_cycles or kind not in self.baselines:
+            return
+        count = self.closed[kind] = self.closed.get(kind, 0) + 1
+        if count % self.tracemalloc_cycles:
+            return
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)])
+        stats = snapshot.compare_to(self.baselines[kind], "lineno")
+        lines = [f"Top {TRACEMALLOC_TOP} allocation changes after {count} {kind} popup cycles",
+                 f"Traced now: {tracemalloc.get_traced_memory()[0] / 1024:.0f} KiB", ""]
+        lines += [str(stat) for stat in stats[:TRACEMALLOC_TOP]]
+        try:
+            with open(self.report_path(f"tracemalloc-{kind}-{count}", ".txt"), "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            log_error(f"tracemalloc report failed: {e}", exc=e)
+
+profiler = Profiler()
+
+#############################
+#  Helper: Text Products    #
+#############################
+PRE_BLOCK = re.compile(rb"<pre\b[^>]*>(.*?)</pre\s*>", re.IGNORECASE | re.DOTALL)
+INLINE_TAG = re.compile(r"<[^>]*>")
+
+def extract_pre_text(content):
+    # Product pages wrap the raw text in a single <pre>. Scanning the bytes for
+    # it is far cheaper than building a soup of the whole page.
+    match = PRE_BLOCK.search(content)
+    if not match:
+        return None
+    text = match.group(1).decode("utf-8", errors="replace")
+    if "<" in text:
+        text = INLINE_TAG.sub("", text)
+    return html.unescape(text)
+
+#############################
+#  Helper: Alert History    #
+#############################
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+CAP_NAMESPACES = ("{urn:oasis:names:tc:emergency:cap:1.2}", "{urn:oasis:names:tc:emergency:cap:1.1}")
+
+def cap_field(entry, name):
+    for ns in CAP_NAMESPACES:
+        el = entry.find(ns + name)
+        if el is not None:
+            return (el.text or "").strip()
+    return ""
+
+def iso_epoch(value):
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+def parse_alert_entry(entry):
+    # Flatten one Atom/CAP <entry> into a plain dict used by the viewers and
+    # the history store
+    title = entry.find(ATOM_NS + "title")
+    summary = entry.find(ATOM_NS + "summary")
+    link = entry.find(ATOM_NS + "link")
+    alert_id = entry.find(ATOM_NS + "id")
+    updated = entry.find(ATOM_NS + "updated")
+    area = cap_field(entry, "areaDesc")
+    zones = []
+    for ns in CAP_NAMESPACES:
+        geocode = entry.find(ns + "geocode")
+        if geocode is None:
+            continue
+        value_name = ""
+        for child in geocode:
+            tag = child.tag.rsplit("}", 1)[-1]
+            if tag == "valueName":
+                value_name = (child.text or "").strip()
+            elif tag == "value" and value_name == "UGC":
+                zones.extend((child.text or "").split())
+        break
+    href = link.attrib.get("href", "") if link is not None else ""
+    return {
+        "id": (alert_id.text or "").strip() if alert_id is not None else href,
+        "updated": (updated.text or "").strip() if updated is not None else "",
+        "title": (title.text or "") if title is not None else "",
+        "summary": (summary.text or "") if summary is not None else "",
+        "link": href,
+        "event": cap_field(entry, "event"),
+        "severity": cap_field(entry, "severity"),
+        "area": area,
+        "counties": [c.strip() for c in area.split(";") if c.strip()],
+        "zones": zones,
+        "onset": iso_epoch(cap_field(entry, "onset") or cap_field(entry, "effective")),
+        "expires": iso_epoch(cap_field(entry, "expires")),
+    }
+
+COUNTY_IN_ZONE = re.compile(r"([A-Z][A-Za-z.' ]*?) Count(?:y|ies)")
+DIRECTION_PREFIX = re.compile(r"^(?:(?:North|South|East|West|Central)\w*\s+)+")
+STATE_SUFFIX = re.compile(r",\s*[A-Z]{2}$")
+
+def county_names(counties):
+    # "El Paso, CO" and zone names like "Southern El Paso County/Rampart
+    # Range" both index as "El Paso", so county lookups stay exact matches
+    names = set()
+    for item in counties:
+        names.add(STATE_SUFFIX.sub("", item))
+        for part in item.split("/"):
+            names.update(DIRECTION_PREFIX.sub("", m.strip()) for m in COUNTY_IN_ZONE.findall(part))
+    return names
+
+def parse_alert_feed(content):
+    rootx = ET.fromstring(content)
+    return [parse_alert_entry(entry) for entry in rootx.findall(ATOM_NS + "entry")]
+
+def group_alerts(alerts, term):
+    # Alerts whose title or summary contain term, grouped by county
+    grouped_alerts = {}
+    for alert in alerts:
+        title = alert["title"]
+        summary = alert["summary"]
+        link = alert["link"]
+        counties = alert["counties"] or ["Unknown Area"]
+        if title and summary:
+            if term in title.lower() or term in summary.lower():
+                for county in counties:
+                    grouped_alerts.setdefault(county, []).append((title, summary, link))
+    return grouped_alerts
+
+ALERT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY,
+    alert_id TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    event TEXT,
+    severity TEXT,
+    title TEXT,
+    summary TEXT,
+    link TEXT,
+    area TEXT,
+    onset_utc REAL,
+    expires_utc REAL,
+    seen_utc REAL NOT NULL,
+    UNIQUE (alert_id, updated)
+);
+CREATE TABLE IF NOT EXISTS alert_areas (
+    alert_row INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS alert_areas_by_name ON alert_areas (kind, name, alert_row);
+CREATE INDEX IF NOT EXISTS alert_areas_by_row ON alert_areas (alert_row);
+CREATE INDEX IF NOT EXISTS alerts_by_event ON alerts (event);
+CREATE INDEX IF NOT EXISTS alerts_by_onset ON alerts (onset_utc);
+CREATE INDEX IF NOT EXISTS alerts_by_expires ON alerts (expires_utc);
+"""
+
+class AlertHistory:
+    # Append-only store of every alert version seen, one row per
+    # (alert id, updated). A whole refresh is written in one transaction.
+    def __init__(self, path, retention_days=14):
+        self.path = path
+        self.retention = retention_days * 86400
+        self.lock = threading.Lock()
+        self.conn = None
+        self.last_purge = 0
+
+    def connect(self):
+        if self.conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(ALERT_SCHEMA)
+            self.conn = conn
+        return self.conn
+
+    def store(self, alerts):
+        # Returns the alert versions that were not in the store yet
+        now = time.time()
+        rows = [(a["id"], a["updated"], a["event"], a["severity"], a["title"], a["summary"], a["link"],
+                 a["area"], a["onset"], a["expires"], now) for a in alerts if a["id"]]
+        areas = []
+        for a in alerts:
+            names = [("county", c) for c in county_names(a["counties"])] + [("ugc", z) for z in a["zones"]]
+            areas.extend((kind, name, a["id"], a["updated"], now) for kind, name in names)
+        try:
+            with self.lock, self.connect() as conn:
+                before = conn.total_changes
+                conn.executemany(
+                    "INSERT OR IGNORE INTO alerts (alert_id, updated, event, severity, title, summary, link, "
+                    "area, onset_utc, expires_utc, seen_utc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                if conn.total_changes == before:
+                    return []
+                # Only rows inserted by this batch carry this seen_utc
+                conn.executemany(
+                    "INSERT INTO alert_areas (alert_row, kind, name) SELECT id, ?, ? FROM alerts "
+                    "WHERE alert_id = ? AND updated = ? AND seen_utc = ?", areas)
+                new = {r[0] for r in conn.execute(
+                    "SELECT alert_id || ' ' || updated FROM alerts WHERE seen_utc = ?", (now,))}
+                if now - self.last_purge > 3600:
+                    self.purge(conn, now)
+        except sqlite3.Error as e:
+            log_error(f"Alert history store error: {e}", exc=e)
+            return []
+        return [a for a in alerts if f"{a['id']} {a['updated']}" in new]
+
+    def purge(self, conn, now):
+        cutoff = now - self.retention
+        conn.execute("DELETE FROM alert_areas WHERE alert_row IN "
+                     "(SELECT id FROM alerts WHERE COALESCE(expires_utc, seen_utc) < ?)", (cutoff,))
+        conn.execute("DELETE FROM alerts WHERE COALESCE(expires_utc, seen_utc) < ?", (cutoff,))
+        self.last_purge = now
+
+    def query(self, since, until=None, county=None, ugc=None, event=None, limit=1000):
+        # Latest version of every alert in effect at some point in
+        # [since, until], optionally limited to a county, UGC zone or event
+        until = until or time.time()
+        where = ["COALESCE(a.onset_utc, a.seen_utc) <= ?", "COALESCE(a.expires_utc, a.seen_utc) >= ?"]
+        params = [until, since]
+        if event:
+            where.append("a.event LIKE ?")
+            params.append(f"%{event}%")
+        for kind, name in (("county", county), ("ugc", ugc)):
+            if name:
+                where.append("a.id IN (SELECT alert_row FROM alert_areas WHERE kind = ? AND name = ?)")
+                params.extend((kind, name))
+        sql = ("SELECT a.alert_id, MAX(a.updated), a.event, a.severity, a.title, a.summary, a.link, a.area, "
+               "a.onset_utc, a.expires_utc FROM alerts a WHERE " + " AND ".join(where) +
+               " GROUP BY a.alert_id ORDER BY a.onset_utc DESC LIMIT ?")
+        params.append(limit)
+        with self.lock:
+            rows = self.connect().execute(sql, params).fetchall()
+        return [{
+            "id": r[0], "updated": r[1], "event": r[2], "severity": r[3], "title": r[4], "summary": r[5],
+            "link": r[6], "area": r[7], "counties": [c.strip() for c in (r[7] or "").split(";") if c.strip()],
+            "zones": [], "onset": r[8], "expires": r[9],
+        } for r in rows]
+
+alert_history = AlertHistory(ARCHIVE_DB)
+
+#############################
+#   Helper: GOES Loop       #
+#############################
+GOES_LOOP_SECTORS = {
+    "CONUS": ("https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/GEOCOLOR/", "1250x750"),
+    "Colorado (Southern Rockies)": ("https://cdn.star.nesdis.noaa.gov/GOES19/ABI/SECTOR/sr/GEOCOLOR/", "1200x1200"),
+}
+GOES_LOOP_FRAMES = 12
+GOES_LOOP_DELAY_MS = 250
+GOES_LOOP_REFRESH_MS = 5 * 60 * 1000
+GOES_FETCH_WORKERS = 6
+# The CDN directory index names every frame YYYYJJJHHMM_GOES19-ABI-<sector>-GEOCOLOR-<size>.jpg
+GOES_FRAME_FILE = re.compile(r'href="(?:[^"]*/)?((\d{11})_GOES\d+-ABI-[^"/]+-(\d+x\d+)\.jpg)"')
+
+def list_goes_frames(base_url, size, count):
+    listing = fetch(base_url, timeout=15).content.decode("utf-8", errors="replace")
+    frames = {stamp: base_url + name for name, stamp, frame_size in GOES_FRAME_FILE.findall(listing)
+              if frame_size == size}
+    return sorted(frames.items())[-count:]
+
+def goes_frame_time(stamp):
+    return datetime.strptime(stamp, "%Y%j%H%M").strftime("%b %d %H:%M UTC")
+
+class FrameRing:
+    """The newest decoded frames of one loop, never more than capacity."""
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.frames = {}
+
+    def add(self, stamp, frame):
+        self.frames[stamp] = frame
+        for old in sorted(self.frames)[:-self.capacity]:
+            del self.frames[old]
+
+    def resize(self, capacity):
+        self.capacity = capacity
+        for old in sorted(self.frames)[:-capacity]:
+            del self.frames[old]
+
+    def missing(self, listed):
+        # Anything already decoded, or older than a full ring, is skipped
+        newest = sorted(stamp for stamp, _ in listed)[-self.capacity:]
+        return [(stamp, url) for stamp, url in listed if stamp in newest and stamp not in self.frames]
+
+    def ordered(self):
+        return [(stamp, self.frames[stamp]) for stamp in sorted(self.frames)]
+
 #############################
 #   Helper: Theme/Fonts     #
 #############################
@@ -200,48 +1156,1365 @@ def apply_theme(widget, theme, font_size=None):
 #   Helper: Tooltips        #
 #############################
 class ToolTip:
-    def __init__(self, widget, text, theme, font_size):
-        self.widget = widget
-        self.text = text
-        self.theme = theme
-        self.font_size = font_size
-        self.tipwindow = None
-        widget.bind("<Enter>", self.showtip)
-        widget.bind("<Leave>", self.hidetip)
-        widget.bind("<Motion>", self.movetip)
-
-    def showtip(self, event=None):
-        if self.tipwindow or not self.text:
+    # One pre-created tooltip window shared by every registered widget.
+    # Registering only adds a bindtag and a dict entry, and hovering just
+    # retexts/moves the window instead of creating a new Toplevel.
+    BINDTAG = "CSWNToolTip"
+    SHOW_DELAY_MS = 500
+    MOVE_THROTTLE_MS = 30
+
+    def __init__(self, root, theme, font_size):
+        self.root = root
+        self.texts = {}
+        self.current = None
+        self.show_job = None
+        self.move_job = None
+        self.pos = (0, 0)
+        self.tipwindow = tk.Toplevel(root)
+        self.tipwindow.withdraw()
+        self.tipwindow.wm_overrideredirect(True)
+        self.label = tk.Label(self.tipwindow, justify=tk.LEFT, relief=tk.SOLID, borderwidth=1)
+        self.label.pack(ipadx=5, ipady=2)
+        self.set_theme(theme, font_size)
+        root.bind_class(self.BINDTAG, "<Enter>", self.enter)
+        root.bind_class(self.BINDTAG, "<Leave>", self.leave)
+        root.bind_class(self.BINDTAG, "<Motion>", self.motion)
+        root.bind_class(self.BINDTAG, "<ButtonPress>", self.leave)
+        root.bind_class(self.BINDTAG, "<Destroy>", self.forget)
+
+    def set_theme(self, theme, font_size):
+        self.label.config(background=theme["status_bg"], foreground=theme["status_fg"],
+                          font=("TkDefaultFont", font_size))
+
+    def register(self, widget, text):
+        self.texts[str(widget)] = text
+        widget.bindtags(widget.bindtags() + (self.BINDTAG,))
+
+    def set_text(self, widget, text):
+        self.texts[str(widget)] = text
+
+    def forget(self, event):
+        self.texts.pop(str(event.widget), None)
+        if self.current is event.widget:
+            self.leave()
+
+    def enter(self, event):
+        text = self.texts.get(str(event.widget))
+        if not text:
             return
-        x = y = 0
-        x, y, cx, cy = self.widget.bbox("insert") if hasattr(self.widget, 'bbox') else (0, 0, 0, 0)
-        x += self.widget.winfo_rootx() + 25
-        y += self.widget.winfo_rooty() + 20
-        self.tipwindow = tw = tk.Toplevel(self.widget)
-        tw.wm_overrideredirect(True)
-        tw.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(
-            tw,
-            text=self.text,
-            justify=tk.LEFT,
-            background=self.theme["status_bg"],
-            foreground=self.theme["status_fg"],
-            relief=tk.SOLID,
-            borderwidth=1,
-            font=("TkDefaultFont", self.font_size)
-        )
-        label.pack(ipadx=5, ipady=2)
+        self.leave()
+        self.current = event.widget
+        self.label.config(text=text)
+        self.pos = (event.x_root + 10, event.y_root + 10)
+        self.show_job = self.root.after(self.SHOW_DELAY_MS, self.showtip)
+
+    def showtip(self):
+        self.show_job = None
+        self.tipwindow.wm_geometry(f"+{self.pos[0]}+{self.pos[1]}")
+        self.tipwindow.deiconify()
+        self.tipwindow.lift()
+
+    def leave(self, event=None):
+        for job in (self.show_job, self.move_job):
+            if job:
+                self.root.after_cancel(job)
+        self.show_job = self.move_job = None
+        self.current = None
+        self.tipwindow.withdraw()
+
+    def motion(self, event):
+        self.pos = (event.x_root + 10, event.y_root + 10)
+        if self.show_job is None and self.move_job is None and self.current is not None:
+            self.move_job = self.root.after(self.MOVE_THROTTLE_MS, self.movetip)
+
+    def movetip(self):
+        self.move_job = None
+        self.tipwindow.wm_geometry(f"+{self.pos[0]}+{self.pos[1]}")
+
+#############################
+#   Helper: Image Pool      #
+#############################
+IMAGE_POOL_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+image_executor = None
+image_pool_lock = threading.Lock()
+
+def image_pool():
+    # Spawned rather than forked: forking a process that is running GUI and
+    # network threads is not safe. False once the pool has failed to start.
+    global image_executor
+    with image_pool_lock:
+        if image_executor is None:
+            image_executor = ProcessPoolExecutor(IMAGE_POOL_WORKERS,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(image_executor.shutdown, wait=False, cancel_futures=True)
+        return image_executor
+
+def disable_image_pool(error):
+    global image_executor
+    with image_pool_lock:
+        if image_executor is False:
+            return
+        if image_executor is not None:
+            image_executor.shutdown(wait=False, cancel_futures=True)
+        image_executor = False
+    log_error(f"Image pool unavailable, decoding in-process: {error}", exc=error)
+
+IMAGE_HEADER_BYTES = 64 * 1024
+READ_CHUNK = 64 * 1024
+
+def shared_source(content):
+    source = shared_memory.SharedMemory(create=True, size=max(1, len(content)))
+    source.buf[:len(content)] = content
+    return source
+
+def release_shared(shm):
+    shm.close()
+    shm.unlink()
+
+def fetch_shared(url, timeout=10, span=None):
+    # Like fetch, but the body is read straight into a shared memory block
+    # sized from Content-Length rather than collected in chunks and joined.
+    # Returns the block and the body length.
+    if offline_pack is not None:
+        resp = fetch(url, timeout=timeout, span=span)
+        return shared_source(resp.content), len(resp.content)
+    net_local.connect_time = 0.0
+    start = time.perf_counter()
+    resp = http_session().get(resolve_url(url), timeout=timeout, stream=True, headers=request_headers())
+    first_byte = time.perf_counter()
+    length = int(resp.headers.get("Content-Length") or 0)
+    source = None
+    try:
+        if resp.ok and length and resp.headers.get("Content-Encoding", "identity") == "identity":
+            source = shared_memory.SharedMemory(create=True, size=length)
+            received = 0
+            while received < length:
+                count = resp.raw.readinto(source.buf[received:received + READ_CHUNK])
+                if not count:
+                    raise requests.ConnectionError(f"Connection closed after {received} of {length} bytes")
+                received += count
+            resp.raw.release_conn()
+        if span is not None:
+            span.network(resp, start, first_byte)
+        resp.raise_for_status()
+        if source is None:
+            length = len(resp.content)
+            source = shared_source(resp.content)
+        count_session_bytes(resp)
+    except Exception:
+        if source is not None:
+            release_shared(source)
+        raise
+    return source, length
+
+def decode_to_shared(source_name, length, name, max_size):
+    # Runs in a pool process: decode the compressed bytes in one shared
+    # block, shrink, convert to RGBA and write the pixels into another
+    source = shared_memory.SharedMemory(name=source_name)
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        img = Image.open(BytesIO(source.buf[:length]))
+        if max_size:
+            # draft() has the JPEG decoder skip to the nearest reduced scale,
+            # so the one resample below starts from a small image
+            img.draft("RGB", max_size)
+            img.thumbnail(max_size, Image.Resampling.LANCZOS)
+        img = img.convert("RGBA")
+        shm.buf[:img.width * img.height * 4] = img.tobytes()
+        return img.size
+    finally:
+        source.close()
+        shm.close()
+
+class SharedImage:
+    """RGBA pixels decoded by the image pool, held in shared memory until released."""
+    def __init__(self, source, length, max_size=None):
+        # Only the header is read here; it bounds the size of the result
+        try:
+            header = Image.open(BytesIO(source.buf[:min(length, IMAGE_HEADER_BYTES)]))
+        except Exception:
+            header = Image.open(BytesIO(source.buf[:length]))
+        width, height = header.size
+        header.close()
+        if max_size:
+            width, height = min(width, max_size[0]), min(height, max_size[1])
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, width * height * 4))
+        self.size = None
+
+    def release(self):
+        release_shared(self.shm)
+
+def decode_shared(source, length, max_size=None):
+    shared = SharedImage(source, length, max_size)
+    args = (source.name, length, shared.shm.name, max_size)
+    try:
+        pool = image_pool()
+        try:
+            if pool is False:
+                raise BrokenProcessPool("disabled after an earlier failure")
+            shared.size = pool.submit(decode_to_shared, *args).result()
+        except (BrokenProcessPool, OSError) as e:
+            if pool is not False:
+                disable_image_pool(e)
+            shared.size = decode_to_shared(*args)
+    except Exception:
+        shared.release()
+        raise
+    return shared
+
+def decode_image(content, max_size=None):
+    source = shared_source(content)
+    try:
+        return decode_shared(source, len(content), max_size)
+    finally:
+        release_shared(source)
+
+def load_image(url, max_size=None, timeout=15, span=None):
+    # Network bytes land in shared memory and are decoded from there, so the
+    # compressed image is never copied into this process's heap
+    source, length = fetch_shared(bandwidth_variant(url), timeout=timeout, span=span)
+    try:
+        return decode_shared(source, length, max_size)
+    finally:
+        release_shared(source)
+
+def shared_photo(shared):
+    # Image.frombuffer reads the shared block in place; the PhotoImage is the
+    # only copy made in this process
+    img = Image.frombuffer("RGBA", shared.size, shared.shm.buf, "raw", "RGBA", 0, 1)
+    photo = ImageTk.PhotoImage(img)
+    del img
+    shared.release()
+    return photo
+
+#############################
+#   Helper: GOES Sectors    #
+#############################
+# GOES-East (75.2W) fixed grid, from the GOES-R Product User Guide. Every
+# CDN CONUS image, whatever its pixel size, covers this scan-angle extent.
+GOES_EAST_LON = -75.2
+GOES_R_EQ = 6378137.0
+GOES_R_POL = 6356752.31414
+GOES_H = 42164160.0
+CONUS_X_EXTENT = (-0.101360, 0.038640)
+CONUS_Y_EXTENT = (0.128240, 0.044240)
+# Approximate lat/lon boxes (south, north, west, east), padded a little,
+# for Colorado and the offices whose areas cover it
+SECTOR_REGIONS = {
+    "Colorado": (36.8, 41.2, -109.3, -101.8),
+    "Boulder (BOU)": (38.5, 41.2, -107.0, -101.9),
+    "Pueblo (PUB)": (36.8, 39.7, -107.2, -101.8),
+    "Grand Junction (GJT)": (36.8, 41.2, -111.1, -105.5),
+    "Cheyenne (CYS)": (40.8, 43.7, -108.1, -101.9),
+    "Goodland (GLD)": (38.1, 40.9, -103.3, -99.4),
+}
+SECTOR_SOURCES = {
+    "GeoColor": "https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/GEOCOLOR/latest.jpg",
+    "Sandwich RGB": "https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/Sandwich/2500x1500.jpg",
+}
+SECTOR_REFRESH_MS = 5 * 60 * 1000
+
+def goes_scan_angles(lat, lon):
+    # Geodetic lat/lon to ABI (x, y) scan angles in radians
+    lat, lon = math.radians(lat), math.radians(lon - GOES_EAST_LON)
+    phi = math.atan(GOES_R_POL ** 2 / GOES_R_EQ ** 2 * math.tan(lat))
+    r = GOES_R_POL / math.sqrt(1 - (1 - GOES_R_POL ** 2 / GOES_R_EQ ** 2) * math.cos(phi) ** 2)
+    sx = GOES_H - r * math.cos(phi) * math.cos(lon)
+    sy = -r * math.cos(phi) * math.sin(lon)
+    sz = r * math.sin(phi)
+    return math.asin(-sy / math.sqrt(sx * sx + sy * sy + sz * sz)), math.atan(sz / sx)
+
+def conus_fraction_box(south, north, west, east, samples=16):
+    # Edges of a lat/lon box curve in the satellite view, so project points
+    # along all four and keep the extremes. Returns fractions of the frame.
+    points = []
+    for i in range(samples + 1):
+        lat = south + (north - south) * i / samples
+        lon = west + (east - west) * i / samples
+        points += [(lat, west), (lat, east), (south, lon), (north, lon)]
+    xs, ys = zip(*(goes_scan_angles(lat, lon) for lat, lon in points))
+    (x0, x1), (y0, y1) = CONUS_X_EXTENT, CONUS_Y_EXTENT
+    return ((min(xs) - x0) / (x1 - x0), (y0 - max(ys)) / (y0 - y1),
+            (max(xs) - x0) / (x1 - x0), (y0 - min(ys)) / (y0 - y1))
+
+SECTOR_BOXES = {name: conus_fraction_box(*bounds) for name, bounds in SECTOR_REGIONS.items()}
+
+def sector_pixel_box(region, width, height):
+    left, top, right, bottom = SECTOR_BOXES[region]
+    x0, y0 = max(0, math.floor(left * width)), max(0, math.floor(top * height))
+    x1, y1 = min(width, math.ceil(right * width)), min(height, math.ceil(bottom * height))
+    return x0, y0, x1 - x0, y1 - y0
+
+def fit_size(width, height, max_size):
+    scale = min(max_size[0] / width, max_size[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def crop_regions_to_shared(source_name, length, name, boxes, max_size):
+    # Runs in a pool process. PIL cannot decode part of a JPEG, so the frame
+    # is decoded here once and only the scaled crops come back, packed one
+    # after another in the caller's block.
+    source = shared_memory.SharedMemory(name=source_name)
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        img = Image.open(BytesIO(source.buf[:length]))
+        offset = 0
+        for x, y, width, height in boxes:
+            crop = img.crop((x, y, x + width, y + height))
+            crop = crop.resize(fit_size(width, height, max_size), Image.Resampling.LANCZOS).convert("RGBA")
+            data = crop.tobytes()
+            shm.buf[offset:offset + len(data)] = data
+            offset += len(data)
+    finally:
+        source.close()
+        shm.close()
+
+def crop_regions(content, regions, max_size):
+    # Returns the shared block and (region, offset, size) for each crop
+    try:
+        header = Image.open(BytesIO(content[:IMAGE_HEADER_BYTES]))
+    except Exception:
+        header = Image.open(BytesIO(content))
+    width, height = header.size
+    header.close()
+    boxes = [sector_pixel_box(region, width, height) for region in regions]
+    layout, offset = [], 0
+    for region, box in zip(regions, boxes):
+        size = fit_size(box[2], box[3], max_size)
+        layout.append((region, offset, size))
+        offset += size[0] * size[1] * 4
+    source = shared_source(content)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+    args = (source.name, len(content), shm.name, boxes, max_size)
+    try:
+        pool = image_pool()
+        try:
+            if pool is False:
+                raise BrokenProcessPool("disabled after an earlier failure")
+            pool.submit(crop_regions_to_shared, *args).result()
+        except (BrokenProcessPool, OSError) as e:
+            if pool is not False:
+                disable_image_pool(e)
+            crop_regions_to_shared(*args)
+    except Exception:
+        release_shared(shm)
+        raise
+    finally:
+        release_shared(source)
+    return shm, layout
+
+def pack_sector_photos(sectors, max_size):
+    # Tk thread only; crops from a snapshot pack are small enough to decode here
+    photos = {}
+    for region, data in sectors.items():
+        img = Image.open(BytesIO(data))
+        photos[region] = ImageTk.PhotoImage(img.resize(fit_size(*img.size, max_size), Image.Resampling.LANCZOS))
+    return photos
+
+def sector_photos(shm, layout):
+    # Tk thread only
+    photos = {}
+    for region, offset, size in layout:
+        img = Image.frombuffer("RGBA", size, shm.buf[offset:offset + size[0] * size[1] * 4], "raw", "RGBA", 0, 1)
+        photos[region] = ImageTk.PhotoImage(img)
+        del img
+    release_shared(shm)
+    return photos
+
+# PhotoImages of every region for the latest copy of each source, replaced
+# as a whole when the source changes and revalidated with its ETag otherwise
+sector_cache = {}
+sector_lock = threading.Lock()
+
+#############################
+#   Helper: Snapshot Pack   #
+#############################
+PACK_FORMAT = 1
+PACK_WORKERS = 8
+PACK_SECTOR_QUALITY = 85
+offline_pack = None
+
+def pack_urls():
+    # Both alert feeds and every HWO/AFD in the resource list
+    urls = [COLORADO_ALERTS_URL, US_ALERTS_URL]
+    for links in resources.values():
+        urls += [url for url in links.values() if re.search(r"product\.php\?.*product=(?:HWO|AFD)", url)]
+    return list(dict.fromkeys(urls))
+
+def pack_item_name(url):
+    return "items/" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+
+def read_pack_manifest(path):
+    with zipfile.ZipFile(path) as pack:
+        manifest = json.loads(pack.read("manifest.json"))
+    if manifest.get("format") != PACK_FORMAT:
+        raise ValueError(f"Unsupported snapshot pack format {manifest.get('format')!r}")
+    return manifest
+
+def pack_fetch(url, old):
+    # Conditional when the previous pack recorded validators; wire bytes are
+    # what the response actually cost, compressed or not
+    headers = {}
+    if old and old.get("etag"):
+        headers["If-None-Match"] = old["etag"]
+    if old and old.get("last_modified"):
+        headers["If-Modified-Since"] = old["last_modified"]
+    resp = fetch(url, timeout=30, headers=headers)
+    wire = resp.raw.tell() if resp.raw is not None else len(resp.content)
+    if old and (resp.status_code == 304 or hashlib.sha256(resp.content).hexdigest() == old.get("sha256")):
+        return resp, None, wire
+    return resp, resp.content, wire
+
+def prepare_pack(path, delta=False, images=True):
+    """Fetch every pack product concurrently and write a new pack to path.
+
+    With delta, products unchanged since the pack already at path are
+    revalidated rather than downloaded and copied over from it.
+    """
+    previous = read_pack_manifest(path) if delta and os.path.exists(path) else None
+    old_entries = previous["entries"] if previous else {}
+    summary = {"changed": 0, "unchanged": 0, "failed": [], "bytes": 0}
+    entries, payloads = {}, {}
+
+    def get(url):
+        try:
+            return url, pack_fetch(url, old_entries.get(url)), None
+        except Exception as e:
+            log_error(f"Snapshot pack fetch error: {e}", url=url, exc=e)
+            return url, None, e
+
+    urls = pack_urls() + ([SECTOR_SOURCES["GeoColor"]] if images else [])
+    with ThreadPoolExecutor(PACK_WORKERS) as pool:
+        results = list(pool.map(get, urls))
+    for url, result, error in results:
+        old = old_entries.get(url)
+        if error is not None:
+            # Keep the older copy rather than dropping the product
+            summary["failed"].append(url)
+            if old:
+                entries[url] = dict(old, stale=True)
+            continue
+        resp, content, wire = result
+        summary["bytes"] += wire
+        if content is None:
+            summary["unchanged"] += 1
+            entries[url] = dict(old, checked=datetime.now(timezone.utc).isoformat(timespec="seconds"))
+            continue
+        summary["changed"] += 1
+        entry = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+                 "content_type": resp.headers.get("Content-Type", ""), "sha256": hashlib.sha256(content).hexdigest(),
+                 "size": len(content), "fetched": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+        if url in SECTOR_SOURCES.values():
+            # The frame itself is not kept, only the small derived crops
+            with Image.open(BytesIO(content)) as frame:
+                frame = frame.convert("RGB")
+                entry["sectors"] = {}
+                for region in SECTOR_REGIONS:
+                    x, y, width, height = sector_pixel_box(region, *frame.size)
+                    out = BytesIO()
+                    frame.crop((x, y, x + width, y + height)).save(out, "JPEG", quality=PACK_SECTOR_QUALITY)
+                    name = f"sectors/{re.sub(r'[^A-Za-z0-9]+', '_', region).strip('_')}.jpg"
+                    entry["sectors"][region] = name
+                    payloads[name] = out.getvalue()
+        else:
+            entry["path"] = pack_item_name(url)
+            payloads[entry["path"]] = content
+        entries[url] = entry
+    if not images:
+        entries.update({url: entry for url, entry in old_entries.items() if url in SECTOR_SOURCES.values()})
+
+    manifest = {"format": PACK_FORMAT, "version": (previous["version"] + 1) if previous else 1,
+                "based_on": previous["version"] if previous else None,
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "app": APP_TITLE, "app_version": APP_VERSION, "entries": entries}
+    # Written beside the target and renamed over it, so a failed refresh
+    # never leaves a half-written pack
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as pack:
+            pack.writestr("manifest.json", json.dumps(manifest, indent=2))
+            old_pack = zipfile.ZipFile(path) if previous else None
+            try:
+                for entry in entries.values():
+                    for name in [entry.get("path")] + list(entry.get("sectors", {}).values()):
+                        if not name:
+                            continue
+                        if name in payloads:
+                            # JPEG crops are already compressed
+                            compress = zipfile.ZIP_STORED if name.endswith(".jpg") else zipfile.ZIP_DEFLATED
+                            pack.writestr(name, payloads[name], compress_type=compress)
+                        elif old_pack is not None:
+                            pack.writestr(old_pack.getinfo(name), old_pack.read(name))
+            finally:
+                if old_pack is not None:
+                    old_pack.close()
+        os.replace(tmp, path)
+    except Exception:
+        os.remove(tmp)
+        raise
+    summary.update(version=manifest["version"], entries=len(entries))
+    return summary
+
+class SnapshotPack:
+    """A prepared snapshot opened read-only in place of the network."""
+    def __init__(self, path):
+        self.path = path
+        self.manifest = read_pack_manifest(path)
+        self.zip = zipfile.ZipFile(path)
+
+    def response(self, url):
+        entry = self.manifest["entries"].get(url)
+        if entry is None or "path" not in entry:
+            raise requests.ConnectionError(f"Not in the offline snapshot pack: {url}")
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.reason = "OK"
+        resp.url = url
+        resp._content = self.zip.read(entry["path"])
+        for header, key in (("Content-Type", "content_type"), ("ETag", "etag"), ("Last-Modified", "last_modified")):
+            if entry.get(key):
+                resp.headers[header] = entry[key]
+        return resp
+
+    def sectors(self):
+        for entry in self.manifest["entries"].values():
+            if "sectors" in entry:
+                return {region: self.zip.read(name) for region, name in entry["sectors"].items()}
+        return {}
+
+    def close(self):
+        self.zip.close()
+
+def open_offline_pack(path):
+    global offline_pack
+    pack = SnapshotPack(path) if path else None
+    if offline_pack is not None:
+        offline_pack.close()
+    offline_pack = pack
+    return pack
+
+def pack_summary_text(summary):
+    text = (f"Snapshot pack v{summary['version']}: {summary['entries']} products, {summary['changed']} changed, "
+            f"{summary['unchanged']} unchanged, {summary['bytes'] / 1024:.0f} KiB downloaded")
+    if summary["failed"]:
+        text += f", {len(summary['failed'])} failed"
+    return text
+
+def configure_pack(argv):
+    # --prepare-pack runs headless and exits; --open-pack (or CSWN_PACK)
+    # starts the app offline. Returns argv without these flags.
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--prepare-pack")
+    parser.add_argument("--delta", action="store_true")
+    parser.add_argument("--no-images", action="store_true")
+    parser.add_argument("--open-pack", default=os.environ.get("CSWN_PACK", ""))
+    args, rest = parser.parse_known_args(argv[1:])
+    if args.prepare_pack:
+        summary = prepare_pack(args.prepare_pack, delta=args.delta, images=not args.no_images)
+        print(pack_summary_text(summary))
+        for url in summary["failed"]:
+            print(f"  failed: {url}")
+        sys.exit(1 if summary["failed"] else 0)
+    if args.open_pack:
+        open_offline_pack(os.path.expanduser(args.open_pack))
+    return argv[:1] + rest
+
+#############################
+#   Helper: Link Health     #
+#############################
+LINK_HEALTH_FILE = os.path.expanduser("~/.weather_toolkit_links.json")
+LINK_CHECK_TTL = 6 * 3600
+LINK_CHECK_WORKERS = 8
+LINK_CHECK_TIMEOUT = 10
+LINK_SLOW_MS = 2000
+# Only statuses that mean the page is gone; 403/429/5xx may be bot
+# blocking or a bad minute, so those links stay usable
+LINK_DEAD_STATUSES = (404, 410)
+link_health = {}
+link_health_lock = threading.Lock()
+
+def resource_links():
+    # url -> name, one entry per distinct url in the catalog
+    links = {}
+    for items in resources.values():
+        for name, url in items.items():
+            links.setdefault(url, name)
+    return links
+
+def check_link(url):
+    # HEAD first; plenty of servers refuse or mishandle it, so anything but
+    # a success is retried as a GET whose body is never read. The real URL
+    # is checked even under CSWN_BASE_URL: these are the links the browser
+    # opens, and a stand-in server's answers must not reach the shared cache
+    result = {"url": url, "checked": time.time(), "method": "HEAD", "status": None,
+              "redirects": [], "final_url": url, "latency_ms": None, "error": None}
+    session = http_session()
+    try:
+        start = time.perf_counter()
+        resp = session.head(url, timeout=LINK_CHECK_TIMEOUT, allow_redirects=True,
+                            headers=request_headers())
+        if resp.status_code >= 400:
+            start = time.perf_counter()
+            resp = session.get(url, timeout=LINK_CHECK_TIMEOUT, stream=True,
+                               headers=request_headers())
+            resp.close()
+            result["method"] = "GET"
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        result["status"] = resp.status_code
+        result["redirects"] = [[r.status_code, r.headers.get("Location", "")] for r in resp.history]
+        result["final_url"] = resp.url
+    except requests.RequestException as e:
+        result["error"] = f"{e.__class__.__name__}: {e}"[:160]
+    return result
 
-    def hidetip(self, event=None):
-        if self.tipwindow:
-            self.tipwindow.destroy()
-            self.tipwindow = None
+def link_state(result):
+    if result is None:
+        return "unknown"
+    if result["status"] is None:
+        # Refused or unresolvable means the host is gone; a timeout may just be a bad minute
+        return "dead" if result["error"].startswith("ConnectionError") else "error"
+    if result["status"] in LINK_DEAD_STATUSES:
+        return "dead"
+    if result["status"] >= 400:
+        return "error"
+    return "slow" if result["latency_ms"] > LINK_SLOW_MS else "ok"
 
-    def movetip(self, event):
-        if self.tipwindow:
-            x = event.x_root + 10
-            y = event.y_root + 10
-            self.tipwindow.wm_geometry(f"+{x}+{y}")
+def link_hint(result):
+    # Short text for tooltips and labels
+    state = link_state(result)
+    if state == "unknown":
+        return "not checked yet"
+    checked = datetime.fromtimestamp(result["checked"]).strftime("%b %d %H:%M")
+    if result["status"] is None:
+        return f"{state}: {result['error']} (checked {checked})"
+    hops = f", {len(result['redirects'])} redirect(s)" if result["redirects"] else ""
+    return f"{state}: HTTP {result['status']} in {result['latency_ms']:.0f} ms{hops} (checked {checked})"
+
+def load_link_health():
+    try:
+        with open(LINK_HEALTH_FILE, "r", encoding="utf-8") as f:
+            results = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError) as e:
+        log_error(f"Error loading link health: {e}", exc=e)
+        return
+    with link_health_lock:
+        link_health.update(results)
+
+def save_link_health():
+    with link_health_lock:
+        results = dict(link_health)
+    directory = os.path.dirname(LINK_HEALTH_FILE) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".weather_toolkit_links.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        os.replace(tmp_path, LINK_HEALTH_FILE)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def stale_links(urls, ttl=LINK_CHECK_TTL):
+    now = time.time()
+    with link_health_lock:
+        return [url for url in urls if url not in link_health or now - link_health[url]["checked"] > ttl]
+
+def check_links(urls, force=False):
+    # Checks every url whose cached result is older than the TTL, in
+    # parallel; each worker thread keeps its own keep-alive session
+    if offline_pack is not None:
+        raise RuntimeError("Link checks need the network; go online first")
+    urls = list(urls) if force else stale_links(urls)
+    if urls:
+        with ThreadPoolExecutor(LINK_CHECK_WORKERS, thread_name_prefix="link-check") as pool:
+            results = list(pool.map(check_link, urls))
+        if len(results) > 1 and all(result["status"] is None for result in results):
+            # Nothing answered: our connection is down, not every site at once
+            raise requests.ConnectionError(f"None of {len(results)} links answered; is the network down?")
+        with link_health_lock:
+            for result in results:
+                link_health[result["url"]] = result
+        save_link_health()
+    with link_health_lock:
+        return dict(link_health)
+
+def configure_link_check(argv):
+    # --check-links is for cron/Task Scheduler: check everything now,
+    # refresh the shared cache, print a report and exit 1 if any are dead
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--check-links", action="store_true")
+    args, rest = parser.parse_known_args(argv[1:])
+    if args.check_links:
+        links = resource_links()
+        results = check_links(links, force=True)
+        dead = 0
+        for url, name in links.items():
+            result = results[url]
+            dead += link_state(result) == "dead"
+            print(f"{link_state(result):7s} {result['status'] or '---'!s:>4} "
+                  f"{result['latency_ms'] or 0:7.0f} ms  {name}: {url}")
+            for status, location in result["redirects"]:
+                print(f"{'':22s}{status} -> {location}")
+            if result["error"]:
+                print(f"{'':22s}{result['error']}")
+        print(f"{len(links)} links checked, {dead} dead")
+        sys.exit(1 if dead else 0)
+    load_link_health()
+    return argv[:1] + rest
+
+#############################
+#   Helper: Event Stream    #
+#############################
+SPC_MD_RSS_URL = "https://www.spc.noaa.gov/products/spcmdrss.xml"
+LSR_GEOJSON_URL = "https://mesonet.agron.iastate.edu/geojson/lsr.php"
+LSR_PAGE_URL = "https://mesonet.agron.iastate.edu/lsr/#CO"
+LSR_WFOS = ("BOU", "PUB", "GJT", "GLD", "CYS")
+LSR_HOURS = 24
+EVENT_STREAM_LIMIT = 500
+EVENT_REFRESH_MS = 2 * 60 * 1000
+MD_AREAS = re.compile(r"Areas affected\.\.\.\s*(.+?)\s*(?:Concerning\.\.\.\s*(.+?)\s*)?(?:Valid|\n\s*\n)",
+                      re.IGNORECASE | re.DOTALL)
+
+def utc_epoch(value):
+    # Like iso_epoch, but a timestamp without an offset is UTC, not local
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def event_key(event):
+    # Sort key for the merged stream: time first, then a stable tie-break
+    return (event["time"], event["source"], event["id"])
+
+def alert_events(content):
+    events = []
+    for alert in parse_alert_feed(content):
+        stamp = iso_epoch(alert["updated"]) or alert["onset"]
+        if stamp is None:
+            continue
+        events.append({"time": stamp, "source": "Alert", "id": alert["id"],
+                       "title": alert["event"] or alert["title"], "detail": alert["area"],
+                       "link": alert["link"]})
+    return events
+
+def md_events(content):
+    # The RSS feed is national; keep the discussions whose polygon reaches Colorado
+    events = []
+    for item in ET.fromstring(content).iter("item"):
+        text = html.unescape(re.sub(r"<[^>]+>", " ", item.findtext("description") or ""))
+        match = MD_AREAS.search(text)
+        areas = " ".join(match.group(1).split()) if match else ""
+        polygon = md_polygon(text)
+        if polygon:
+            if "Colorado" not in region_index.hits(polygon):
+                continue
+        elif "colorado" not in (areas or text).lower():
+            continue
+        try:
+            stamp = parsedate_to_datetime(item.findtext("pubDate") or "").timestamp()
+        except (TypeError, ValueError):
+            continue
+        concerning = " ".join(match.group(2).split()) if match and match.group(2) else ""
+        link = (item.findtext("link") or "").strip()
+        events.append({"time": stamp, "source": "SPC MD", "id": (item.findtext("guid") or link).strip(),
+                       "title": (item.findtext("title") or "").strip(),
+                       "detail": f"{areas} - {concerning}" if concerning else areas, "link": link})
+    return events
+
+def lsr_url(hours=LSR_HOURS):
+    # The window ends on the next hour, so polls within an hour repeat the
+    # same URL and can be answered conditionally
+    end = (int(time.time()) // 3600 + 1) * 3600
+    fmt = "%Y%m%d%H%M"
+    return (f"{LSR_GEOJSON_URL}?wfos={','.join(LSR_WFOS)}"
+            f"&sts={time.strftime(fmt, time.gmtime(end - hours * 3600))}&ets={time.strftime(fmt, time.gmtime(end))}")
+
+def lsr_events(content):
+    events = []
+    for feature in json.loads(content).get("features", []):
+        props = feature.get("properties") or {}
+        if props.get("state", "CO") != "CO":
+            continue
+        stamp = utc_epoch(str(props.get("valid", "")))
+        if stamp is None:
+            continue
+        lon, lat = (feature.get("geometry") or {}).get("coordinates", (None, None))[:2]
+        magnitude = f" {props['magnitude']} {props.get('unit') or ''}".rstrip() if props.get("magnitude") else ""
+        where = ", ".join(part for part in (props.get("city"), props.get("county") and f"{props['county']} Co.") if part)
+        remark = f" {props['remark']}" if props.get("remark") else ""
+        events.append({"time": stamp, "source": "Report",
+                       "id": f"{props.get('valid')}|{props.get('typetext')}|{lat}|{lon}",
+                       "title": f"{props.get('typetext', 'Report')}{magnitude}",
+                       "detail": f"{where} ({props.get('source', '')}){remark}", "link": LSR_PAGE_URL})
+    return events
+
+EVENT_SOURCES = {
+    "Alert": (lambda: COLORADO_ALERTS_URL, alert_events),
+    "SPC MD": (lambda: SPC_MD_RSS_URL, md_events),
+    "Report": (lsr_url, lsr_events),
+}
+
+class EventStream:
+    """Alerts, SPC MDs and storm reports merged into one time-ordered stream.
+
+    Each refresh fetches the sources conditionally and in parallel, keeps
+    only items that are new or changed (by source and id), sorts those per
+    source and k-way merges them into the existing order. At most capacity
+    events are kept; the oldest go first."""
+    def __init__(self, capacity=EVENT_STREAM_LIMIT):
+        self.capacity = capacity
+        self.keys = []
+        self.events = {}
+        self.validators = {}
+        self.lock = threading.Lock()
+
+    def fetch_source(self, name):
+        # Returns the source's events, or [] when it has not changed
+        make_url, parse = EVENT_SOURCES[name]
+        url = make_url()
+        headers = {}
+        url_seen, etag, last_modified = self.validators.get(name, (None, None, None))
+        if url_seen == url:
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        span = FetchSpan(url, "Event stream")
+        span.lap("queue")
+        try:
+            resp = fetch(url, timeout=15, span=span, headers=headers)
+            record_cache("event_stream", resp.status_code == 304)
+            events = [] if resp.status_code == 304 else parse(resp.content)
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        # Validators only once the body parsed, so a bad response is retried in full
+        self.validators[name] = (url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return events
+
+    def merge(self, batches):
+        # Returns the keys added and dropped so a view can patch itself
+        # rather than redraw; a key can be in both when an item changed
+        incoming = {}
+        for batch in batches:
+            for event in batch:
+                incoming[(event["source"], event["id"])] = event
+        added, dropped = [], []
+        with self.lock:
+            fresh = {}
+            for ident, event in incoming.items():
+                old = self.events.get(ident)
+                if old == event:
+                    continue
+                if old is not None:
+                    del self.keys[bisect.bisect_left(self.keys, event_key(old))]
+                    dropped.append(event_key(old))
+                self.events[ident] = event
+                fresh.setdefault(event["source"], []).append(event_key(event))
+            runs = [sorted(keys) for keys in fresh.values()]
+            self.keys = list(heapq.merge(self.keys, *runs))
+            excess = len(self.keys) - self.capacity
+            if excess > 0:
+                for key in self.keys[:excess]:
+                    del self.events[(key[1], key[2])]
+                    dropped.append(key)
+                del self.keys[:excess]
+            for run in runs:
+                added.extend(key for key in run if (key[1], key[2]) in self.events)
+        return added, dropped
+
+    def refresh(self):
+        # One failing source does not hold up the others; returns
+        # (added, dropped, {source: error})
+        batches, errors = [], {}
+        with ThreadPoolExecutor(len(EVENT_SOURCES), thread_name_prefix="event-stream") as pool:
+            futures = {pool.submit(self.fetch_source, name): name for name in EVENT_SOURCES}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    batches.append(future.result())
+                except Exception as e:
+                    log_error(f"Event stream error ({name}): {e}", exc=e)
+                    errors[name] = str(e)
+        added, dropped = self.merge(batches)
+        return added, dropped, errors
+
+    def get(self, key):
+        with self.lock:
+            return self.events.get((key[1], key[2]))
+
+    def snapshot(self):
+        with self.lock:
+            return [self.events[(key[1], key[2])] for key in self.keys]
+
+event_stream = EventStream()
+
+def event_line(event):
+    stamp = datetime.fromtimestamp(event["time"]).strftime("%b %d %H:%M")
+    return f"{stamp}  {event['source']:7}  {event['title']}: {event['detail']}"
+
+#############################
+#   Helper: SPC MDs         #
+#############################
+SPC_MD_INDEX_URL = "https://www.spc.noaa.gov/products/md/"
+MD_CACHE_FILE = os.path.expanduser("~/.weather_toolkit_mds.json")
+MD_FETCH_WORKERS = 4
+MD_REFRESH_MS = 5 * 60 * 1000
+MD_LINK = re.compile(r"""href=["']?([^"'>]*?\bmd(\d{4})\.html)""", re.IGNORECASE)
+MD_LATLON = re.compile(r"LAT\.\.\.LON\s+((?:\d{8}\s+)*\d{8})")
+MD_ISSUED = re.compile(r"^\s*(\d{3,4}) ([AP]M) ([A-Z]{3}) [A-Z]{3} ([A-Z]{3}) +(\d{1,2}) (\d{4})\s*$",
+                       re.MULTILINE | re.IGNORECASE)
+MD_VALID = re.compile(r"Valid\s+(\d{6}Z\s*-\s*\d{6}Z)", re.IGNORECASE)
+MD_ATTN = re.compile(r"ATTN\.\.\.WFO\.\.\.([A-Z.]+)")
+US_ZONE_OFFSETS = {"EST": -5, "EDT": -4, "CST": -6, "CDT": -5, "MST": -7, "MDT": -6, "PST": -8, "PDT": -7}
+
+# Colorado's border is four survey lines, so its corners are the whole polygon
+COLORADO_BOUNDARY = [(41.0, -109.05), (41.0, -102.05), (37.0, -102.04), (37.0, -109.05)]
+
+def polygon_bbox(polygon):
+    lats = [lat for lat, _ in polygon]
+    lons = [lon for _, lon in polygon]
+    return (min(lats), min(lons), max(lats), max(lons))
+
+def point_in_polygon(lat, lon, polygon):
+    # Even-odd ray cast along the latitude line
+    inside = False
+    j = len(polygon) - 1
+    for i, (lat_i, lon_i) in enumerate(polygon):
+        lat_j, lon_j = polygon[j]
+        if (lat_i > lat) != (lat_j > lat) and lon < lon_i + (lat - lat_i) * (lon_j - lon_i) / (lat_j - lat_i):
+            inside = not inside
+        j = i
+    return inside
+
+def segments_cross(a, b, c, d):
+    def turn(p, q, r):
+        return (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+    return (turn(a, b, c) > 0) != (turn(a, b, d) > 0) and (turn(c, d, a) > 0) != (turn(c, d, b) > 0)
+
+def polygons_intersect(first, second):
+    # Overlap means a corner of one inside the other or two crossing edges
+    if any(point_in_polygon(lat, lon, second) for lat, lon in first):
+        return True
+    if any(point_in_polygon(lat, lon, first) for lat, lon in second):
+        return True
+    edges = list(zip(second, second[1:] + second[:1]))
+    return any(segments_cross(a, b, c, d) for a, b in zip(first, first[1:] + first[:1]) for c, d in edges)
+
+class RegionIndex:
+    """Named polygons with their bounding boxes computed up front, so most
+    queries are settled by a box comparison and never reach the edge tests."""
+    def __init__(self, regions):
+        self.regions = [(name, polygon, polygon_bbox(polygon)) for name, polygon in regions.items()]
+
+    def hits(self, polygon):
+        if len(polygon) < 3:
+            return []
+        south, west, north, east = polygon_bbox(polygon)
+        names = []
+        for name, region, (r_south, r_west, r_north, r_east) in self.regions:
+            if south > r_north or north < r_south or west > r_east or east < r_west:
+                continue
+            if polygons_intersect(polygon, region):
+                names.append(name)
+        return names
+
+region_index = RegionIndex({"Colorado": COLORADO_BOUNDARY})
+
+def md_polygon(text):
+    # LAT...LON pairs are 8 digits, LLLLOOOO in hundredths of a degree west;
+    # longitudes of 100 and more drop their leading 1
+    match = MD_LATLON.search(text)
+    if not match:
+        return []
+    points = []
+    for group in match.group(1).split():
+        lat, lon = int(group[:4]) / 100, int(group[4:]) / 100
+        if lon < 50:
+            lon += 100
+        points.append((lat, -lon))
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+def md_issued(text):
+    match = MD_ISSUED.search(text)
+    if not match:
+        return None
+    clock, meridiem, zone, month, day, year = match.groups()
+    try:
+        local = datetime.strptime(f"{clock.zfill(4)} {meridiem} {month} {day} {year}", "%I%M %p %b %d %Y")
+    except ValueError:
+        return None
+    offset = US_ZONE_OFFSETS.get(zone.upper(), 0)
+    return local.replace(tzinfo=timezone.utc).timestamp() - offset * 3600
+
+def parse_md(url, number, text):
+    areas = MD_AREAS.search(text)
+    valid = MD_VALID.search(text)
+    attn = MD_ATTN.search(text)
+    polygon = md_polygon(text)
+    return {
+        "url": url,
+        "number": number,
+        "issued": md_issued(text) or time.time(),
+        "areas": " ".join(areas.group(1).split()) if areas else "",
+        "concerning": " ".join(areas.group(2).split()) if areas and areas.group(2) else "",
+        "valid": valid.group(1) if valid else "",
+        "offices": [office for office in attn.group(1).split("...") if office] if attn else [],
+        "polygon": polygon,
+        "regions": region_index.hits(polygon),
+        "text": text,
+    }
+
+def md_in_colorado(md):
+    # An MD without a polygon falls back to what its area line says
+    if md["polygon"]:
+        return "Colorado" in md["regions"]
+    return "colorado" in md["areas"].lower()
+
+def md_summary(md):
+    stamp = datetime.fromtimestamp(md["issued"]).strftime("%b %d %H:%M")
+    return f"MD {md['number']}  {stamp}  {md['areas'] or md['concerning']}"
+
+class MdCache:
+    """SPC mesoscale discussions, parsed once and kept on disk.
+
+    A refresh re-reads the index (conditionally) and fetches only the
+    discussions it has not seen, in parallel. Discussions outside Colorado
+    are remembered without their text so they are not fetched again;
+    anything that has left the index is dropped."""
+    def __init__(self, path=MD_CACHE_FILE):
+        self.path = path
+        self.mds = {}
+        self.validators = {}
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            log_error(f"Error loading MD cache: {e}", exc=e)
+            return
+        with self.lock:
+            self.mds = {md["url"]: md for md in data.get("mds", [])}
+            self.validators = data.get("validators", {})
+
+    def save(self):
+        with self.lock:
+            data = {"validators": self.validators, "mds": list(self.mds.values())}
+        directory = os.path.dirname(self.path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".weather_toolkit_mds.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            log_error(f"Error saving MD cache: {e}", exc=e)
+
+    def fetch_index(self):
+        # Returns the index's MD links in page order, or None when it has not changed
+        headers = {}
+        if self.validators.get("etag"):
+            headers["If-None-Match"] = self.validators["etag"]
+        if self.validators.get("last_modified"):
+            headers["If-Modified-Since"] = self.validators["last_modified"]
+        span = FetchSpan(SPC_MD_INDEX_URL, "SPC MD index")
+        span.lap("queue")
+        try:
+            resp = fetch(SPC_MD_INDEX_URL, timeout=15, span=span, headers=headers)
+            record_cache("spc_md_index", resp.status_code == 304)
+            links = None
+            if resp.status_code != 304:
+                links = {}
+                for href, number in MD_LINK.findall(resp.text):
+                    links.setdefault(urljoin(SPC_MD_INDEX_URL, href), number)
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        self.validators = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+        return links
+
+    def fetch_md(self, url, number):
+        span = FetchSpan(url, "SPC MD")
+        span.lap("queue")
+        try:
+            resp = fetch(url, timeout=15, span=span)
+            text = extract_pre_text(resp.content)
+            if text is None:
+                raise ValueError(f"MD {number} has no product text")
+            md = parse_md(url, number, text)
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        if not md_in_colorado(md):
+            md["text"] = ""
+        return md
+
+    def refresh(self):
+        # Returns (new Colorado MDs, {url: error}); raises if the index fails
+        self.load()
+        links = self.fetch_index()
+        if links is None:
+            return [], {}
+        with self.lock:
+            wanted = [(url, number) for url, number in links.items() if url not in self.mds]
+        fetched, errors = [], {}
+        if wanted:
+            with ThreadPoolExecutor(min(MD_FETCH_WORKERS, len(wanted)), thread_name_prefix="spc-md") as pool:
+                futures = {pool.submit(self.fetch_md, url, number): url for url, number in wanted}
+                for future in as_completed(futures):
+                    url = futures[future]
+                    try:
+                        fetched.append(future.result())
+                    except Exception as e:
+                        log_error(f"SPC MD fetch error: {e}", url=url, exc=e)
+                        errors[url] = str(e)
+        with self.lock:
+            for md in fetched:
+                self.mds[md["url"]] = md
+            for url in [url for url in self.mds if url not in links]:
+                del self.mds[url]
+        if errors:
+            # A failed MD is retried in full next time
+            self.validators = {}
+        self.save()
+        return [md for md in fetched if md_in_colorado(md)], errors
+
+    def colorado(self):
+        # Newest first
+        self.load()
+        with self.lock:
+            mds = [md for md in self.mds.values() if md_in_colorado(md)]
+        return sorted(mds, key=lambda md: md["issued"], reverse=True)
+
+md_cache = MdCache()
+
+#############################
+#   Helper: SPC Outlooks    #
+#############################
+SPC_OUTLOOK_URL = "https://www.spc.noaa.gov/products/outlook/"
+OUTLOOK_GEOJSON_URL = "https://www.spc.noaa.gov/products/outlook/day{day}otlk_{kind}.lyr.geojson"
+# (day, layer, column); Days 2 and 3 carry one combined severe probability
+OUTLOOK_LAYERS = (
+    (1, "cat", "Day 1"), (1, "torn", "D1 Tornado"), (1, "wind", "D1 Wind"), (1, "hail", "D1 Hail"),
+    (2, "cat", "Day 2"), (2, "prob", "D2 Severe"),
+    (3, "cat", "Day 3"), (3, "prob", "D3 Severe"),
+)
+# Hatched significant-severe areas come as separate layers; each is shown
+# as a SIG flag on the probability layer it qualifies
+OUTLOOK_SIG_LAYERS = {(1, "torn"): "sigtorn", (1, "wind"): "sigwind", (1, "hail"): "sighail",
+                      (2, "prob"): "sigprob", (3, "prob"): "sigprob"}
+OUTLOOK_REFRESH_MS = 10 * 60 * 1000
+OUTLOOK_ISSUE = re.compile(rb'"ISSUE"\s*:\s*"?(\d{12})')
+CATEGORICAL_RANKS = {"TSTM": 1, "MRGL": 2, "SLGT": 3, "ENH": 4, "MDT": 5, "HIGH": 6}
+
+# Approximate centroids of Colorado's 64 counties, (lat, lon)
+COLORADO_COUNTIES = {
+    "Adams": (39.87, -104.33), "Alamosa": (37.57, -105.79), "Arapahoe": (39.65, -104.33),
+    "Archuleta": (37.20, -107.05), "Baca": (37.32, -102.56), "Bent": (37.96, -103.07),
+    "Boulder": (40.09, -105.36), "Broomfield": (39.95, -105.05), "Chaffee": (38.75, -106.19),
+    "Cheyenne": (38.83, -102.60), "Clear Creek": (39.69, -105.64), "Conejos": (37.21, -106.19),
+    "Costilla": (37.28, -105.43), "Crowley": (38.32, -103.78), "Custer": (38.10, -105.37),
+    "Delta": (38.86, -107.86), "Denver": (39.76, -104.88), "Dolores": (37.75, -108.52),
+    "Douglas": (39.33, -104.93), "Eagle": (39.63, -106.69), "El Paso": (38.83, -104.53),
+    "Elbert": (39.29, -104.14), "Fremont": (38.47, -105.44), "Garfield": (39.60, -107.90),
+    "Gilpin": (39.86, -105.53), "Grand": (40.10, -106.12), "Gunnison": (38.67, -107.03),
+    "Hinsdale": (37.81, -107.38), "Huerfano": (37.69, -104.96), "Jackson": (40.66, -106.34),
+    "Jefferson": (39.59, -105.25), "Kiowa": (38.43, -102.76), "Kit Carson": (39.31, -102.60),
+    "La Plata": (37.29, -107.84), "Lake": (39.20, -106.35), "Larimer": (40.66, -105.46),
+    "Las Animas": (37.32, -104.04), "Lincoln": (38.99, -103.51), "Logan": (40.73, -103.11),
+    "Mesa": (39.02, -108.46), "Mineral": (37.67, -106.92), "Moffat": (40.62, -108.21),
+    "Montezuma": (37.34, -108.60), "Montrose": (38.40, -108.26), "Morgan": (40.26, -103.81),
+    "Otero": (37.90, -103.72), "Ouray": (38.16, -107.77), "Park": (39.12, -105.72),
+    "Phillips": (40.59, -102.35), "Pitkin": (39.22, -106.92), "Prowers": (37.96, -102.39),
+    "Pueblo": (38.17, -104.51), "Rio Blanco": (39.97, -108.20), "Rio Grande": (37.58, -106.38),
+    "Routt": (40.48, -106.99), "Saguache": (38.08, -106.28), "San Juan": (37.78, -107.67),
+    "San Miguel": (38.00, -108.40), "Sedgwick": (40.88, -102.35), "Summit": (39.62, -106.12),
+    "Teller": (38.87, -105.18), "Washington": (39.97, -103.21), "Weld": (40.55, -104.39),
+    "Yuma": (40.00, -102.42),
+}
+# Centroids sorted by latitude, so a polygon only tests the counties in its band
+COUNTY_POINTS = sorted((lat, lon, name) for name, (lat, lon) in COLORADO_COUNTIES.items())
+COUNTY_LATS = [lat for lat, _, _ in COUNTY_POINTS]
+
+def outlook_rank(label):
+    # Categorical labels rank by severity, probabilities by their percent
+    if label in CATEGORICAL_RANKS:
+        return CATEGORICAL_RANKS[label]
+    try:
+        return float(label) * 100
+    except ValueError:
+        return None
+
+def outlook_label(label):
+    return label if label in CATEGORICAL_RANKS else f"{outlook_rank(label):.0f}%"
+
+def geojson_polygons(geometry):
+    # Rings as (lat, lon) lists: [(outer, [holes...]), ...]
+    if not geometry:
+        return []
+    coords = geometry.get("coordinates") or []
+    if geometry.get("type") == "Polygon":
+        coords = [coords]
+    elif geometry.get("type") != "MultiPolygon":
+        return []
+    polygons = []
+    for rings in coords:
+        rings = [[(lat, lon) for lon, lat in ring[:-1]] for ring in rings if len(ring) > 3]
+        if rings:
+            polygons.append((rings[0], rings[1:]))
+    return polygons
+
+def counties_in(outer, holes):
+    south, west, north, east = polygon_bbox(outer)
+    hits = []
+    for lat, lon, name in COUNTY_POINTS[bisect.bisect_left(COUNTY_LATS, south):bisect.bisect_right(COUNTY_LATS, north)]:
+        if west <= lon <= east and point_in_polygon(lat, lon, outer) \
+                and not any(point_in_polygon(lat, lon, hole) for hole in holes):
+            hits.append(name)
+    return hits
+
+def index_outlook(data):
+    # {county: (rank, label, fill)} for the highest risk over each centroid,
+    # plus the counties inside a significant-severe (hatched) area
+    risks, significant = {}, set()
+    for feature in data.get("features", []):
+        props = feature.get("properties") or {}
+        label = str(props.get("LABEL", ""))
+        rank = None if label == "SIGN" else outlook_rank(label)
+        if label != "SIGN" and rank is None:
+            continue
+        for outer, holes in geojson_polygons(feature.get("geometry")):
+            for name in counties_in(outer, holes):
+                if label == "SIGN":
+                    significant.add(name)
+                elif name not in risks or rank > risks[name][0]:
+                    risks[name] = (rank, outlook_label(label), props.get("fill") or "")
+    return risks, significant
+
+def outlook_issue(data):
+    for feature in data.get("features", []):
+        props = feature.get("properties") or {}
+        if props.get("ISSUE"):
+            return str(props["ISSUE"]), str(props.get("VALID", "")), str(props.get("EXPIRE", ""))
+    return None
+
+def outlook_time(stamp):
+    # SPC stamps are UTC YYYYmmddHHMM
+    try:
+        parsed = datetime.strptime(stamp, "%Y%m%d%H%M").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return stamp
+    return parsed.astimezone().strftime("%b %d %H:%M")
+
+class CountyOutlooks:
+    """SPC Day 1-3 outlook layers resolved to Colorado counties.
+
+    Every layer is fetched conditionally on refresh, but the point-in-
+    polygon pass over the county centroids only runs when a layer's
+    issuance time changes; otherwise the previous index is kept."""
+    def __init__(self):
+        self.layers = {}
+        self.validators = {}
+        self.lock = threading.Lock()
+
+    def fetch_layer(self, day, kind):
+        # Returns True when the layer was re-indexed
+        url = OUTLOOK_GEOJSON_URL.format(day=day, kind=kind)
+        headers = {}
+        etag, last_modified = self.validators.get(url, (None, None))
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        span = FetchSpan(url, "SPC outlook")
+        span.lap("queue")
+        try:
+            resp = fetch(url, timeout=15, span=span, headers=headers)
+            changed = False
+            if resp.status_code != 304:
+                # The issuance is read off the raw bytes first, so a re-sent
+                # but unchanged layer is neither parsed nor re-indexed
+                peek = OUTLOOK_ISSUE.search(resp.content)
+                with self.lock:
+                    current = self.layers.get((day, kind))
+                unchanged = current is not None and peek is not None and current["issue"] == peek.group(1).decode()
+                record_cache("outlook_index", unchanged)
+                if not unchanged:
+                    data = json.loads(resp.content)
+                    issue, valid, expire = outlook_issue(data) or ("", "", "")
+                    risks, significant = index_outlook(data)
+                    with self.lock:
+                        self.layers[(day, kind)] = {"issue": issue, "valid": valid, "expire": expire,
+                                                    "risks": risks, "significant": significant}
+                    changed = True
+        except Exception as e:
+            span.finish(e)
+            raise
+        span.lap("parse")
+        span.finish()
+        self.validators[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return changed
+
+    def refresh(self):
+        # Returns (layers re-indexed, {column: error}); a changed hatched
+        # layer is reported as the probability layer it belongs to
+        jobs = [(day, kind, column, (day, kind)) for day, kind, column in OUTLOOK_LAYERS]
+        jobs += [(day, OUTLOOK_SIG_LAYERS[(day, kind)], f"{column} hatched", (day, kind))
+                 for day, kind, column in OUTLOOK_LAYERS if (day, kind) in OUTLOOK_SIG_LAYERS]
+        changed, errors = [], {}
+        with ThreadPoolExecutor(len(jobs), thread_name_prefix="spc-outlook") as pool:
+            futures = {pool.submit(self.fetch_layer, day, kind): (column, target)
+                       for day, kind, column, target in jobs}
+            for future in as_completed(futures):
+                column, target = futures[future]
+                try:
+                    if future.result() and target not in changed:
+                        changed.append(target)
+                except Exception as e:
+                    log_error(f"SPC outlook error ({column}): {e}", exc=e)
+                    errors[column] = str(e)
+        return changed, errors
+
+    def cell(self, day, kind, county):
+        # (text, fill) for one county in one layer; text is "" when unindexed
+        with self.lock:
+            layer = self.layers.get((day, kind))
+            hatched = self.layers.get((day, OUTLOOK_SIG_LAYERS.get((day, kind))))
+        if layer is None:
+            return "", ""
+        rank, label, fill = layer["risks"].get(county, (0, "-", ""))
+        if county in layer["significant"] or (hatched is not None and county in hatched["significant"]):
+            label += " SIG"
+        return label, fill
+
+    def issued(self, day, kind):
+        with self.lock:
+            layer = self.layers.get((day, kind))
+        return outlook_time(layer["issue"]) if layer and layer["issue"] else ""
+
+county_outlooks = CountyOutlooks()
 
 #############################
 #   Helper: Status Bar      #
@@ -252,8 +2525,24 @@ class StatusBar(Frame):
         self.label = Label(self, bd=1, relief=tk.SUNKEN, anchor=tk.W,
                            bg=theme["status_bg"], fg=theme["status_fg"],
                            font=("TkDefaultFont", font_size))
+        self.bytes_label = Label(self, bd=1, relief=tk.SUNKEN, anchor=tk.E,
+                                 bg=theme["status_bg"], fg=theme["status_fg"],
+                                 font=("TkDefaultFont", font_size))
+        self.bytes_label.pack(side=RIGHT, fill=Y)
         self.label.pack(fill=tk.BOTH, expand=True)
         self.set("Ready.")
+        self.update_bytes()
+
+    def update_bytes(self):
+        # Polled rather than pushed so worker threads never touch Tk
+        profile = " (low bandwidth)" if low_bandwidth else ""
+        self.bytes_label.config(text=f"Downloaded {format_bytes(session_bytes)} this session{profile}")
+        self.bytes_job = self.after(2000, self.update_bytes)
+
+    def destroy(self):
+        # Recreated on every theme change; stop polling with the old bar
+        self.after_cancel(self.bytes_job)
+        Frame.destroy(self)
 
     def set(self, msg):
         self.label.config(text=msg)
@@ -272,11 +2561,13 @@ class WeatherToolkitApp:
         self.theme = themes[self.config["theme"]]
         self.font_size = self.config["font_size"]
         self.auto_refresh_mins = self.config["auto_refresh_mins"]
+        set_bandwidth_profile(self.config.get("bandwidth_profile", "normal"))
         self.window_geometry = self.config["window_geometry"]
         self.default_section = self.config["default_section"]
         self._loading = False
 
-        self.root.title(APP_TITLE)
+        self.update_title()
+        self.pack_preparing = False
         self.root.geometry(self.window_geometry)
         self.root.minsize(1920, 1080)
         self.root.configure(bg=self.theme["bg"])
@@ -286,15 +2577,24 @@ class WeatherToolkitApp:
         self.root.bind("<Alt-c>", lambda e: self.fetch_colorado_alerts())
         self.root.bind("<Alt-u>", lambda e: self.fetch_us_alerts())
         self.root.bind("<Alt-g>", lambda e: self.show_satellite_image())
+        self.root.bind("<Alt-l>", lambda e: self.show_goes_loop())
+        self.root.bind("<Alt-s>", lambda e: self.show_goes_sectors())
+        self.root.bind("<Alt-t>", lambda e: self.show_event_timeline())
+        self.root.bind("<Alt-m>", lambda e: self.show_md_viewer())
+        self.root.bind("<Alt-o>", lambda e: self.show_county_outlooks())
         self.root.bind("<F1>", lambda e: self.show_help())
         self.root.bind("<Control-s>", lambda e: self.open_settings())
         self.root.bind("<Configure>", self.save_window_geometry)
 
+        self.tooltips = ToolTip(self.root, self.theme, self.font_size)
         self.create_menu()
         self.create_top_buttons()
         self.create_sections()
         self.create_status_bar()
         self.status("Ready.")
+        # Link health: check whatever is past its TTL shortly after startup, then hourly
+        self.link_checking = False
+        self.root.after(3000, self.check_resource_links)
 
     #####################
     #   Menu Bar        #
@@ -306,9 +2606,16 @@ class WeatherToolkitApp:
 #	self.menubar.add_cascade(label="File", menu=filemenu)
         self.settings_menu = Menu(self.menubar, tearoff=0, bg=self.theme["bg"], fg=self.theme["fg"])
         self.settings_menu.add_command(label="Settings...", command=self.open_settings, accelerator="Ctrl+S")
+        self.settings_menu.add_separator()
+        self.settings_menu.add_command(label="Prepare Snapshot Pack...", command=self.prepare_snapshot_pack)
+        self.settings_menu.add_command(label="Open Snapshot Pack...", command=self.open_snapshot_pack)
+        self.settings_menu.add_command(label="Go Online", command=lambda: self.set_offline_pack(""))
+        self.settings_menu.add_separator()
+        self.settings_menu.add_command(label="Check Links Now", command=lambda: self.check_resource_links(force=True))
         self.menubar.add_cascade(label="Settings", menu=self.settings_menu)
         helpmenu = Menu(self.menubar, tearoff=0, bg=self.theme["bg"], fg=self.theme["fg"])
         helpmenu.add_command(label="Help", command=self.show_help, accelerator="F1")
+        helpmenu.add_command(label="Diagnostics...", command=self.show_diagnostics)
         helpmenu.add_command(label="About", command=self.show_about)
         self.menubar.add_cascade(label="Help", menu=helpmenu)
         self.root.config(menu=self.menubar)
@@ -325,7 +2632,7 @@ class WeatherToolkitApp:
                 activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
                 cursor="hand2")
         b1.pack(side=LEFT, padx=5)
-        ToolTip(b1, "Show current Colorado NWS alerts.", self.theme, self.font_size)
+        self.tooltips.register(b1, "Show current Colorado NWS alerts.")
         self.quick_buttons.append(b1)
 
         b2 = Button(self.top_frame, text="US Alerts (Alt+U)", command=self.fetch_us_alerts,
@@ -333,7 +2640,7 @@ class WeatherToolkitApp:
                 activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
                 cursor="hand2")
         b2.pack(side=LEFT, padx=5)
-        ToolTip(b2, "Show all US NWS alerts.", self.theme, self.font_size)
+        self.tooltips.register(b2, "Show all US NWS alerts.")
         self.quick_buttons.append(b2)
 
         b3 = Button(self.top_frame, text="GOES Snapshot (Alt+G)", command=self.show_satellite_image,
@@ -341,15 +2648,39 @@ class WeatherToolkitApp:
                 activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
                 cursor="hand2")
         b3.pack(side=LEFT, padx=5)
-        ToolTip(b3, "Show latest GOES satellite image.", self.theme, self.font_size)
+        self.tooltips.register(b3, "Show latest GOES satellite image.")
         self.quick_buttons.append(b3)
 
+        b6 = Button(self.top_frame, text="GOES Loop (Alt+L)", command=self.show_goes_loop,
+                bg=self.theme["button_bg"], fg=self.theme["button_fg"],
+                activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
+                cursor="hand2")
+        b6.pack(side=LEFT, padx=5)
+        self.tooltips.register(b6, "Loop the latest GOES frames for CONUS or Colorado.")
+        self.quick_buttons.append(b6)
+
+        b7 = Button(self.top_frame, text="GOES Sectors (Alt+S)", command=self.show_goes_sectors,
+                bg=self.theme["button_bg"], fg=self.theme["button_fg"],
+                activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
+                cursor="hand2")
+        b7.pack(side=LEFT, padx=5)
+        self.tooltips.register(b7, "Colorado and forecast office crops of the latest GOES CONUS frame.")
+        self.quick_buttons.append(b7)
+
+        b8 = Button(self.top_frame, text="Timeline (Alt+T)", command=self.show_event_timeline,
+                bg=self.theme["button_bg"], fg=self.theme["button_fg"],
+                activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
+                cursor="hand2")
+        b8.pack(side=LEFT, padx=5)
+        self.tooltips.register(b8, "Colorado alerts, SPC mesoscale discussions and storm reports in one timeline.")
+        self.quick_buttons.append(b8)
+
         b4 = Button(self.top_frame, text="Settings", command=self.open_settings,
                 bg=self.theme["button_bg"], fg=self.theme["button_fg"],
                 activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
                 cursor="hand2")
         b4.pack(side=LEFT, padx=5)
-        ToolTip(b4, "Open application settings.", self.theme, self.font_size)
+        self.tooltips.register(b4, "Open application settings.")
         self.quick_buttons.append(b4)
 
         b5 = Button(self.top_frame, text="Help (F1)", command=self.show_help,
@@ -357,20 +2688,22 @@ class WeatherToolkitApp:
                 activebackground=self.theme["button_active_bg"], activeforeground=self.theme["button_active_fg"],
                 cursor="hand2")
         b5.pack(side=LEFT, padx=5)
-        ToolTip(b5, "Show help/documentation.", self.theme, self.font_size)
+        self.tooltips.register(b5, "Show help/documentation.")
         self.quick_buttons.append(b5)
 
         b6 = Button(self.top_frame, text="Exit (Alt+Q)", command=self.safe_quit,
                 bg=self.theme["button_bg"], fg=self.theme["button_fg"],
                 activebackground="red", activeforeground="white", cursor="hand2")
         b6.pack(side=LEFT, padx=20)
-        ToolTip(b6, "Exit the application.", self.theme, self.font_size)
+        self.tooltips.register(b6, "Exit the application.")
         self.quick_buttons.append(b6)
 
     #####################
     #   Sections        #
     #####################
+    @profiler.wrap("create_sections")
     def create_sections(self):
+        self.link_buttons = []
         self.section_frame = Frame(self.root, bg=self.theme["bg"])
         self.section_frame.pack(fill="both", expand=True)
         max_columns = (len(resources) + 1) // 3
@@ -410,12 +2743,48 @@ class WeatherToolkitApp:
                 font=("TkDefaultFont", self.font_size)
             )
             btn.grid(row=row, column=col, padx=3, pady=3, sticky="nsew")
-            ToolTip(btn, f"Open: {name}", self.theme, self.font_size)
+            self.tooltips.register(btn, f"Open: {name}")
+            self.link_buttons.append((link, name, btn))
+            self.apply_link_health(link, name, btn)
             col += 1
             if col >= 2:
                 col = 0
                 row += 1
 
+    def apply_link_health(self, url, name, btn):
+        with link_health_lock:
+            result = link_health.get(url)
+        # Dead links stay visible but greyed out, with the reason on hover
+        btn.config(state="disabled" if link_state(result) == "dead" else "normal")
+        self.tooltips.set_text(btn, f"Open: {name}\n{link_hint(result)}" if result else f"Open: {name}")
+
+    def check_resource_links(self, force=False):
+        if not force:
+            self.root.after(3600 * 1000, self.check_resource_links)
+        if offline_pack is not None or self.link_checking:
+            return
+        self.link_checking = True
+        if force:
+            self.status("Checking links...")
+        def run():
+            links = resource_links()
+            try:
+                count = len(links) if force else len(stale_links(links))
+                results = check_links(links, force)
+                dead = sum(link_state(results.get(url)) == "dead" for url in links)
+                message = f"Checked {count} links, {dead} dead" if count else ""
+            except Exception as e:
+                log_error(f"Link check error: {e}", exc=e)
+                message = f"Link check failed: {e}"
+            def finished():
+                self.link_checking = False
+                for row in self.link_buttons:
+                    self.apply_link_health(*row)
+                if message:
+                    self.status(message)
+            self.root.after(0, finished)
+        threading.Thread(target=run, daemon=True).start()
+
     def make_resource_command(self, section_title, name, link):
         # Used to avoid late binding capture in lambda
         def cmd():
@@ -423,6 +2792,10 @@ class WeatherToolkitApp:
                 self.show_hwo(link, name)
             elif section_title == "Area Forecast Discussions":
                 self.show_afd(link, name)
+            elif link == SPC_MD_INDEX_URL:
+                self.show_md_viewer()
+            elif link == SPC_OUTLOOK_URL:
+                self.show_county_outlooks()
             else:
                 self.launch_item(link)
         return cmd
@@ -450,9 +2823,11 @@ class WeatherToolkitApp:
             self.theme = themes[self.config["theme"]]
             self.font_size = self.config["font_size"]
             self.auto_refresh_mins = self.config["auto_refresh_mins"]
+            set_bandwidth_profile(self.config["bandwidth_profile"])
             self.apply_all_theme()
             self.status("Settings updated.")
 
+    @profiler.wrap("apply_theme")
     def apply_all_theme(self):
         self.root.configure(bg=self.theme["bg"])
         for widget in self.root.winfo_children():
@@ -460,6 +2835,7 @@ class WeatherToolkitApp:
                 widget.configure(bg=self.theme["bg"], fg=self.theme["fg"])
             except Exception:
                 pass
+        self.tooltips.set_theme(self.theme, self.font_size)
         # Recreate all sections/buttons/status bar
         self.section_frame.destroy()
         self.create_sections()
@@ -469,6 +2845,53 @@ class WeatherToolkitApp:
     #####################
     #   About/Help      #
     #####################
+    def update_title(self):
+        title = APP_TITLE
+        if offline_pack is not None:
+            title += f" — OFFLINE snapshot v{offline_pack.manifest['version']} ({offline_pack.manifest['created']})"
+        self.root.title(title)
+
+    def set_offline_pack(self, path):
+        try:
+            open_offline_pack(path)
+        except (OSError, ValueError, zipfile.BadZipFile, KeyError) as e:
+            messagebox.showwarning("Snapshot Pack", f"Could not open {path}:\n{e}", parent=self.root)
+            return
+        self.update_title()
+        self.status(f"Reading from {path}" if path else "Back online")
+
+    def open_snapshot_pack(self):
+        path = filedialog.askopenfilename(parent=self.root, filetypes=[("Snapshot Packs", "*.zip")])
+        if path:
+            self.set_offline_pack(path)
+
+    def prepare_snapshot_pack(self):
+        if offline_pack is not None:
+            messagebox.showinfo("Snapshot Pack", "Go online before preparing a new pack.", parent=self.root)
+            return
+        if self.pack_preparing:
+            return
+        path = filedialog.asksaveasfilename(parent=self.root, defaultextension=".zip",
+                                            initialfile="cswn-snapshot.zip", confirmoverwrite=False,
+                                            filetypes=[("Snapshot Packs", "*.zip")])
+        if not path:
+            return
+        # An existing pack at the target is refreshed as a delta
+        delta = os.path.exists(path)
+        self.pack_preparing = True
+        self.status(f"{'Refreshing' if delta else 'Preparing'} snapshot pack...")
+        def run():
+            try:
+                message = pack_summary_text(prepare_pack(path, delta=delta))
+            except Exception as e:
+                log_error(f"Snapshot pack error: {e}", exc=e)
+                message = f"Snapshot pack failed: {e}"
+            def finished():
+                self.pack_preparing = False
+                self.status(message)
+            self.root.after(0, finished)
+        threading.Thread(target=run, daemon=True).start()
+
     def show_about(self):
         msg = (
             f"{APP_TITLE}\nVersion: {APP_VERSION}\nAuthor: {APP_AUTHOR}\n\n"
@@ -477,6 +2900,10 @@ class WeatherToolkitApp:
             "  Alt+C: Colorado Alerts\n"
             "  Alt+U: US Alerts\n"
             "  Alt+G: GOES Snapshot\n"
+            "  Alt+L: GOES Loop\n"
+            "  Alt+T: Event Timeline\n"
+            "  Alt+M: Colorado SPC Discussions\n"
+            "  Alt+O: County Outlook Risk\n"
             "  Ctrl+S: Settings\n"
             "  F1: Help\n"
             "  Alt+Q: Exit"
@@ -502,13 +2929,16 @@ class WeatherToolkitApp:
         )
         HelpDialog(self.root, help_text, self.theme, self.font_size)
 
+    def show_diagnostics(self):
+        DiagnosticsDialog(self.root, self.theme, self.font_size)
+
     #####################
     #   Window Save     #
     #####################
     def save_window_geometry(self, event=None):
         try:
             geom = self.root.geometry()
-            if "x" in geom and "+" in geom:
+            if "x" in geom and "+" in geom and geom != self.config.get("window_geometry"):
                 self.config["window_geometry"] = geom
                 save_config(self.config)
         except Exception:
@@ -520,6 +2950,7 @@ class WeatherToolkitApp:
     def on_closing(self):
         if messagebox.askokcancel("Quit", "Do you really want to quit?"):
             self.save_window_geometry()
+            config_store.flush()
             self.root.destroy()
 
     def safe_quit(self):
@@ -538,7 +2969,7 @@ class WeatherToolkitApp:
             else:
                 webbrowser.open(item)
         except Exception as e:
-            log_error(f"Error launching: {e}")
+            log_error(f"Error launching: {e}", url=item, exc=e)
             self.status(f"Error launching: {e}")
             messagebox.showerror("Error launching resource", f"Error launching: {e}")
 
@@ -554,6 +2985,7 @@ class WeatherToolkitApp:
     def _show_text_popup(self, url, title, typ, parse_pre=False):
         popup = Toplevel(self.root)
         popup.title(f"{typ} Viewer - {title}")
+        self._track_popup(typ, popup)
         popup.geometry("1000x650")
         popup.configure(bg=self.theme["bg"])
         popup.resizable(True, True)
@@ -582,25 +3014,32 @@ class WeatherToolkitApp:
         # Context menu
         self._add_context_menu(text_area)
         # Fetch in thread
+        span = FetchSpan(url, typ)
         def fetch_content():
+            span.lap("queue")
+            error = None
+            start = time.perf_counter()
             try:
-                response = requests.get(url, timeout=10)
+                response = fetch(url, timeout=10, span=span)
                 if parse_pre:
-                    soup = BeautifulSoup(response.content, "html.parser")
-                    pre = soup.find("pre")
-                    text = pre.text if pre else f"{typ} content not found."
+                    text = extract_pre_text(response.content) or f"{typ} content not found."
                 else:
                     text = response.text
             except Exception as e:
+                error = e
                 text = f"Failed to retrieve {typ}:\n{e}"
-                log_error(text)
+                log_error(text, url=url, elapsed=time.perf_counter() - start, exc=e)
+            span.lap("parse")
             def update_gui():
+                render_start = time.perf_counter()
                 stat_label.config(text=f"{typ} loaded.")
                 text_area.config(state="normal")
                 text_area.delete(1.0, END)
                 text_area.insert(END, text)
                 text_area.config(state="disabled")
                 self.status(f"{typ} loaded.")
+                span.set("render", time.perf_counter() - render_start)
+                span.finish(error)
             self.root.after(0, update_gui)
         threading.Thread(target=fetch_content, daemon=True).start()
 
@@ -610,6 +3049,7 @@ class WeatherToolkitApp:
     def show_satellite_image(self):
         popup = Toplevel(self.root)
         popup.title("GOES Snapshot")
+        self._track_popup("image", popup)
         popup.geometry("1240x720")
         popup.configure(bg=self.theme["bg"])
         stat_label = Label(popup, text="Loading image...", 
@@ -621,42 +3061,567 @@ class WeatherToolkitApp:
         Button(popup, text="Close (Esc)", command=popup.destroy,
                bg=self.theme["button_bg"], fg=self.theme["button_fg"]).pack(pady=8)
         self._popup_bindings(popup, img_label)
+        url = "https://cdn.star.nesdis.noaa.gov/GOES16/ABI/CONUS/GEOCOLOR/latest.jpg"
+        span = FetchSpan(url, "GOES image", memory=True)
         def fetch_img():
+            span.lap("queue")
+            error = None
             try:
-                url = "https://cdn.star.nesdis.noaa.gov/GOES16/ABI/CONUS/GEOCOLOR/latest.jpg"
-                response = requests.get(url, timeout=10)
-                img = Image.open(BytesIO(response.content))
-                img.thumbnail((1200, 675))
-                photo = ImageTk.PhotoImage(img)
+                shared = load_image(url, (1200, 675), timeout=10, span=span)
             except Exception as e:
-                log_error(f"Image load error: {e}")
-                photo = None
+                error = e
+                log_error(f"Image load error: {e}", url=url, exc=e)
+                shared = None
+            span.lap("parse")
             def show_img():
-                if photo:
+                render_start = time.perf_counter()
+                if shared and not popup.winfo_exists():
+                    shared.release()
+                elif shared:
+                    photo = shared_photo(shared)
                     img_label.config(image=photo)
                     img_label.image = photo
                     stat_label.config(text="GOES Snapshot loaded.")
                 else:
                     img_label.config(text="Image failed to load.")
+                span.set("render", time.perf_counter() - render_start)
+                span.finish(error)
             self.root.after(0, show_img)
         threading.Thread(target=fetch_img, daemon=True).start()
 
+    #####################
+    #   GOES Loop       #
+    #####################
+    def show_goes_loop(self):
+        theme = self.theme
+        popup = Toplevel(self.root)
+        popup.title("GOES Loop")
+        self._track_popup("goes_loop", popup)
+        popup.geometry("1240x800")
+        popup.configure(bg=theme["bg"])
+        controls = Frame(popup, bg=theme["bg"])
+        controls.pack(fill=tk.X, padx=10, pady=6)
+        sector_var = StringVar(value="CONUS")
+        count_var = StringVar(value=str(GOES_LOOP_FRAMES))
+        tk.OptionMenu(controls, sector_var, *GOES_LOOP_SECTORS).pack(side=LEFT, padx=5)
+        tk.Spinbox(controls, from_=4, to=48, width=4, textvariable=count_var,
+                   bg=theme["entry_bg"], fg=theme["entry_fg"]).pack(side=LEFT, padx=5)
+        Label(controls, text="frames", bg=theme["bg"], fg=theme["fg"]).pack(side=LEFT)
+        for text, offset in (("<<", -1), (">>", 1)):
+            Button(controls, text=text, command=lambda o=offset: step(o),
+                   bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=LEFT, padx=5)
+        play_btn = Button(controls, text="Pause", command=lambda: toggle_play(),
+                          bg=theme["button_bg"], fg=theme["button_fg"])
+        play_btn.pack(side=LEFT, padx=5)
+        Button(controls, text="Refresh", command=lambda: refresh(),
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=RIGHT, padx=5)
+        stat_label = Label(popup, text="Finding frames...", bg=theme["bg"], fg=theme["accent"],
+                           font=("TkDefaultFont", self.font_size))
+        stat_label.pack(pady=4)
+        img_label = Label(popup, bg=theme["bg"])
+        img_label.pack(expand=True, fill=BOTH)
+        Button(popup, text="Close (Esc)", command=popup.destroy,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(pady=8)
+        popup.bind("<Escape>", lambda e: popup.destroy())
+        display_size = (1200, 675)
+        # One ring per sector so switching back does not refetch
+        rings = {}
+        state = {"index": -1, "playing": True, "fetching": False, "pending": False, "closed": False,
+                 "play_job": None, "refresh_job": None}
+        pool = ThreadPoolExecutor(GOES_FETCH_WORKERS)
+
+        def frame_count():
+            try:
+                return max(4, min(48, int(count_var.get())))
+            except ValueError:
+                return GOES_LOOP_FRAMES
+        def ring():
+            sector = sector_var.get()
+            if sector not in rings:
+                rings[sector] = FrameRing(frame_count())
+            rings[sector].resize(frame_count())
+            return rings[sector]
+        def load_frame(url):
+            # Runs on the fetch pool; decoding happens in the image pool
+            span = FetchSpan(url, "GOES loop frame")
+            span.lap("queue")
+            try:
+                shared = load_image(url, display_size, timeout=20, span=span)
+            except Exception as e:
+                span.finish(e)
+                raise
+            span.lap("parse")
+            span.finish()
+            return shared
+        def refresh():
+            if state["fetching"]:
+                # Picked mid-load; fetched() runs this again for the new choice
+                state["pending"] = True
+                return
+            state["fetching"] = True
+            state["pending"] = False
+            current = ring()
+            sector = sector_var.get()
+            stat_label.config(text=f"Checking for new {sector} frames...")
+            def run():
+                base_url, size = GOES_LOOP_SECTORS[sector]
+                if low_bandwidth:
+                    size = LOW_BANDWIDTH_LOOP_SIZES.get(size, size)
+                added, error = 0, ""
+                try:
+                    wanted = current.missing(list_goes_frames(base_url, size, current.capacity))
+                except Exception as e:
+                    if state["closed"]:
+                        return
+                    log_error(f"GOES loop listing error: {e}", url=base_url, exc=e)
+                    wanted, error = [], str(e)
+                try:
+                    futures = {pool.submit(load_frame, url): (stamp, url) for stamp, url in wanted}
+                except RuntimeError:
+                    # The popup closed and shut the download pool down
+                    return
+                for future in as_completed(futures):
+                    stamp, url = futures[future]
+                    try:
+                        img = future.result()
+                    except Exception as e:
+                        error = "some frames failed"
+                        log_error(f"GOES loop frame error: {e}", url=url, exc=e)
+                        continue
+                    added += 1
+                    self.root.after(0, lambda s=stamp, i=img: add_frame(current, s, i))
+                self.root.after(0, lambda: fetched(added, error))
+            threading.Thread(target=run, daemon=True).start()
+        def add_frame(current, stamp, img):
+            # PhotoImage is made once on the Tk thread; playback only swaps it
+            if popup.winfo_exists():
+                current.add(stamp, shared_photo(img))
+            else:
+                img.release()
+        def fetched(added, error):
+            state["fetching"] = False
+            if not popup.winfo_exists():
+                return
+            if state["pending"]:
+                refresh()
+                return
+            frames = ring().ordered()
+            message = f"{len(frames)} frames, {added} new"
+            stat_label.config(text=f"{message} ({error})" if error else message)
+            if frames and state["index"] < 0:
+                step(1)
+            if frames and state["playing"] and state["play_job"] is None:
+                state["play_job"] = popup.after(GOES_LOOP_DELAY_MS, play)
+            if state["refresh_job"]:
+                popup.after_cancel(state["refresh_job"])
+            state["refresh_job"] = popup.after(poll_interval(GOES_LOOP_REFRESH_MS), refresh)
+        def step(offset):
+            frames = ring().ordered()
+            if not frames:
+                return
+            state["index"] = (state["index"] + offset) % len(frames)
+            stamp, photo = frames[state["index"]]
+            img_label.config(image=photo)
+            stat_label.config(text=f"{sector_var.get()}  {goes_frame_time(stamp)}  "
+                                   f"({state['index'] + 1}/{len(frames)})")
+        def play():
+            state["play_job"] = None
+            if state["playing"]:
+                step(1)
+                state["play_job"] = popup.after(GOES_LOOP_DELAY_MS, play)
+        def toggle_play():
+            state["playing"] = not state["playing"]
+            play_btn.config(text="Pause" if state["playing"] else "Play")
+            if state["playing"] and state["play_job"] is None:
+                play()
+        def change_sector(*args):
+            state["index"] = -1
+            img_label.config(image="")
+            refresh()
+        def change_count(*args):
+            if count_var.get().isdigit():
+                refresh()
+        def closed(event):
+            if event.widget is not popup:
+                return
+            state["closed"] = True
+            for job in ("play_job", "refresh_job"):
+                if state[job]:
+                    popup.after_cancel(state[job])
+            pool.shutdown(wait=False, cancel_futures=True)
+        sector_var.trace_add("write", change_sector)
+        count_var.trace_add("write", change_count)
+        popup.bind("<Destroy>", closed, add="+")
+        popup.after(100, refresh)
+
+    #####################
+    #   GOES Sectors    #
+    #####################
+    def show_goes_sectors(self):
+        theme = self.theme
+        popup = Toplevel(self.root)
+        popup.title("GOES Colorado Sectors")
+        self._track_popup("sectors", popup)
+        popup.geometry("1100x760")
+        popup.configure(bg=theme["bg"])
+        controls = Frame(popup, bg=theme["bg"])
+        controls.pack(fill=tk.X, padx=10, pady=6)
+        source_var = StringVar(value="GeoColor")
+        region_var = StringVar(value="Colorado")
+        tk.OptionMenu(controls, source_var, *SECTOR_SOURCES).pack(side=LEFT, padx=5)
+        tk.OptionMenu(controls, region_var, *SECTOR_REGIONS).pack(side=LEFT, padx=5)
+        Button(controls, text="Refresh", command=lambda: refresh(),
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=RIGHT, padx=5)
+        stat_label = Label(popup, text="Loading sectors...", bg=theme["bg"], fg=theme["accent"],
+                           font=("TkDefaultFont", self.font_size))
+        stat_label.pack(pady=4)
+        img_label = Label(popup, bg=theme["bg"])
+        img_label.pack(expand=True, fill=BOTH)
+        Button(popup, text="Close (Esc)", command=popup.destroy,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(pady=8)
+        popup.bind("<Escape>", lambda e: popup.destroy())
+        display_size = (1050, 600)
+        state = {"fetching": False, "refresh_job": None}
+
+        def show_region(*args):
+            with sector_lock:
+                entry = sector_cache.get(SECTOR_SOURCES[source_var.get()])
+            img_label.config(image=entry["photos"].get(region_var.get(), "") if entry else "")
+        def refresh(*args):
+            if state["fetching"]:
+                return
+            state["fetching"] = True
+            url = SECTOR_SOURCES[source_var.get()]
+            show_region()
+            stat_label.config(text=f"Checking {source_var.get()} for a new frame...")
+            span = FetchSpan(url, "GOES sector", memory=True)
+            def run():
+                span.lap("queue")
+                fetch_url = bandwidth_variant(url)
+                with sector_lock:
+                    cached = sector_cache.get(url)
+                if cached is not None and cached.get("url") != fetch_url:
+                    # Cropped from the other bandwidth profile's variant; its validators do not apply
+                    cached = None
+                headers = {}
+                if cached and cached["etag"]:
+                    headers["If-None-Match"] = cached["etag"]
+                if cached and cached["last_modified"]:
+                    headers["If-Modified-Since"] = cached["last_modified"]
+                # make_photos runs on the Tk thread; None means the cache is current
+                try:
+                    if offline_pack is not None:
+                        sectors = offline_pack.sectors()
+                        validators = {"url": None, "etag": None, "last_modified": offline_pack.manifest["created"]}
+                        make_photos = lambda: pack_sector_photos(sectors, display_size)
+                    else:
+                        resp = fetch(fetch_url, timeout=30, span=span, headers=headers)
+                        record_cache("sector_crop", cached is not None and resp.status_code == 304)
+                        validators = {"url": fetch_url, "etag": resp.headers.get("ETag"),
+                                      "last_modified": resp.headers.get("Last-Modified")}
+                        if cached is not None and resp.status_code == 304:
+                            make_photos = None
+                        else:
+                            crops = crop_regions(resp.content, list(SECTOR_REGIONS), display_size)
+                            make_photos = lambda: sector_photos(*crops)
+                except Exception as e:
+                    log_error(f"Sector crop error: {e}", url=url, exc=e)
+                    span.finish(e)
+                    message = str(e)
+                    self.root.after(0, lambda: done(url, None, None, message))
+                    return
+                span.lap("parse")
+                span.finish()
+                self.root.after(0, lambda: done(url, validators, make_photos, ""))
+            threading.Thread(target=run, daemon=True).start()
+        def done(url, validators, make_photos, error):
+            state["fetching"] = False
+            if make_photos is not None:
+                entry = dict(validators, photos=make_photos(), updated=time.time())
+                with sector_lock:
+                    sector_cache[url] = entry
+            if not popup.winfo_exists():
+                return
+            if error:
+                stat_label.config(text=f"Failed to load sectors: {error}")
+            else:
+                with sector_lock:
+                    entry = sector_cache[url]
+                stamp = entry["last_modified"] or time.strftime("%H:%M", time.localtime(entry["updated"]))
+                stat_label.config(text=f"{source_var.get()} {stamp}" + ("" if make_photos else " (unchanged)"))
+                show_region()
+            if state["refresh_job"]:
+                popup.after_cancel(state["refresh_job"])
+            state["refresh_job"] = popup.after(poll_interval(SECTOR_REFRESH_MS), refresh)
+            if url != SECTOR_SOURCES[source_var.get()]:
+                refresh()
+        def closed(event):
+            if event.widget is popup and state["refresh_job"]:
+                popup.after_cancel(state["refresh_job"])
+        source_var.trace_add("write", refresh)
+        region_var.trace_add("write", show_region)
+        popup.bind("<Destroy>", closed, add="+")
+        popup.after(100, refresh)
+
+    #####################
+    #   Event Timeline  #
+    #####################
+    def show_event_timeline(self):
+        theme = self.theme
+        popup = Toplevel(self.root)
+        popup.title("Event Timeline")
+        self._track_popup("timeline", popup)
+        popup.geometry("1100x700")
+        popup.configure(bg=theme["bg"])
+        stat_label = Label(popup, text="Loading alerts, SPC discussions and storm reports...",
+                           bg=theme["bg"], fg=theme["accent"], font=("TkDefaultFont", self.font_size))
+        stat_label.pack(pady=4)
+        text_area = Text(popup, wrap="none", bg=theme["bg"], fg=theme["fg"], font=("TkFixedFont", self.font_size))
+        text_area.pack(expand=True, fill=BOTH, padx=10, pady=6)
+        text_area.tag_config("new", foreground=theme["accent"])
+        Button(popup, text="Close (Esc)", command=popup.destroy,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(pady=8)
+        popup.bind("<Escape>", lambda e: popup.destroy())
+        # Ascending mirror of the lines shown; the text lists them newest first,
+        # so key i is on line len(keys) - i
+        keys = []
+        state = {"fetching": False, "refresh_job": None}
+
+        def insert(event, tags=()):
+            key = event_key(event)
+            i = bisect.bisect(keys, key)
+            keys.insert(i, key)
+            text_area.insert(f"{len(keys) - i}.0", event_line(event) + "\n", tags)
+        def remove(key):
+            i = bisect.bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                line = len(keys) - i
+                del keys[i]
+                text_area.delete(f"{line}.0", f"{line + 1}.0")
+        def refresh():
+            if state["fetching"]:
+                return
+            state["fetching"] = True
+            def run():
+                result = event_stream.refresh()
+                self.root.after(0, lambda: done(*result))
+            threading.Thread(target=run, daemon=True).start()
+        def done(added, dropped, errors):
+            # Only the lines that changed are touched
+            state["fetching"] = False
+            if not popup.winfo_exists():
+                return
+            text_area.config(state="normal")
+            for key in dropped:
+                remove(key)
+            for key in added:
+                event = event_stream.get(key)
+                if event is not None and event_key(event) == key:
+                    insert(event, ("new",))
+            text_area.config(state="disabled")
+            text = f"{len(keys)} events, {len(added)} new at {time.strftime('%H:%M')}"
+            if errors:
+                text += "  Failed: " + "; ".join(f"{name}: {error}" for name, error in errors.items())
+            stat_label.config(text=text)
+            state["refresh_job"] = popup.after(poll_interval(EVENT_REFRESH_MS), refresh)
+        def closed(event):
+            if event.widget is popup and state["refresh_job"]:
+                popup.after_cancel(state["refresh_job"])
+        for event in event_stream.snapshot():
+            insert(event)
+        text_area.config(state="disabled")
+        popup.bind("<Destroy>", closed, add="+")
+        popup.after(100, refresh)
+
+    #####################
+    #   SPC MD Viewer   #
+    #####################
+    def show_md_viewer(self):
+        theme = self.theme
+        popup = Toplevel(self.root)
+        popup.title("SPC Mesoscale Discussions - Colorado")
+        self._track_popup("spc_md", popup)
+        popup.geometry("1100x700")
+        popup.configure(bg=theme["bg"])
+        stat_label = Label(popup, text="Checking the SPC index for new discussions...",
+                           bg=theme["bg"], fg=theme["accent"], font=("TkDefaultFont", self.font_size))
+        stat_label.pack(pady=4)
+        body = Frame(popup, bg=theme["bg"])
+        body.pack(expand=True, fill=BOTH, padx=10, pady=6)
+        md_list = tk.Listbox(body, width=48, bg=theme["entry_bg"], fg=theme["entry_fg"],
+                             selectbackground=theme["accent"], exportselection=False,
+                             font=("TkDefaultFont", self.font_size))
+        md_list.pack(side=LEFT, fill=tk.Y)
+        text_area = Text(body, wrap="none", bg=theme["bg"], fg=theme["fg"], font=("TkFixedFont", self.font_size))
+        text_area.pack(side=LEFT, expand=True, fill=BOTH, padx=(8, 0))
+        text_area.config(state="disabled")
+        self._add_context_menu(text_area)
+        ctrl = Frame(popup, bg=theme["bg"])
+        ctrl.pack(fill=tk.X)
+        Button(ctrl, text="Refresh", command=lambda: refresh(),
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=LEFT, padx=5)
+        Button(ctrl, text="Open on SPC", command=lambda: open_current(),
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=LEFT, padx=5)
+        Button(ctrl, text="Close (Esc)", command=popup.destroy,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=RIGHT, padx=5)
+        popup.bind("<Escape>", lambda e: popup.destroy())
+        state = {"mds": [], "fetching": False, "refresh_job": None}
+
+        def show_text(text):
+            text_area.config(state="normal")
+            text_area.delete(1.0, END)
+            text_area.insert(END, text)
+            text_area.config(state="disabled")
+        def selected():
+            picked = md_list.curselection()
+            return state["mds"][picked[0]] if picked else None
+        def show_mds(mds, new_urls):
+            current = selected()
+            state["mds"] = mds
+            md_list.delete(0, END)
+            for i, md in enumerate(mds):
+                md_list.insert(END, md_summary(md))
+                if md["url"] in new_urls:
+                    md_list.itemconfig(i, fg=theme["accent"])
+            urls = [md["url"] for md in mds]
+            if not mds:
+                show_text("No mesoscale discussions for Colorado right now.")
+                return
+            row = urls.index(current["url"]) if current and current["url"] in urls else 0
+            md_list.selection_set(row)
+            show_text(mds[row]["text"])
+        def select(event):
+            md = selected()
+            if md:
+                show_text(md["text"])
+        def open_current():
+            md = selected()
+            webbrowser.open(md["url"] if md else SPC_MD_INDEX_URL)
+        def refresh():
+            if state["fetching"]:
+                return
+            state["fetching"] = True
+            def run():
+                try:
+                    result = md_cache.refresh()
+                except Exception as e:
+                    log_error(f"SPC MD index error: {e}", url=SPC_MD_INDEX_URL, exc=e)
+                    message = str(e)
+                    self.root.after(0, lambda: done(None, None, message))
+                    return
+                self.root.after(0, lambda: done(*result, None))
+            threading.Thread(target=run, daemon=True).start()
+        def done(new, errors, failure):
+            state["fetching"] = False
+            if not popup.winfo_exists():
+                return
+            if failure:
+                stat_label.config(text=f"SPC index failed: {failure}")
+            else:
+                # The list is only rebuilt when discussions came or went
+                mds = md_cache.colorado()
+                if [md["url"] for md in mds] != [md["url"] for md in state["mds"]]:
+                    show_mds(mds, {md["url"] for md in new})
+                text = f"{len(state['mds'])} for Colorado, {len(new)} new at {time.strftime('%H:%M')}"
+                if errors:
+                    text += f"  {len(errors)} discussion(s) failed to load"
+                stat_label.config(text=text)
+            state["refresh_job"] = popup.after(poll_interval(MD_REFRESH_MS), refresh)
+        def closed(event):
+            if event.widget is popup and state["refresh_job"]:
+                popup.after_cancel(state["refresh_job"])
+        md_list.bind("<<ListboxSelect>>", select)
+        # The cached discussions show at once; the refresh only adds new ones
+        show_mds(md_cache.colorado(), set())
+        popup.bind("<Destroy>", closed, add="+")
+        popup.after(100, refresh)
+
+    #####################
+    #   County Outlook  #
+    #####################
+    def show_county_outlooks(self):
+        theme = self.theme
+        popup = Toplevel(self.root)
+        popup.title("SPC Outlook Risk by County - Colorado")
+        self._track_popup("spc_outlook", popup)
+        popup.geometry("1150x760")
+        popup.configure(bg=theme["bg"])
+        stat_label = Label(popup, text="Loading SPC Day 1-3 outlooks...",
+                           bg=theme["bg"], fg=theme["accent"], font=("TkDefaultFont", self.font_size))
+        stat_label.pack(pady=4)
+        text_area = Text(popup, wrap="none", bg=theme["bg"], fg=theme["fg"], font=("TkFixedFont", self.font_size))
+        text_area.pack(expand=True, fill=BOTH, padx=10, pady=6)
+        ctrl = Frame(popup, bg=theme["bg"])
+        ctrl.pack(fill=tk.X)
+        Button(ctrl, text="Open SPC Outlooks", command=lambda: webbrowser.open(SPC_OUTLOOK_URL),
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=LEFT, padx=5)
+        Button(ctrl, text="Close (Esc)", command=popup.destroy,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=RIGHT, padx=5)
+        popup.bind("<Escape>", lambda e: popup.destroy())
+        state = {"fetching": False, "refresh_job": None}
+        counties = sorted(COLORADO_COUNTIES)
+        width = max(len(column) for _, _, column in OUTLOOK_LAYERS) + 2
+
+        def render():
+            # Each risk cell is tagged with the outlook's own fill colour
+            text_area.config(state="normal")
+            text_area.delete(1.0, END)
+            text_area.insert(END, f"{'County':14}" + "".join(f"{column:^{width}}" for _, _, column in OUTLOOK_LAYERS) + "\n")
+            for county in counties:
+                text_area.insert(END, f"{county:14}")
+                for day, kind, _ in OUTLOOK_LAYERS:
+                    label, fill = county_outlooks.cell(day, kind, county)
+                    tags = ()
+                    if fill:
+                        text_area.tag_config(fill, background=fill, foreground="black")
+                        tags = (fill,)
+                    text_area.insert(END, f"{label:^{width}}", tags)
+                text_area.insert(END, "\n")
+            text_area.config(state="disabled")
+        def refresh():
+            if state["fetching"]:
+                return
+            state["fetching"] = True
+            def run():
+                result = county_outlooks.refresh()
+                self.root.after(0, lambda: done(*result))
+            threading.Thread(target=run, daemon=True).start()
+        def done(changed, errors):
+            state["fetching"] = False
+            if not popup.winfo_exists():
+                return
+            # Redrawn only when a layer was re-indexed
+            if changed:
+                render()
+            issued = county_outlooks.issued(1, "cat")
+            text = f"Day 1 issued {issued}" if issued else "Outlooks loaded"
+            text += f", {len(changed)} layer(s) updated at {time.strftime('%H:%M')}"
+            if errors:
+                text += "  Failed: " + "; ".join(f"{column}: {error}" for column, error in errors.items())
+            stat_label.config(text=text)
+            state["refresh_job"] = popup.after(poll_interval(OUTLOOK_REFRESH_MS), refresh)
+        def closed(event):
+            if event.widget is popup and state["refresh_job"]:
+                popup.after_cancel(state["refresh_job"])
+        render()
+        popup.bind("<Destroy>", closed, add="+")
+        popup.after(100, refresh)
+
     #####################
     #   Alert Windows   #
     #####################
     def fetch_colorado_alerts(self):
-        url = "https://alerts.weather.gov/cap/co.php?x=0"
-        self._fetch_alerts(url, "Active Colorado Alerts")
+        self._fetch_alerts(COLORADO_ALERTS_URL, "Active Colorado Alerts")
 
     def fetch_us_alerts(self):
-        url = "https://api.weather.gov/alerts/active.atom"
-        self._fetch_alerts(url, "Active US Alerts")
+        self._fetch_alerts(US_ALERTS_URL, "Active US Alerts")
 
     def _fetch_alerts(self, url, window_title):
         theme = self.theme
         font_size = self.font_size
         popup = Toplevel(self.root, bg=theme["bg"])
         popup.title(window_title)
+        self._track_popup("alerts", popup)
         popup.geometry("950x700")
         popup.resizable(True, True)
         # Accessibility and status
@@ -673,6 +3638,12 @@ class WeatherToolkitApp:
         search_entry.pack(side=LEFT)
         Button(search_frame, text="Refresh Now", command=lambda: load_alerts(), 
                bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=LEFT, padx=12)
+        # History window over the local alert store
+        window_var = StringVar(value=ALERT_HISTORY_WINDOWS[0][0])
+        window_menu = tk.OptionMenu(search_frame, window_var, *[label for label, _ in ALERT_HISTORY_WINDOWS],
+                                    command=lambda _: select_window())
+        window_menu.config(bg=theme["button_bg"], fg=theme["button_fg"], highlightthickness=0)
+        window_menu.pack(side=LEFT)
 
         # Status label
         stat_label = Label(popup, text="Loading alerts...", bg=theme["bg"], fg=theme["accent"],
@@ -695,41 +3666,53 @@ class WeatherToolkitApp:
                bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=RIGHT, padx=5)
         self._popup_bindings(popup, text_area)
         # Internal state
+        live_entries = []
         entries = []
         last_update = [""]
         # Load alerts
         def load_alerts():
             stat_label.config(text="Loading alerts...")
             self.status("Loading alerts...")
+            span = FetchSpan(url, "Alerts")
+            @profiler.wrap("alert_fetch")
             def run_fetch():
+                span.lap("queue")
+                error = None
+                start = time.perf_counter()
                 try:
-                    response = requests.get(url, timeout=12)
-                    rootx = ET.fromstring(response.content)
-                    entries.clear()
-                    entries.extend(rootx.findall("{http://www.w3.org/2005/Atom}entry"))
+                    response = fetch(url, timeout=12, span=span)
+                    alerts = parse_alert_feed(response.content)
+                    record_alerts(url, alerts)
+                    alert_history.store(alerts)
+                    live_entries[:] = alerts
                     last_update[0] = time.strftime("%Y-%m-%d %H:%M:%S")
                 except Exception as e:
-                    log_error(f"Error fetching alerts: {e}")
-                    entries.clear()
+                    error = e
+                    log_error(f"Error fetching alerts: {e}", url=url, elapsed=time.perf_counter() - start, exc=e)
+                    live_entries.clear()
                     last_update[0] = ""
-                self.root.after(0, apply_filter)
+                span.lap("parse")
+                def render():
+                    render_start = time.perf_counter()
+                    select_window()
+                    span.set("render", time.perf_counter() - render_start)
+                    span.finish(error)
+                self.root.after(0, render)
             threading.Thread(target=run_fetch, daemon=True).start()
+        def select_window():
+            hours = dict(ALERT_HISTORY_WINDOWS)[window_var.get()]
+            if hours:
+                entries[:] = alert_history.query(time.time() - hours * 3600)
+            else:
+                entries[:] = live_entries
+            apply_filter()
         # Filtering/highlight
+        @profiler.wrap("apply_filter")
         def apply_filter(*args):
             term = search_var.get().lower()
             text_area.config(state="normal")
             text_area.delete(1.0, END)
-            grouped_alerts = {}
-            for i, entry in enumerate(entries):
-                title = entry.find("{http://www.w3.org/2005/Atom}title").text
-                summary = entry.find("{http://www.w3.org/2005/Atom}summary").text
-                link = entry.find("{http://www.w3.org/2005/Atom}link").attrib.get("href")
-                area = entry.find("{urn:oasis:names:tc:emergency:cap:1.1}areaDesc")
-                counties = [c.strip() for c in area.text.split(';')] if area is not None and area.text else ["Unknown Area"]
-                if title and summary:
-                    if term in title.lower() or term in summary.lower():
-                        for county in counties:
-                            grouped_alerts.setdefault(county, []).append((title, summary, link))
+            grouped_alerts = group_alerts(entries, term)
             link_counter = 0
             # Alert tags
             text_area.tag_config("warning", foreground=theme["warning"], font=("TkDefaultFont", font_size, "bold"))
@@ -775,7 +3758,7 @@ class WeatherToolkitApp:
         # Auto-refresh
         def refresher():
             load_alerts()
-            popup.after(self.auto_refresh_mins * 60000, refresher)
+            popup.after(poll_interval(self.auto_refresh_mins * 60000), refresher)
         refresher()
         self.status(f"{window_title} opened.")
         # Context menu
@@ -798,7 +3781,7 @@ class WeatherToolkitApp:
                     f.write(s)
                 self.status(f"Saved to {fname}")
             except Exception as e:
-                log_error(f"Save error: {e}")
+                log_error(f"Save error: {e}", exc=e)
                 messagebox.showerror("Save Error", f"Could not save file: {e}")
                 self.status("Save failed.")
 
@@ -824,6 +3807,11 @@ class WeatherToolkitApp:
         popup.bind("<Escape>", lambda e: popup.destroy())
         popup.bind("<Control-c>", lambda e: self.copy_to_clipboard(widget.get(1.0, END)))
 
+    def _track_popup(self, kind, popup):
+        # <Destroy> also fires for every child widget; only count the popup
+        profiler.popup_opened(kind)
+        popup.bind("<Destroy>", lambda e: e.widget is popup and profiler.popup_closed(kind), add="+")
+
 
 #############################
 #   Settings Dialog         #
@@ -849,8 +3837,11 @@ class SettingsDialog:
         Label(self.top, text="Default Section:", bg=self.theme["bg"], fg=self.theme["fg"]).grid(row=3, column=0, sticky="w", padx=8, pady=5)
         self.section_var = StringVar(value=config.get("default_section", ""))
         tk.Entry(self.top, textvariable=self.section_var).grid(row=3, column=1, sticky="e", padx=8, pady=5)
+        Label(self.top, text="Bandwidth Profile:", bg=self.theme["bg"], fg=self.theme["fg"]).grid(row=4, column=0, sticky="w", padx=8, pady=5)
+        self.bandwidth_var = StringVar(value=config.get("bandwidth_profile", "normal"))
+        tk.OptionMenu(self.top, self.bandwidth_var, *BANDWIDTH_PROFILES).grid(row=4, column=1, sticky="e", padx=8, pady=5)
         btn = Button(self.top, text="Save", command=self.save, bg=self.theme["button_bg"], fg=self.theme["button_fg"])
-        btn.grid(row=4, column=0, columnspan=2, pady=12)
+        btn.grid(row=5, column=0, columnspan=2, pady=12)
         self.top.bind("<Return>", lambda e: self.save())
         self.top.bind("<Escape>", lambda e: self.top.destroy())
         btn.focus_set()
@@ -861,6 +3852,7 @@ class SettingsDialog:
             "font_size": int(self.font_var.get()),
             "auto_refresh_mins": int(self.refresh_var.get()),
             "default_section": self.section_var.get(),
+            "bandwidth_profile": self.bandwidth_var.get(),
         }
         self.top.destroy()
 
@@ -879,19 +3871,83 @@ class HelpDialog:
         top.bind("<Escape>", lambda e: top.destroy())
         l.focus_set()
 
+#############################
+#   Diagnostics Dialog      #
+#############################
+class DiagnosticsDialog:
+    STAGE_LABELS = {"queue": "Queue", "connect": "Connect", "ttfb": "TTFB", "download": "Download",
+                    "parse": "Parse", "render": "Render", "total": "Total"}
+
+    def __init__(self, master, theme, font_size):
+        self.top = top = Toplevel(master)
+        top.title("Diagnostics")
+        top.geometry("1250x420")
+        top.configure(bg=theme["bg"])
+        self.stat_label = Label(top, bg=theme["bg"], fg=theme["accent"], font=("TkDefaultFont", font_size))
+        self.stat_label.pack(pady=6)
+        self.text_area = Text(top, wrap="none", bg=theme["bg"], fg=theme["fg"], font=("TkFixedFont", font_size))
+        self.text_area.pack(expand=True, fill=BOTH, padx=10, pady=6)
+        ctrl = Frame(top, bg=theme["bg"])
+        ctrl.pack(fill=tk.X, pady=6)
+        Button(ctrl, text="Refresh", command=self.refresh,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=LEFT, padx=5)
+        Button(ctrl, text="Export JSON...", command=self.export,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=LEFT, padx=5)
+        Button(ctrl, text="Close (Esc)", command=top.destroy,
+               bg=theme["button_bg"], fg=theme["button_fg"]).pack(side=RIGHT, padx=5)
+        top.bind("<Escape>", lambda e: top.destroy())
+        self.refresh()
+
+    def refresh(self):
+        spans = timing_snapshot()
+        lines = [f"{'Host':26} {'Product':12} {'N':>4} {'Err':>4} {'KiB':>7}"
+                 + "".join(f" {label:>15}" for label in self.STAGE_LABELS.values()) + f" {'Peak MiB':>9}"]
+        for row in summarize_timings(spans):
+            line = (f"{row['host'][:26]:26} {row['product'][:12]:12} {row['count']:>4} "
+                    f"{row['errors']:>4} {row['bytes'] / 1024:>7.0f}")
+            for stage in self.STAGE_LABELS:
+                stats = row.get(stage)
+                line += f" {stats['p50']:>7.1f}/{stats['p95']:<7.1f}" if stats else f" {'-':>15}"
+            line += f" {row['peak_rss_mb']:>9.1f}" if "peak_rss_mb" in row else f" {'-':>9}"
+            lines.append(line)
+        self.text_area.config(state="normal")
+        self.text_area.delete(1.0, END)
+        self.text_area.insert(END, "\n".join(lines))
+        self.text_area.config(state="disabled")
+        self.stat_label.config(text=f"{len(spans)} recent fetches (last {TIMING_BUFFER_SIZE} kept). "
+                                    "Stage times are p50/p95 in ms; Peak MiB is the largest "
+                                    "process RSS seen while an image loaded.")
+
+    def export(self):
+        filename = filedialog.asksaveasfilename(parent=self.top, defaultextension=".json",
+                                                initialfile="cswn-diagnostics.json",
+                                                filetypes=[("JSON Files", "*.json")])
+        if not filename:
+            return
+        try:
+            export_timings(filename)
+            self.stat_label.config(text=f"Exported to {filename}")
+        except OSError as e:
+            self.stat_label.config(text=f"Export failed: {e}")
+
 #############################
 #   Main Entrypoint         #
 #############################
 def main():
-    root = Tk()
-    def toggle_fullscreen(event):
-        root.attributes("-fullscreen", not root.attributes("-fullscreen"))
+    configure_link_check(configure_pack(profiler.configure(sys.argv)))
+    with profiler.cycle("startup"):
+        root = Tk()
+        def toggle_fullscreen(event):
+            root.attributes("-fullscreen", not root.attributes("-fullscreen"))
 
-    root.bind("<F11>", toggle_fullscreen)
-    root.bind("<Escape>", lambda event: root.attributes("-fullscreen", False)) # Optional: Exit fullscreen on Escape
+        root.bind("<F11>", toggle_fullscreen)
+        root.bind("<Escape>", lambda event: root.attributes("-fullscreen", False)) # Optional: Exit fullscreen on Escape
 
-    app = WeatherToolkitApp(root)
+        app = WeatherToolkitApp(root)
+    start_metrics(app.config.get("tk_metrics_port"), app.config.get("tk_metrics_file"))
     root.mainloop()
 
 if __name__ == "__main__":
+    # Image pool workers re-run this script when frozen by PyInstaller
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""Stand-in for the NWS, SPC and GOES hosts, served from benchmarks/fixtures.
+
+    python benchmarks/fixture_server.py --latency 250 --bandwidth 512 --error-rate 0.05
+    CSWN_BASE_URL=http://127.0.0.1:8765 python CSWN-toolkit.py
+
+With CSWN_BASE_URL set the apps request https://host/path?query as
+<base>/host/path?query, so the first path segment tells us which live
+host the request was meant for. Anything without a fixture gets a small
+placeholder page so web links still resolve. GET /_stats returns counters.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from run_benchmarks import MD_FIRST_NUMBER, MD_FIXTURES, fixture, md_text, outlook_geojson
+
+GOES_LISTING_SIZES = ("625x375", "1250x750", "2500x1500", "600x600", "1200x1200")
+
+def goes_listing(target):
+    # Directory index with a frame every 5 minutes for the last 4 hours,
+    # named like the CDN: YYYYJJJHHMM_GOES19-ABI-<sector>-<band>-<size>.jpg
+    sector, band = target.split("?")[0].rstrip("/").split("/")[-2:]
+    newest = int(time.time() // 300 * 300)
+    links = []
+    for age in range(48, 0, -1):
+        stamp = time.strftime("%Y%j%H%M", time.gmtime(newest - age * 300))
+        for size in GOES_LISTING_SIZES:
+            name = f"{stamp}_GOES19-ABI-{sector}-{band}-{size}.jpg"
+            links.append(f'<a href="{name}">{name}</a>')
+    return ("<html><head><title>Index</title></head><body><pre>\n" + "\n".join(links)
+            + "\n</pre></body></html>\n").encode("utf-8")
+
+def md_index(target):
+    # The SPC discussion index links each current MD page
+    links = [f'<a href="/products/md/md{MD_FIRST_NUMBER + i}.html">MD {MD_FIRST_NUMBER + i}</a>'
+             for i in range(len(MD_FIXTURES))]
+    return ("<html><head><title>SPC Mesoscale Discussions</title></head><body>\n"
+            + "<br>\n".join(links) + "\n</body></html>\n").encode("utf-8")
+
+def md_page(target):
+    number = int(re.search(r"md(\d{4})\.html", target).group(1))
+    i = number - MD_FIRST_NUMBER
+    if not 0 <= i < len(MD_FIXTURES):
+        return PLACEHOLDER.format(url=target).encode("utf-8")
+    return f"<html><body><pre>{md_text(i)}</pre></body></html>\n".encode("utf-8")
+
+def outlook_layer(target):
+    # Returned with its extension, so it is served as GeoJSON
+    day, kind = re.search(r"day(\d)otlk_(\w+)\.lyr\.geojson", target).groups()
+    return json.dumps(outlook_geojson(int(day), kind)).encode("utf-8"), ".geojson"
+
+# First match wins; matched against "host/path?query". A callable builds
+# the body (or a (body, extension) pair) from the target instead of
+# reading a fixture.
+ROUTES = [
+    (r"^forecast\.weather\.gov/product\.php\?.*product=HWO", "hwo_pub.html"),
+    (r"^forecast\.weather\.gov/product\.php\?.*product=AFD", "afd_bou.html"),
+    (r"^alerts\.weather\.gov/cap/", "co_alerts.atom"),
+    (r"^api\.weather\.gov/alerts/active\.atom\?.*area=", "co_alerts.atom"),
+    (r"^api\.weather\.gov/alerts/active\.atom", "national_alerts.atom"),
+    (r"^www\.spc\.noaa\.gov/products/spcmdrss\.xml", "spc_md_rss.xml"),
+    (r"^www\.spc\.noaa\.gov/products/md/(?:\?|$)", md_index),
+    (r"^www\.spc\.noaa\.gov/products/md/md\d{4}\.html", md_page),
+    (r"^www\.spc\.noaa\.gov/products/outlook/day\dotlk_\w+\.lyr\.geojson", outlook_layer),
+    (r"^mesonet\.agron\.iastate\.edu/geojson/lsr\.php", "lsr_co.geojson"),
+    (r"^cdn\.star\.nesdis\.noaa\.gov/.*/$", goes_listing),
+    (r"^cdn\.star\.nesdis\.noaa\.gov/.*\.jpg$", "goes_conus_2500x1500.jpg"),
+    (r"\.(?:png|jpe?g|gif)$", "goes_conus_2500x1500.jpg"),
+]
+ROUTES = [(re.compile(pattern), name) for pattern, name in ROUTES]
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".atom": "application/atom+xml; charset=utf-8",
+    ".jpg": "image/jpeg",
+    ".xml": "application/rss+xml; charset=utf-8",
+    ".geojson": "application/geo+json",
+}
+ERROR_STATUSES = (500, 502, 503, 504)
+CHUNK_SIZE = 16 * 1024
+
+PLACEHOLDER = """<!DOCTYPE html>
+<html><head><title>{url}</title></head>
+<body><h1>Offline stand-in</h1><p>No fixture is recorded for <code>{url}</code>.</p></body></html>
+"""
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, args):
+        super().__init__(address, FixtureHandler)
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.burst_left = 0
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "bytes": 0}
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def should_fail(self):
+        # A failure starts a burst so retries and refreshes see a run of 5xx,
+        # the way a struggling upstream actually behaves
+        with self.lock:
+            if self.burst_left:
+                self.burst_left -= 1
+                return self.random.choice(ERROR_STATUSES)
+            if self.args.error_rate and self.random.random() < self.args.error_rate:
+                self.burst_left = self.args.burst - 1
+                return self.random.choice(ERROR_STATUSES)
+        return None
+
+    def generation(self):
+        # Bumped every --mutate-every seconds so polling sees new content
+        if not self.args.mutate_every:
+            return 0
+        return int((time.time() - self.started) // self.args.mutate_every)
+
+    def body_for(self, target):
+        for pattern, name in ROUTES:
+            if pattern.search(target):
+                if callable(name):
+                    body, ext = name(target), ".html"
+                    if isinstance(body, tuple):
+                        body, ext = body
+                else:
+                    body, ext = fixture(name), name[name.rindex("."):]
+                break
+        else:
+            body = PLACEHOLDER.format(url=target).encode("utf-8")
+            ext = ".html"
+        generation = self.generation()
+        if generation and ext in (".html", ".atom"):
+            body += f"\n<!-- generation {generation} -->\n".encode("ascii")
+        modified = self.started + generation * (self.args.mutate_every or 0)
+        return body, CONTENT_TYPES.get(ext, "application/octet-stream"), modified
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "CSWNFixtureServer/1.0"
+
+    def do_GET(self):
+        self.respond(send_body=True)
+
+    def do_HEAD(self):
+        self.respond(send_body=False)
+
+    def respond(self, send_body):
+        server = self.server
+        args = server.args
+        server.count("requests")
+        target = self.path.lstrip("/")
+        if target == "_stats":
+            with server.lock:
+                stats = json.dumps(server.stats).encode("utf-8")
+            return self.send_plain(200, stats, "application/json", send_body)
+
+        delay = args.latency + (server.random.uniform(0, args.jitter) if args.jitter else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        status = server.should_fail()
+        if status:
+            server.count("errors")
+            return self.send_plain(status, f"{status} injected failure\n".encode("ascii"),
+                                   "text/plain", send_body)
+
+        body, content_type, modified = server.body_for(target)
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if self.not_modified(etag, modified):
+            server.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", formatdate(modified, usegmt=True))
+            self.end_headers()
+            return
+
+        server.count("ok")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(modified, usegmt=True))
+        self.send_header("Cache-Control", f"max-age={args.max_age}")
+        self.end_headers()
+        if send_body:
+            self.write_throttled(body)
+
+    def not_modified(self, etag, modified):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def write_throttled(self, body):
+        rate = self.server.args.bandwidth * 1024
+        for offset in range(0, len(body), CHUNK_SIZE):
+            chunk = body[offset:offset + CHUNK_SIZE]
+            try:
+                self.wfile.write(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            self.server.count("bytes", len(chunk))
+            if rate:
+                time.sleep(len(chunk) / rate)
+
+    def send_plain(self, status, body, content_type, send_body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.args.quiet:
+            super().log_message(format, *args)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="added delay per request, ms")
+    parser.add_argument("--jitter", type=float, default=0, help="extra random delay up to this many ms")
+    parser.add_argument("--bandwidth", type=float, default=0, help="KiB/s per response, 0 for unlimited")
+    parser.add_argument("--error-rate", type=float, default=0, help="chance a request starts a 5xx burst")
+    parser.add_argument("--burst", type=int, default=3, help="consecutive 5xx responses per burst")
+    parser.add_argument("--mutate-every", type=float, default=0,
+                        help="change text fixtures (and their ETags) every N seconds")
+    parser.add_argument("--max-age", type=int, default=60, help="Cache-Control max-age to advertise")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not log each request")
+    args = parser.parse_args()
+
+    server = FixtureServer((args.host, args.port), args)
+    print(f"Serving fixtures on http://{args.host}:{args.port} "
+          f"(set CSWN_BASE_URL=http://{args.host}:{args.port})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
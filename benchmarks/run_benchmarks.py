@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Benchmarks for the toolkit's parse, filter, render and image paths.
+
+    python benchmarks/run_benchmarks.py            # run, append to history, check thresholds
+    python benchmarks/run_benchmarks.py --record   # refresh fixtures from the live feeds
+    python benchmarks/run_benchmarks.py -k group_alerts  # only matching cases
+
+The small text fixtures are checked in. The national alert feed and the
+GOES JPEG are large, so they are recorded with --record or synthesized
+from the checked-in fixtures the first time they are needed.
+"""
+import argparse
+import html
+import importlib.util
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+FIXTURES = os.path.join(HERE, "fixtures")
+HISTORY_FILE = os.path.join(HERE, "history.json")
+THRESHOLDS_FILE = os.path.join(HERE, "thresholds.json")
+
+RECORD_URLS = {
+    "co_alerts.atom": "https://api.weather.gov/alerts/active.atom?area=CO",
+    "national_alerts.atom": "https://api.weather.gov/alerts/active.atom",
+    "hwo_pub.html": "https://forecast.weather.gov/product.php?site=NWS&issuedby=PUB&product=HWO",
+    "afd_bou.html": "https://forecast.weather.gov/product.php?site=BOU&product=AFD&issuedby=BOU",
+    "goes_conus_2500x1500.jpg": "https://cdn.star.nesdis.noaa.gov/GOES19/ABI/CONUS/Sandwich/2500x1500.jpg",
+    "spc_md_rss.xml": "https://www.spc.noaa.gov/products/spcmdrss.xml",
+}
+
+def load_app(filename, name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def fixture(name):
+    path = os.path.join(FIXTURES, name)
+    if not os.path.exists(path):
+        SYNTHESIZERS[name](path)
+    with open(path, "rb") as f:
+        return f.read()
+
+def synthesize_national_feed(path):
+    # Repeat the Colorado entries with fresh ids until the feed is about the
+    # size of a busy national active.atom
+    co = fixture("co_alerts.atom").decode("utf-8")
+    head = co[:co.index("<entry>")]
+    entries = re.findall(r"<entry>.*?</entry>", co, re.DOTALL)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(head)
+        for i in range(100):
+            for entry in entries:
+                f.write(entry.replace("urn:oid:", f"urn:oid:{i}.") + "\n")
+        f.write("</feed>\n")
+
+def synthesize_goes_jpeg(path):
+    # Smooth noise compresses about like real cloud imagery at this size
+    from PIL import Image, ImageFilter
+    size = (2500, 1500)
+    clouds = Image.effect_noise(size, 80).filter(ImageFilter.GaussianBlur(1.5))
+    ground = Image.linear_gradient("L").resize(size)
+    Image.merge("RGB", (clouds, ground, clouds.point(lambda v: 255 - v))).save(path, quality=85)
+
+# Areas affected and LAT...LON for the synthesized discussions; the last
+# one is outside Colorado
+MD_FIXTURES = (("Eastern Colorado into western Kansas", "39010325 39000205 38000202 38010321 39010325"),
+               ("Southeast Colorado", "38250420 38240285 37050283 37040418 38250420"),
+               ("Central Texas Panhandle", "35810250 35800150 34800151 34810249 35810250"))
+MD_FIRST_NUMBER = 1200
+
+def md_text(i, now=None):
+    # Mesoscale discussion i, issued i hours ago, laid out like the SPC product
+    areas, latlon = MD_FIXTURES[i]
+    issued = (now or time.time()) - i * 3600
+    local = time.strftime("%I%M %p CDT %a %b %d %Y", time.gmtime(issued - 5 * 3600))
+    return f"""   Mesoscale Discussion {MD_FIRST_NUMBER + i}
+   NWS Storm Prediction Center Norman OK
+   {local}
+
+   Areas affected...{areas}
+
+   Concerning...Severe potential...Watch possible
+
+   Valid {time.strftime("%d%H%MZ", time.gmtime(issued))} - {time.strftime("%d%H%MZ", time.gmtime(issued + 5400))}
+
+   SUMMARY...Storms moving off the higher terrain may produce large hail.
+
+   ATTN...WFO...PUB...BOU...GLD...
+
+   LAT...LON   {latlon}
+"""
+
+def synthesize_md_rss(path):
+    # The discussions an hour apart, as the national RSS feed carries them
+    now = time.time()
+    items = []
+    for i in range(len(MD_FIXTURES)):
+        number = MD_FIRST_NUMBER + i
+        issued = time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.gmtime(now - i * 3600))
+        items.append(f"""<item><title>SPC MD {number}</title>
+<link>https://www.spc.noaa.gov/products/md/md{number}.html</link>
+<guid>https://www.spc.noaa.gov/products/md/md{number}.html</guid>
+<pubDate>{issued}</pubDate>
+<description>&lt;pre&gt;{html.escape(md_text(i, now))}&lt;/pre&gt;</description></item>""")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>'
+                "<title>SPC Mesoscale Discussions</title>\n" + "\n".join(items) + "\n</channel></rss>\n")
+
+# Outlook areas as (label, fill, (south, west, north, east)); nested like
+# SPC's, with the higher risks over the eastern plains
+OUTLOOK_AREAS = {
+    "cat": (("TSTM", "#C1E9C1", (36.0, -108.0, 42.0, -98.0)), ("MRGL", "#66A366", (37.5, -105.5, 41.0, -100.0)),
+            ("SLGT", "#FFE066", (38.0, -104.0, 40.5, -101.0))),
+    "prob": (("0.05", "#8B4726", (37.5, -105.5, 41.0, -100.0)), ("0.15", "#FFC800", (38.0, -104.0, 40.5, -101.0))),
+    "sig": (("SIGN", "#000000", (38.5, -103.5, 39.5, -102.0)),),
+}
+
+def outlook_geojson(day, kind):
+    # An SPC .lyr.geojson layer issued at the top of the current hour
+    issue = time.strftime("%Y%m%d%H00", time.gmtime())
+    valid = time.strftime("%Y%m%d1200", time.gmtime(time.time() + (day - 1) * 86400))
+    features = []
+    areas = OUTLOOK_AREAS["cat" if kind == "cat" else "sig" if kind.startswith("sig") else "prob"]
+    for label, fill, (south, west, north, east) in areas:
+        ring = [[west, south], [east, south], [east, north], [west, north], [west, south]]
+        features.append({"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring]},
+                         "properties": {"DN": 0, "LABEL": label, "LABEL2": label, "fill": fill, "stroke": fill,
+                                        "ISSUE": issue, "VALID": valid, "EXPIRE": valid}})
+    return {"type": "FeatureCollection", "features": features}
+
+def synthesize_lsr_geojson(path):
+    # IEM local storm reports over the last few hours, one across the line in Kansas
+    reports = [("Hail", "1.75", "INCH", "Limon", "Lincoln", "CO", 39.26, -103.69),
+               ("Tstm Wnd Gst", "62", "MPH", "Lamar", "Prowers", "CO", 38.09, -102.62),
+               ("Tornado", "", "", "Kit Carson", "Cheyenne", "CO", 38.76, -102.79),
+               ("Hail", "1.00", "INCH", "Goodland", "Sherman", "KS", 39.35, -101.71)]
+    now = time.time()
+    features = []
+    for i, (typetext, magnitude, unit, city, county, state, lat, lon) in enumerate(reports):
+        features.append({"type": "Feature", "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                         "properties": {"valid": time.strftime("%Y-%m-%dT%H:%M:00Z", time.gmtime(now - i * 1800)),
+                                        "typetext": typetext, "magnitude": magnitude, "unit": unit,
+                                        "city": city, "county": county, "state": state,
+                                        "source": "Trained Spotter", "remark": "", "wfo": "PUB"}})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+
+SYNTHESIZERS = {
+    "national_alerts.atom": synthesize_national_feed,
+    "goes_conus_2500x1500.jpg": synthesize_goes_jpeg,
+    "spc_md_rss.xml": synthesize_md_rss,
+    "lsr_co.geojson": synthesize_lsr_geojson,
+}
+
+def record_fixtures():
+    import requests
+    os.makedirs(FIXTURES, exist_ok=True)
+    for name, url in RECORD_URLS.items():
+        resp = requests.get(url, timeout=30, headers={"User-Agent": "CSWN-Toolkit benchmarks"})
+        resp.raise_for_status()
+        with open(os.path.join(FIXTURES, name), "wb") as f:
+            f.write(resp.content)
+        print(f"recorded {name} ({len(resp.content) / 1024:.0f} KiB)")
+
+def tk_cases():
+    app = load_app("Colorado-SWN.py", "colorado_swn")
+    alerts = app.parse_alert_feed(fixture("national_alerts.atom"))
+    cases = {}
+    for term in ("", "w", "warn", "red flag warning", "severe thunderstorm warning issued"):
+        cases[f"tk.group_alerts[len={len(term)}]"] = lambda term=term: app.group_alerts(alerts, term)
+    return cases
+
+def qt_cases():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    qapp = QApplication.instance() or QApplication([])
+    app = load_app("CSWN-toolkit.py", "cswn_toolkit")
+    # Pool workers cannot import the app under this name; time the decode itself
+    app.image_executor = False
+    co = fixture("co_alerts.atom")
+    national = fixture("national_alerts.atom")
+    hwo = fixture("hwo_pub.html")
+    afd = fixture("afd_bou.html")
+    goes = fixture("goes_conus_2500x1500.jpg")
+    afd_text = app.extract_pre_text(afd)
+    window = app.WeatherToolkit()
+
+    def render_sections():
+        for name in app.resources:
+            page = window.build_section_page(name)
+            window.right_panel.removeWidget(page)
+            page.setParent(None)
+        window.section_pages.clear()
+
+    return {
+        "qt.alert_parse[co]": lambda: app.format_alerts(app.parse_alert_feed(co)),
+        "qt.alert_parse[national]": lambda: app.format_alerts(app.parse_alert_feed(national)),
+        "qt.extract_pre[hwo]": lambda: app.extract_pre_text(hwo),
+        "qt.extract_pre[afd]": lambda: app.extract_pre_text(afd),
+        "qt.text_product_parse[afd]": lambda: app.TextProduct(afd_text),
+        "qt.image_decode_scale[goes]": lambda: app.scaled_pixmap(goes, 1100, 600),
+        "qt.section_render[all]": render_sections,
+        "_keepalive": (qapp, window),
+    }
+
+def measure(fn, repeat):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    runs = [t / number * 1000 for t in timer.repeat(repeat, number)]
+    return {"min_ms": round(min(runs), 4), "median_ms": round(statistics.median(runs), 4), "number": number}
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--record", action="store_true", help="download fresh fixtures and exit")
+    parser.add_argument("-k", dest="keyword", default="", help="only run cases containing this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--history", default=HISTORY_FILE)
+    parser.add_argument("--no-save", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures()
+        return 0
+
+    cases = {}
+    for group in (tk_cases, qt_cases):
+        try:
+            cases.update(group())
+        except Exception as e:
+            print(f"skipping {group.__name__}: {e.__class__.__name__}: {e}")
+
+    with open(THRESHOLDS_FILE) as f:
+        thresholds = json.load(f)
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            history = json.load(f)
+    previous = history[-1]["results"] if history else {}
+
+    results, failures = {}, []
+    for name, fn in cases.items():
+        if name.startswith("_") or args.keyword not in name:
+            continue
+        results[name] = result = measure(fn, args.repeat)
+        line = f"{name:40s} {result['median_ms']:10.3f} ms  (min {result['min_ms']:.3f}, n={result['number']})"
+        if name in previous:
+            change = (result["median_ms"] / previous[name]["median_ms"] - 1) * 100
+            line += f"  {change:+.1f}% vs last"
+        limit = thresholds.get(name)
+        if limit is not None and result["median_ms"] > limit:
+            failures.append(name)
+            line += f"  OVER {limit} ms"
+        print(line)
+
+    if not args.no_save and results:
+        history.append({
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        })
+        with open(args.history, "w") as f:
+            json.dump(history, f, indent=2)
+
+    if failures:
+        print(f"{len(failures)} case(s) over threshold: {', '.join(failures)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())